@@ -1,12 +1,38 @@
 proj_clean/directory_to_markdown.py
 import argparse
+import codecs
+import io
+import json
 import logging
+import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Set, Union
+from stat import S_ISREG
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 # Default directories to ignore
 DEFAULT_IGNORE_DIRS = {'node_modules', '__pycache__', '.git', '.vscode', '.idea'}
 
+# Suffix of the incremental manifest stored next to the output file
+MANIFEST_SUFFIX = '.manifest'
+MANIFEST_VERSION = 1
+
+# Files larger than this are streamed into the output in chunks instead of
+# being read into memory first
+STREAM_THRESHOLD_BYTES = 1024 * 1024
+STREAM_CHUNK_CHARS = 256 * 1024
+
+# Number of leading bytes inspected for NUL bytes when detecting binary files
+BINARY_SNIFF_BYTES = 8192
+
+# Closing fence written after each file's content
+SECTION_FOOTER = "\n```\n\n"
+
+# Rough bytes-per-token ratio used to turn a token budget into a size estimate
+BYTES_PER_TOKEN = 4
+
 def setup_logging() -> None:
     """Configure logging for the application."""
     logging.basicConfig(
@@ -33,10 +59,129 @@ def is_ignored(path: Path, ignore_dirs: Set[str]) -> bool:
             return True
     return False
 
+def iter_files(
+    directory_path: Path,
+    file_types: Set[str],
+    ignore_dirs: Set[str],
+    recursive: bool = True
+) -> Iterator[Path]:
+    """
+    Walk a directory with os.scandir, yielding matching files in sorted order.
+
+    Ignored directories are pruned before descending, so their contents are
+    never listed. Entries are sorted by name at each level to keep the output
+    deterministic across platforms and file systems.
+
+    Args:
+        directory_path: Directory to traverse.
+        file_types: File extensions to include.
+        ignore_dirs: Directory names to ignore.
+        recursive: Whether to traverse subdirectories.
+
+    Yields:
+        Path: Each file that passes the ignore and extension filters.
+    """
+    stack = [directory_path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            logging.warning(f"Skipping unreadable directory {current}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in ignore_dirs:
+                        logging.debug(f"Pruning ignored directory: {entry.path}")
+                    elif recursive:
+                        subdirs.append(Path(entry.path))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            if os.path.splitext(entry.name)[1] not in file_types:
+                logging.debug(f"Skipping file type: {entry.path}")
+                continue
+
+            yield Path(entry.path)
+
+        # Push in reverse so subdirectories are visited in sorted order
+        stack.extend(reversed(subdirs))
+
+def open_checked(file_path: Path, max_size_mb: int) -> Tuple[BinaryIO, bytes]:
+    """
+    Open a file and validate that it is a regular file within the size limit
+    that does not look binary.
+
+    The binary check searches the first BINARY_SNIFF_BYTES for NUL. Those bytes
+    are returned alongside the handle, which is positioned right after them, so
+    callers continue reading from the same handle instead of opening the file
+    again.
+
+    Args:
+        file_path: Path to the file to open.
+        max_size_mb: Maximum file size in megabytes.
+
+    Returns:
+        Tuple[BinaryIO, bytes]: The open binary handle and the bytes already
+        read from it. The caller is responsible for closing the handle.
+
+    Raises:
+        ValueError: If the path is not a regular file.
+        OSError: If the file cannot be opened, is too large or is binary.
+    """
+    max_size_bytes = max_size_mb * 1024 * 1024
+
+    f = file_path.open('rb')
+    try:
+        st = os.fstat(f.fileno())
+        if not S_ISREG(st.st_mode):
+            raise ValueError(f"Path is not a file: {file_path}")
+
+        if st.st_size > max_size_bytes:
+            raise OSError(f"File too large: {file_path} ({st.st_size} bytes > {max_size_bytes} bytes)")
+
+        head = f.read(BINARY_SNIFF_BYTES)
+        if b'\0' in head:
+            raise OSError(f"Binary file: {file_path}")
+    except BaseException:
+        f.close()
+        raise
+
+    return f, head
+
+def check_file_readable(file_path: Path, max_size_mb: int) -> int:
+    """
+    Validate that a file exists, is within the size limit and is not binary.
+
+    Only the sniffed prefix is read; the content is not decoded.
+
+    Args:
+        file_path: Path to the file to check.
+        max_size_mb: Maximum file size in megabytes.
+
+    Returns:
+        int: The file size in bytes.
+
+    Raises:
+        OSError: If the file is too large or binary.
+    """
+    f, _ = open_checked(file_path, max_size_mb)
+    with f:
+        return os.fstat(f.fileno()).st_size
+
 def read_file_safely(file_path: Path, max_size_mb: int) -> str:
     """
     Read file contents safely, checking file size and encoding.
 
+    Newlines are translated to '\\n' as in text mode.
+
     Args:
         file_path: Path to the file to read.
         max_size_mb: Maximum file size in megabytes.
@@ -47,21 +192,13 @@ def read_file_safely(file_path: Path, max_size_mb: int) -> str:
     Raises:
         OSError: If file cannot be read due to size or encoding issues.
     """
-    max_size_bytes = max_size_mb * 1024 * 1024
-    
-    if not file_path.exists():
-        raise FileNotFoundError(f"File not found: {file_path}")
-    
-    if not file_path.is_file():
-        raise ValueError(f"Path is not a file: {file_path}")
-    
-    file_size = file_path.stat().st_size
-    if file_size > max_size_bytes:
-        raise OSError(f"File too large: {file_path} ({file_size} bytes > {max_size_bytes} bytes)")
+    f, head = open_checked(file_path, max_size_mb)
     
     try:
-        content = file_path.read_text(encoding='utf-8')
-        return content
+        with f:
+            data = head + f.read()
+        content = data.decode('utf-8')
+        return content.replace('\r\n', '\n').replace('\r', '\n')
     except UnicodeDecodeError:
         logging.warning(f"Skipping file due to encoding issues: {file_path}")
         raise
@@ -69,13 +206,527 @@ def read_file_safely(file_path: Path, max_size_mb: int) -> str:
         logging.error(f"Error reading file {file_path}: {e}")
         raise
 
+def iter_file_chunks(file_path: Path, max_size_mb: int, chunk_chars: int = STREAM_CHUNK_CHARS) -> Iterator[str]:
+    """
+    Read a file as a sequence of decoded text chunks.
+
+    UTF-8 is validated incrementally as the chunks are decoded, so only one
+    chunk is held in memory at a time. Newlines are translated to '\\n' as in
+    text mode.
+
+    Args:
+        file_path: Path to the file to read.
+        max_size_mb: Maximum file size in megabytes.
+        chunk_chars: Approximate number of characters per chunk.
+
+    Yields:
+        str: Consecutive chunks of the file content.
+
+    Raises:
+        OSError: If the file is too large or binary.
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    f, head = open_checked(file_path, max_size_mb)
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+    
+    with f:
+        data = head
+        while data:
+            chunk = decoder.decode(data)
+            if chunk:
+                yield chunk
+            data = f.read(chunk_chars)
+        chunk = decoder.decode(b'', final=True)
+        if chunk:
+            yield chunk
+
+def should_stream(file_path: Path) -> bool:
+    """Return True if a file is large enough to be streamed rather than read whole."""
+    try:
+        return file_path.stat().st_size > STREAM_THRESHOLD_BYTES
+    except OSError:
+        return False
+
+def render_file_section(file_path: Path, directory_path: Path, content: str) -> str:
+    """
+    Render a single file's contents as a fenced markdown section.
+
+    Args:
+        file_path: Path of the file being rendered.
+        directory_path: Root directory, used to compute the relative heading.
+        content: The file content.
+
+    Returns:
+        str: The markdown section.
+    """
+    return render_section_header(file_path, directory_path) + content + SECTION_FOOTER
+
+def render_section_header(file_path: Path, directory_path: Path) -> str:
+    """Render the heading and opening fence of a file section."""
+    relative_path = file_path.relative_to(directory_path)
+    return f"## File: `{relative_path}`\n\n```{file_path.suffix.lstrip('.')}\n"
+
+def write_file_section(md_file, file_path: Path, directory_path: Path, content: str) -> None:
+    """
+    Write a single file's contents as a fenced markdown section.
+
+    Args:
+        md_file: Open text stream of the markdown output.
+        file_path: Path of the file being written.
+        directory_path: Root directory, used to compute the relative heading.
+        content: The file content.
+    """
+    md_file.write(render_file_section(file_path, directory_path, content))
+
+def stream_file_section(
+    out_file,
+    file_path: Path,
+    directory_path: Path,
+    max_size_mb: int,
+    encoding: Optional[str] = None
+) -> None:
+    """
+    Write a file section by streaming the file in chunks.
+
+    Peak memory is one chunk regardless of the file size. If the file turns
+    out not to be valid UTF-8 part way through, the partially written section
+    is truncated away before the error is re-raised.
+
+    Args:
+        out_file: Open output stream, positioned at its end.
+        file_path: Path of the file being written.
+        directory_path: Root directory, used to compute the relative heading.
+        max_size_mb: Maximum file size in megabytes.
+        encoding: If given, chunks are encoded before writing, for binary
+            output streams.
+    """
+    def write(text: str) -> None:
+        out_file.write(text.encode(encoding) if encoding else text)
+
+    start = out_file.tell()
+    try:
+        chunks = iter_file_chunks(file_path, max_size_mb)
+        # Pull the first chunk before writing anything so size and binary
+        # checks fail without touching the output
+        first = next(chunks, '')
+        write(render_section_header(file_path, directory_path))
+        write(first)
+        for chunk in chunks:
+            write(chunk)
+        write(SECTION_FOOTER)
+    except BaseException:
+        out_file.seek(start)
+        out_file.truncate()
+        raise
+
+def manifest_path_for(output_file: Path) -> Path:
+    """Return the path of the incremental manifest belonging to an output file."""
+    return output_file.with_name(output_file.name + MANIFEST_SUFFIX)
+
+def load_manifest(output_file: Path, options: Dict) -> Optional[Dict]:
+    """
+    Load the manifest of a previous run if it can be reused.
+
+    The manifest is discarded when it is missing or unreadable, when it was
+    produced with different options, or when the output file no longer has the
+    size recorded in it (e.g. it was edited by hand).
+
+    Args:
+        output_file: Markdown file produced by the previous run.
+        options: Options of the current run that affect the output.
+
+    Returns:
+        Optional[Dict]: The manifest, or None if a full rebuild is needed.
+    """
+    manifest_path = manifest_path_for(output_file)
+    try:
+        with manifest_path.open('r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable manifest {manifest_path}: {e}")
+        return None
+
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('options') != options:
+        logging.info("Manifest options changed, rebuilding from scratch")
+        return None
+
+    try:
+        output_size = output_file.stat().st_size
+    except OSError:
+        return None
+    if output_size != manifest.get('output_size'):
+        logging.info("Output file changed since last run, rebuilding from scratch")
+        return None
+
+    return manifest
+
+def _directory_to_markdown_parallel(
+    directory_path: Path,
+    output_file: Path,
+    file_types: Set[str],
+    ignore_dirs: Set[str],
+    recursive: bool,
+    max_file_size_mb: int,
+    workers: int
+) -> None:
+    """
+    Read files on a thread pool and write them in walk order.
+
+    At most ``workers * 4`` reads are in flight at any time; the writer waits on
+    the oldest one before submitting more, so memory stays bounded by the
+    window size rather than by the size of the tree. Files above
+    STREAM_THRESHOLD_BYTES are not read by the pool but streamed by the writer
+    when their turn comes.
+    """
+    max_in_flight = workers * 4
+    pending = deque()
+
+    def drain_one(md_file) -> None:
+        file_path, future = pending.popleft()
+        try:
+            if future is None:
+                stream_file_section(md_file, file_path, directory_path, max_file_size_mb)
+            else:
+                content = future.result()
+                write_file_section(md_file, file_path, directory_path, content)
+            logging.info(f"Processed: {file_path}")
+        except (OSError, UnicodeDecodeError) as e:
+            logging.warning(f"Skipping file {file_path}: {e}")
+        except Exception as e:
+            logging.error(f"Unexpected error processing {file_path}: {e}")
+
+    with output_file.open('w', encoding='utf-8') as md_file, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        md_file.write(f"# Directory Contents: {directory_path}\n\n")
+
+        for file_path in iter_files(directory_path, file_types, ignore_dirs, recursive):
+            if len(pending) >= max_in_flight:
+                drain_one(md_file)
+            if should_stream(file_path):
+                pending.append((file_path, None))
+            else:
+                pending.append(
+                    (file_path, executor.submit(read_file_safely, file_path, max_file_size_mb))
+                )
+
+        while pending:
+            drain_one(md_file)
+
+def _directory_to_markdown_incremental(
+    directory_path: Path,
+    output_file: Path,
+    file_types: Set[str],
+    ignore_dirs: Set[str],
+    recursive: bool,
+    max_file_size_mb: int,
+    workers: int
+) -> None:
+    """
+    Regenerate the markdown file, reusing sections of unchanged files.
+
+    Each file is keyed by its relative path, size and ``st_mtime_ns``. When the
+    key matches the manifest of the previous run, its section is copied byte for
+    byte from the previous output instead of being read again. Files skipped in
+    the previous run (too large, not UTF-8) are skipped again without reading.
+    The new output and manifest are written to temporary files and moved into
+    place once complete.
+    """
+    options = {
+        'directory': str(directory_path),
+        'max_file_size_mb': max_file_size_mb,
+    }
+    previous = load_manifest(output_file, options)
+    previous_files = previous['files'] if previous else {}
+    if previous:
+        logging.info(f"Loaded manifest with {len(previous_files)} entries")
+
+    tmp_output = output_file.with_name(output_file.name + '.tmp')
+    manifest_path = manifest_path_for(output_file)
+    tmp_manifest = manifest_path.with_name(manifest_path.name + '.tmp')
+
+    files = {}
+    reused = 0
+    max_in_flight = workers * 4
+    pending = deque()
+
+    def drain_one(out_file, old_file) -> None:
+        nonlocal reused
+        file_path, key, entry, future = pending.popleft()
+        record = {'size': key[0], 'mtime_ns': key[1], 'offset': None, 'length': 0}
+
+        if entry is not None:
+            if entry['offset'] is not None:
+                old_file.seek(entry['offset'])
+                data = old_file.read(entry['length'])
+                record['offset'] = out_file.tell()
+                record['length'] = len(data)
+                out_file.write(data)
+            reused += 1
+            files[key[2]] = record
+            return
+
+        try:
+            start = out_file.tell()
+            if future is None:
+                stream_file_section(
+                    out_file, file_path, directory_path, max_file_size_mb, encoding='utf-8'
+                )
+            else:
+                content = future.result()
+                out_file.write(render_file_section(file_path, directory_path, content).encode('utf-8'))
+            record['offset'] = start
+            record['length'] = out_file.tell() - start
+            logging.info(f"Processed: {file_path}")
+        except (OSError, UnicodeDecodeError) as e:
+            logging.warning(f"Skipping file {file_path}: {e}")
+        except Exception as e:
+            logging.error(f"Unexpected error processing {file_path}: {e}")
+            return
+        files[key[2]] = record
+
+    old_file = output_file.open('rb') if previous else None
+    try:
+        with tmp_output.open('wb') as out_file, \
+                ThreadPoolExecutor(max_workers=workers) as executor:
+            out_file.write(f"# Directory Contents: {directory_path}\n\n".encode('utf-8'))
+
+            for file_path in iter_files(directory_path, file_types, ignore_dirs, recursive):
+                if file_path in (output_file, tmp_output):
+                    continue
+                try:
+                    stat = file_path.stat()
+                except OSError as e:
+                    logging.warning(f"Skipping file {file_path}: {e}")
+                    continue
+
+                relative_path = file_path.relative_to(directory_path).as_posix()
+                key = (stat.st_size, stat.st_mtime_ns, relative_path)
+                entry = previous_files.get(relative_path)
+
+                if len(pending) >= max_in_flight:
+                    drain_one(out_file, old_file)
+
+                if entry and entry['size'] == key[0] and entry['mtime_ns'] == key[1]:
+                    pending.append((file_path, key, entry, None))
+                elif stat.st_size > STREAM_THRESHOLD_BYTES:
+                    pending.append((file_path, key, None, None))
+                else:
+                    pending.append((
+                        file_path, key, None,
+                        executor.submit(read_file_safely, file_path, max_file_size_mb)
+                    ))
+
+            while pending:
+                drain_one(out_file, old_file)
+
+            output_size = out_file.tell()
+    finally:
+        if old_file is not None:
+            old_file.close()
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'options': options,
+        'output_size': output_size,
+        'files': files,
+    }
+    with tmp_manifest.open('w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+    os.replace(tmp_output, output_file)
+    os.replace(tmp_manifest, manifest_path)
+    logging.info(f"Reused {reused} of {len(files)} files from previous run")
+
+def estimate_tokens(num_bytes: int) -> int:
+    """Estimate the number of LLM tokens in a UTF-8 text of the given size."""
+    return -(-num_bytes // BYTES_PER_TOKEN)
+
+def shard_path_for(output_file: Path, index: int) -> Path:
+    """Return the path of the numbered shard derived from an output file."""
+    return output_file.with_name(f"{output_file.stem}.part{index:04d}{output_file.suffix}")
+
+def shard_manifest_path_for(output_file: Path) -> Path:
+    """Return the path of the shard manifest belonging to an output file."""
+    return output_file.with_name(f"{output_file.stem}.shards{MANIFEST_SUFFIX}")
+
+def _write_shard(
+    shard_path: Path,
+    header: str,
+    parts: List[Tuple[Path, Optional[bytes]]],
+    directory_path: Path,
+    max_file_size_mb: int
+) -> Dict:
+    """
+    Write one shard and describe what ended up in it.
+
+    Parts holding bytes are pre-rendered sections; parts holding None are large
+    files, size- and binary-checked by the reader pool, streamed and decoded
+    from disk here. Files that fail while streaming (e.g. not valid UTF-8, or
+    modified in the meantime) are left out of both the shard and its
+    description.
+    """
+    files = []
+    with shard_path.open('wb') as out_file:
+        out_file.write(header.encode('utf-8'))
+        for file_path, data in parts:
+            try:
+                if data is None:
+                    stream_file_section(
+                        out_file, file_path, directory_path, max_file_size_mb, encoding='utf-8'
+                    )
+                else:
+                    out_file.write(data)
+            except (OSError, UnicodeDecodeError) as e:
+                logging.warning(f"Skipping file {file_path}: {e}")
+                continue
+            files.append(file_path.relative_to(directory_path).as_posix())
+        size = out_file.tell()
+
+    return {
+        'shard': shard_path.name,
+        'bytes': size,
+        'tokens': estimate_tokens(size),
+        'files': files,
+    }
+
+def _directory_to_markdown_sharded(
+    directory_path: Path,
+    output_file: Path,
+    file_types: Set[str],
+    ignore_dirs: Set[str],
+    recursive: bool,
+    max_file_size_mb: int,
+    workers: int,
+    shard_max_bytes: Optional[int],
+    shard_max_tokens: Optional[int]
+) -> None:
+    """
+    Split the markdown output into numbered shards under a size budget.
+
+    Files are read on a thread pool as in the parallel mode and packed into
+    shards in walk order. A file is never split: one that does not fit in the
+    remaining budget starts a new shard, and one that exceeds the budget on its
+    own gets a shard to itself. Large files are only validated and measured by
+    the readers and streamed by the shard writer. Completed shards are written on a second pool
+    while packing continues, with at most ``workers`` shards buffered at once.
+    A JSON manifest lists the files in each shard.
+    """
+    def cost(num_bytes: int) -> int:
+        return num_bytes if shard_max_bytes else estimate_tokens(num_bytes)
+
+    budget = shard_max_bytes or shard_max_tokens
+    manifest_path = shard_manifest_path_for(output_file)
+    # Only the shards and manifest next to the output are skipped, not look-alike user files elsewhere
+    output_dir = output_file.resolve().parent
+    shard_name = re.compile(rf"{re.escape(output_file.stem)}\.part\d{{4,}}{re.escape(output_file.suffix)}")
+
+    max_in_flight = workers * 4
+    pending = deque()
+    shard_futures = deque()
+    shard_infos = []
+
+    current_parts = []
+    current_cost = 0
+
+    def shard_header(index: int) -> str:
+        return f"# Directory Contents: {directory_path} (part {index})\n\n"
+
+    def flush_shard(writer) -> None:
+        nonlocal current_parts, current_cost
+        if not current_parts:
+            return
+        if len(shard_futures) >= workers:
+            shard_infos.append(shard_futures.popleft().result())
+        index = len(shard_infos) + len(shard_futures) + 1
+        shard_futures.append(writer.submit(
+            _write_shard, shard_path_for(output_file, index), shard_header(index),
+            current_parts, directory_path, max_file_size_mb
+        ))
+        current_parts = []
+        current_cost = 0
+
+    def add_part(writer, file_path: Path, data: Optional[bytes], size: int) -> None:
+        nonlocal current_cost
+        header_cost = cost(len(shard_header(len(shard_infos) + len(shard_futures) + 1).encode('utf-8')))
+        part_cost = cost(size)
+        if current_parts and header_cost + current_cost + part_cost > budget:
+            flush_shard(writer)
+        if header_cost + part_cost > budget:
+            logging.warning(f"File exceeds shard budget on its own: {file_path}")
+        current_parts.append((file_path, data))
+        current_cost += part_cost
+
+    def drain_one(writer) -> None:
+        file_path, future, streamed = pending.popleft()
+        try:
+            result = future.result()
+        except (OSError, UnicodeDecodeError) as e:
+            logging.warning(f"Skipping file {file_path}: {e}")
+            return
+        except Exception as e:
+            logging.error(f"Unexpected error processing {file_path}: {e}")
+            return
+        if streamed:
+            # The raw file size is an upper bound on the translated content, so
+            # large files are decoded only once, by the shard writer
+            overhead = len(render_section_header(file_path, directory_path).encode('utf-8'))
+            add_part(writer, file_path, None, result + overhead + len(SECTION_FOOTER))
+        else:
+            data = render_file_section(file_path, directory_path, result).encode('utf-8')
+            add_part(writer, file_path, data, len(data))
+        logging.info(f"Processed: {file_path}")
+
+    with ThreadPoolExecutor(max_workers=workers) as readers, \
+            ThreadPoolExecutor(max_workers=workers) as writer:
+        for file_path in iter_files(directory_path, file_types, ignore_dirs, recursive):
+            if ((shard_name.fullmatch(file_path.name) or file_path.name == manifest_path.name)
+                    and file_path.resolve().parent == output_dir):
+                continue
+            if len(pending) >= max_in_flight:
+                drain_one(writer)
+
+            streamed = should_stream(file_path)
+            reader = check_file_readable if streamed else read_file_safely
+            pending.append(
+                (file_path, readers.submit(reader, file_path, max_file_size_mb), streamed)
+            )
+
+        while pending:
+            drain_one(writer)
+        flush_shard(writer)
+
+        while shard_futures:
+            shard_infos.append(shard_futures.popleft().result())
+
+    # Remove shards left over from a previous run that produced more of them
+    index = len(shard_infos) + 1
+    while shard_path_for(output_file, index).exists():
+        shard_path_for(output_file, index).unlink()
+        index += 1
+
+    manifest = {
+        'directory': str(directory_path),
+        'budget': {'bytes': shard_max_bytes} if shard_max_bytes else {'tokens': shard_max_tokens},
+        'shards': shard_infos,
+    }
+    with manifest_path.open('w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    logging.info(f"Wrote {len(shard_infos)} shards, manifest: {manifest_path}")
+
 def directory_to_markdown(
     directory_path: Union[str, Path],
     output_file: Union[str, Path],
     file_types: Set[str] = None,
     ignore_dirs: Set[str] = None,
     recursive: bool = True,
-    max_file_size_mb: int = 10
+    max_file_size_mb: int = 10,
+    workers: int = 1,
+    incremental: bool = False,
+    shard_max_bytes: Optional[int] = None,
+    shard_max_tokens: Optional[int] = None
 ) -> None:
     """
     Traverse directory, read selected files, and write their contents into a markdown file.
@@ -87,6 +738,16 @@ def directory_to_markdown(
         ignore_dirs: Directory names to ignore.
         recursive: Whether to traverse subdirectories.
         max_file_size_mb: Maximum file size to process in megabytes.
+        workers: Number of reader threads. Values above 1 enable the parallel
+            mode, which walks the tree with os.scandir and writes files in
+            sorted path order.
+        incremental: Reuse sections of files whose size and modification time
+            are unchanged since the previous run, tracked in a manifest stored
+            next to the output file.
+        shard_max_bytes: If set, split the output into numbered shards of at
+            most this many bytes each, plus a manifest of their contents.
+        shard_max_tokens: Like shard_max_bytes, but budgeted in estimated LLM
+            tokens (BYTES_PER_TOKEN bytes per token).
     """
     if file_types is None:
         file_types = {'.py', '.txt', '.md', '.js', '.html', '.css', '.json', '.yaml', '.yml'}
@@ -103,6 +764,16 @@ def directory_to_markdown(
     if not directory_path.is_dir():
         raise ValueError(f"Path is not a directory: {directory_path}")
     
+    sharded = shard_max_bytes is not None or shard_max_tokens is not None
+    if shard_max_bytes is not None and shard_max_tokens is not None:
+        raise ValueError("Specify only one of shard_max_bytes and shard_max_tokens")
+    
+    if sharded and (shard_max_bytes or shard_max_tokens) <= 0:
+        raise ValueError("Shard budget must be positive")
+    
+    if sharded and incremental:
+        raise ValueError("Incremental mode does not support sharded output")
+    
     logging.info(f"Starting directory traversal: {directory_path}")
     logging.info(f"Output file: {output_file}")
     logging.info(f"File types: {file_types}")
@@ -110,6 +781,31 @@ def directory_to_markdown(
     logging.info(f"Recursive: {recursive}")
     logging.info(f"Max file size: {max_file_size_mb} MB")
     
+    if sharded:
+        _directory_to_markdown_sharded(
+            directory_path, output_file, file_types, ignore_dirs,
+            recursive, max_file_size_mb, max(workers, 1),
+            shard_max_bytes, shard_max_tokens
+        )
+        return
+    
+    if incremental:
+        _directory_to_markdown_incremental(
+            directory_path, output_file, file_types, ignore_dirs,
+            recursive, max_file_size_mb, max(workers, 1)
+        )
+        logging.info(f"Markdown file generated: {output_file}")
+        return
+    
+    if workers > 1:
+        logging.info(f"Parallel readers: {workers}")
+        _directory_to_markdown_parallel(
+            directory_path, output_file, file_types, ignore_dirs,
+            recursive, max_file_size_mb, workers
+        )
+        logging.info(f"Markdown file generated: {output_file}")
+        return
+    
     with output_file.open('w', encoding='utf-8') as md_file:
         md_file.write(f"# Directory Contents: {directory_path}\n\n")
         
@@ -128,13 +824,11 @@ def directory_to_markdown(
                 continue
             
             try:
-                content = read_file_safely(file_path, max_file_size_mb)
-                
-                relative_path = file_path.relative_to(directory_path)
-                md_file.write(f"## File: `{relative_path}`\n\n")
-                md_file.write(f"```{file_path.suffix.lstrip('.')}\n")
-                md_file.write(content)
-                md_file.write("\n```\n\n")
+                if should_stream(file_path):
+                    stream_file_section(md_file, file_path, directory_path, max_file_size_mb)
+                else:
+                    content = read_file_safely(file_path, max_file_size_mb)
+                    write_file_section(md_file, file_path, directory_path, content)
                 
                 logging.info(f"Processed: {file_path}")
                 
@@ -193,6 +887,31 @@ def main() -> None:
         help="Maximum file size in megabytes"
     )
     
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="Number of reader threads (values above 1 enable parallel mode)"
+    )
+    
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-read files changed since the previous run"
+    )
+    
+    shard_group = parser.add_mutually_exclusive_group()
+    shard_group.add_argument(
+        "--shard-bytes",
+        type=int,
+        help="Split output into numbered shards of at most this many bytes"
+    )
+    shard_group.add_argument(
+        "--shard-tokens",
+        type=int,
+        help="Split output into numbered shards of at most this many estimated tokens"
+    )
+    
     args = parser.parse_args()
     
     try:
@@ -202,7 +921,11 @@ def main() -> None:
             file_types=set(args.types),
             ignore_dirs=set(args.ignore),
             recursive=args.recursive,
-            max_file_size_mb=args.max_size
+            max_file_size_mb=args.max_size,
+            workers=args.workers,
+            incremental=args.incremental,
+            shard_max_bytes=args.shard_bytes,
+            shard_max_tokens=args.shard_tokens
         )
     except Exception as e:
         logging.error(f"Failed to generate markdown: {e}")
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Speedmonitor - Probe several speed test targets concurrently and store the results in SQLite.
+
+Each target is probed on its own jittered schedule by an asyncio task. Results are
+buffered in memory and written to an append-only SQLite table in batches by a
+write-behind flusher, so a slow disk never delays a probe.
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from colorama import Fore, Style
+
+from speed_status import STATUS_COLORS, classify_speed
+
+@dataclass(frozen=True)
+class Target:
+    """
+    A speed test target.
+
+    Attributes:
+        name: Label stored with every result of this target
+        server_id: speedtest.net server to test against (None picks the best server)
+        source_address: Local address to bind to, selecting the network interface
+    """
+    name: str
+    server_id: Optional[int] = None
+    source_address: Optional[str] = None
+
+    @classmethod
+    def parse(cls, spec):
+        """
+        Parse a target from a "name[:server_id[@source_address]]" string.
+
+        Args:
+            spec: Target specification, e.g. "home", "paris:1234" or "wan2:1234@10.0.0.2"
+        """
+        name, _, rest = spec.partition(":")
+        server, _, source = rest.partition("@")
+        return cls(name, int(server) if server else None, source or None)
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """A single measurement of one target."""
+    target: str
+    timestamp: float
+    download: float
+    upload: float
+    ping: float
+    status: str
+
+class SpeedtestProbe:
+    """Measure a target with speedtest-cli, running the blocking calls in a worker thread."""
+
+    async def measure(self, target: Target) -> Tuple[float, float, float]:
+        """
+        Measure download (Mbps), upload (Mbps) and ping (ms) for a target.
+
+        Args:
+            target: Target to measure
+        """
+        return await asyncio.to_thread(self._measure_blocking, target)
+
+    @staticmethod
+    def _measure_blocking(target):
+        import speedtest
+
+        st = speedtest.Speedtest(source_address=target.source_address)
+        if target.server_id is not None:
+            st.get_servers([target.server_id])
+        st.get_best_server()
+        download_speed = st.download() / 1_000_000
+        upload_speed = st.upload() / 1_000_000
+        return download_speed, upload_speed, st.results.ping
+
+class FakeProbe:
+    """
+    Local probe returning random measurements, for benchmarking without network.
+
+    Args:
+        latency: Simulated duration of one measurement in seconds
+        seed: Seed of the random generator, for reproducible runs
+    """
+
+    def __init__(self, latency=0.0, seed=None):
+        self.latency = latency
+        self.rng = random.Random(seed)
+
+    async def measure(self, target: Target) -> Tuple[float, float, float]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        download_speed = self.rng.lognormvariate(3.5, 0.5)
+        upload_speed = download_speed * self.rng.uniform(0.1, 0.5)
+        ping = self.rng.gammavariate(2.0, 10.0)
+        return download_speed, upload_speed, ping
+
+class SQLiteStore:
+    """
+    Append-only SQLite store with a write-behind buffer.
+
+    Results are appended to an in-memory buffer and written in one transaction
+    when the buffer reaches batch_size or every flush_interval seconds,
+    whichever comes first. Writes run in a worker thread so they never block
+    the event loop.
+
+    Args:
+        path: SQLite database file
+        batch_size: Number of buffered results that triggers a flush
+        flush_interval: Maximum time in seconds a result stays buffered
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS measurements (
+            id INTEGER PRIMARY KEY,
+            target TEXT NOT NULL,
+            timestamp REAL NOT NULL,
+            download REAL NOT NULL,
+            upload REAL NOT NULL,
+            ping REAL NOT NULL,
+            status TEXT NOT NULL
+        )
+    """
+
+    def __init__(self, path, batch_size=100, flush_interval=5.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self._buffer: List[ProbeResult] = []
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self.SCHEMA)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS measurements_target_ts ON measurements (target, timestamp)"
+        )
+        self._conn.commit()
+        self._lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the periodic background flush."""
+        self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def add(self, result: ProbeResult):
+        """
+        Buffer a result, flushing if the buffer is full.
+
+        Args:
+            result: Measurement to store
+        """
+        self._buffer.append(result)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        """Write all buffered results in a single transaction."""
+        async with self._lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            await asyncio.to_thread(self._write_batch, batch)
+            self.rows_written += len(batch)
+
+    async def close(self):
+        """Stop the background flush, write remaining results and close the database."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        self._conn.close()
+
+    def _write_batch(self, batch):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO measurements (target, timestamp, download, upload, ping, status) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(r.target, r.timestamp, r.download, r.upload, r.ping, r.status) for r in batch]
+            )
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+class MonitorScheduler:
+    """
+    Probe several targets concurrently, each on its own jittered interval.
+
+    Args:
+        targets: Targets to probe
+        probe: Object with an async measure(target) method
+        store: Store receiving the results
+        interval: Mean time in seconds between two probes of the same target
+        jitter: Each wait between probes is interval times a random factor in
+            [1 - jitter, 1 + jitter], and each target's first probe is delayed by
+            a random 0 to interval * jitter seconds, so targets do not probe in lockstep
+        high: High threshold for download speed (Mbps) - above this is "great"
+        low: Low threshold for download speed (Mbps) - below this is "bad"
+        max_concurrency: Maximum number of probes running at once
+        on_result: Optional callback invoked with every ProbeResult
+    """
+
+    def __init__(self, targets, probe, store, interval=300.0, jitter=0.1,
+                 high=50.0, low=10.0, max_concurrency=None, on_result=None):
+        self.targets = list(targets)
+        self.probe = probe
+        self.store = store
+        self.interval = interval
+        self.jitter = jitter
+        self.high = high
+        self.low = low
+        self.on_result = on_result
+        self.probes_done = 0
+        self.errors = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency or len(self.targets))
+        self._rng = random.Random()
+
+    def _next_delay(self):
+        return max(0.0, self.interval * (1 + self._rng.uniform(-self.jitter, self.jitter)))
+
+    async def _probe_once(self, target):
+        async with self._semaphore:
+            try:
+                download_speed, upload_speed, ping = await self.probe.measure(target)
+            except Exception as e:
+                self.errors += 1
+                print(f"{Fore.RED}Error probing {target.name}: {e}{Style.RESET_ALL}")
+                return
+        result = ProbeResult(
+            target.name, time.time(), download_speed, upload_speed, ping,
+            classify_speed(download_speed, self.high, self.low)
+        )
+        self.probes_done += 1
+        await self.store.add(result)
+        if self.on_result is not None:
+            self.on_result(result)
+
+    async def _run_target(self, target, count):
+        # Spread the first probes over interval * jitter seconds instead of firing all at once
+        await asyncio.sleep(self._rng.uniform(0, self.interval * self.jitter))
+        done = 0
+        while count is None or done < count:
+            await self._probe_once(target)
+            done += 1
+            if count is None or done < count:
+                await asyncio.sleep(self._next_delay())
+
+    async def run(self, probes_per_target=None):
+        """
+        Run the scheduler until cancelled or until every target was probed enough times.
+
+        Args:
+            probes_per_target: Number of probes per target (None runs forever)
+        """
+        await self.store.start()
+        try:
+            await asyncio.gather(*(self._run_target(t, probes_per_target) for t in self.targets))
+        finally:
+            await self.store.close()
+
+def print_result(result):
+    """Display a single result with color coding."""
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(result.timestamp))
+    print(f"{Fore.WHITE}{timestamp} {Fore.CYAN}{result.target:<12} "
+          f"{Fore.BLUE}down {result.download:8.2f} Mbps  up {result.upload:8.2f} Mbps  "
+          f"ping {result.ping:7.2f} ms  "
+          f"{STATUS_COLORS[result.status]}{result.status.upper()}{Style.RESET_ALL}")
+
+async def benchmark_scheduler(db_path, n_targets=100, probes_per_target=100, latency=0.0, batch_size=500):
+    """
+    Measure scheduler and store throughput with the fake probe.
+
+    Args:
+        db_path: SQLite database file to write to
+        n_targets: Number of simulated targets
+        probes_per_target: Probes per target
+        latency: Simulated duration of one probe in seconds
+        batch_size: Write-behind batch size
+
+    Returns:
+        Dict with the number of probes, rows written, elapsed time and probes per second
+    """
+    store = SQLiteStore(db_path, batch_size=batch_size)
+    scheduler = MonitorScheduler(
+        [Target(f"fake{i}") for i in range(n_targets)],
+        FakeProbe(latency=latency, seed=0),
+        store,
+        interval=0.0,
+        jitter=0.0,
+    )
+    start = time.perf_counter()
+    await scheduler.run(probes_per_target)
+    elapsed = time.perf_counter() - start
+    return {
+        "probes": scheduler.probes_done,
+        "rows_written": store.rows_written,
+        "elapsed": elapsed,
+        "probes_per_sec": scheduler.probes_done / elapsed if elapsed else float("inf"),
+    }
+
+def main():
+    """
+    Probe the configured targets concurrently and record the results in SQLite.
+    """
+    parser = argparse.ArgumentParser(description="Monitor internet speed of several targets concurrently")
+    parser.add_argument("targets", nargs="*", default=["default"],
+                        help='Targets as "name[:server_id[@source_address]]"')
+    parser.add_argument("--db", default="speed_records.db", help="SQLite database file")
+    parser.add_argument("--interval", type=float, default=300.0, help="Seconds between probes of a target")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Each interval varies randomly by up to this fraction either way")
+    parser.add_argument("--concurrency", type=int, help="Maximum probes running at once (default: all targets)")
+    parser.add_argument("--high", type=float, default=50.0, help='Download Mbps above which status is "great"')
+    parser.add_argument("--low", type=float, default=10.0, help='Download Mbps below which status is "bad"')
+    parser.add_argument("--fake", action="store_true", help="Use the local fake probe instead of speedtest.net")
+    parser.add_argument("--benchmark", action="store_true", help="Benchmark the scheduler with the fake probe and exit")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        stats = asyncio.run(benchmark_scheduler(args.db))
+        print(f"{Fore.GREEN}{stats['probes']} probes, {stats['rows_written']} rows in "
+              f"{stats['elapsed']:.2f}s ({stats['probes_per_sec']:.0f} probes/sec){Style.RESET_ALL}")
+        return
+
+    print(f"{Fore.GREEN}=== Speedmonitor - Internet Speed Monitor ==={Style.RESET_ALL}")
+    print("Press Ctrl+C to stop the monitoring...")
+
+    scheduler = MonitorScheduler(
+        [Target.parse(spec) for spec in args.targets],
+        FakeProbe() if args.fake else SpeedtestProbe(),
+        SQLiteStore(args.db),
+        interval=args.interval,
+        jitter=args.jitter,
+        high=args.high,
+        low=args.low,
+        max_concurrency=args.concurrency,
+        on_result=print_result,
+    )
+    try:
+        asyncio.run(scheduler.run())
+    except KeyboardInterrupt:
+        print(f"\n{Fore.GREEN}Speed monitoring stopped.{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}Results saved to: {args.db}{Style.RESET_ALL}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Speedstats - Incremental statistics over speed test records.
+
+Keeps running mean, exponentially weighted recent mean, min/max and streaming
+percentile sketches for download, upload and ping, plus per-status counts.
+Each update costs O(1) and the state is a few kilobytes regardless of how many
+records were seen, so it can be snapshotted to disk and reloaded instead of
+rescanning speed_records.csv.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS = ("download", "upload", "ping")
+PERCENTILES = (50, 95, 99)
+SNAPSHOT_VERSION = 1
+
+class QuantileSketch:
+    """
+    Log-bucketed histogram giving quantiles with bounded relative error.
+
+    Values are counted in buckets whose bounds grow geometrically by a factor
+    gamma = (1 + a) / (1 - a), so any quantile is returned within a relative
+    error of a. Memory depends on the range of values (a few hundred buckets
+    span 0.001 to 100000 at 1% accuracy), not on how many were added.
+
+    Args:
+        relative_accuracy: Maximum relative error of returned quantiles
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = Counter()
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        """
+        Add a non-negative value to the sketch.
+
+        Args:
+            value: Value to add
+        """
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+        self.count += 1
+
+    def quantile(self, q):
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            The estimated value, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket in the relative-error sense
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["relative_accuracy"])
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.buckets = Counter({int(k): v for k, v in data["buckets"].items()})
+        return sketch
+
+class MetricStats:
+    """
+    Running statistics of one metric.
+
+    Args:
+        ewma_alpha: Weight of the newest value in the recent (exponentially
+            weighted) mean
+        relative_accuracy: Relative accuracy of the percentile sketch
+    """
+
+    def __init__(self, ewma_alpha=0.1, relative_accuracy=0.01):
+        self.ewma_alpha = ewma_alpha
+        self.count = 0
+        self.mean = 0.0
+        self.recent_mean = None
+        self.min = None
+        self.max = None
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value):
+        """
+        Add a measurement.
+
+        Args:
+            value: Measured value
+        """
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        if self.recent_mean is None:
+            self.recent_mean = value
+        else:
+            self.recent_mean += self.ewma_alpha * (value - self.recent_mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.sketch.add(value)
+
+    def summary(self):
+        """Return count, means, extremes and percentiles as a dict."""
+        summary = {
+            "count": self.count,
+            "mean": self.mean if self.count else None,
+            "recent_mean": self.recent_mean,
+            "min": self.min,
+            "max": self.max,
+        }
+        for p in PERCENTILES:
+            value = self.sketch.quantile(p / 100)
+            # Bucket midpoints can fall just outside the observed range
+            summary[f"p{p}"] = None if value is None else min(max(value, self.min), self.max)
+        return summary
+
+    def to_dict(self):
+        return {
+            "ewma_alpha": self.ewma_alpha,
+            "count": self.count,
+            "mean": self.mean,
+            "recent_mean": self.recent_mean,
+            "min": self.min,
+            "max": self.max,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data["ewma_alpha"])
+        stats.count = data["count"]
+        stats.mean = data["mean"]
+        stats.recent_mean = data["recent_mean"]
+        stats.min = data["min"]
+        stats.max = data["max"]
+        stats.sketch = QuantileSketch.from_dict(data["sketch"])
+        return stats
+
+class SpeedAggregator:
+    """
+    Incremental aggregate of speed test records.
+
+    Thread-safe, so a monitoring loop can update it while another thread
+    serves or snapshots it. The aggregator remembers how far into the CSV file
+    it has read, so catch_up() only parses rows appended since the last call.
+
+    Args:
+        ewma_alpha: Weight of the newest value in the recent means
+        relative_accuracy: Relative accuracy of the percentile sketches
+    """
+
+    def __init__(self, ewma_alpha=0.1, relative_accuracy=0.01):
+        self.metrics = {name: MetricStats(ewma_alpha, relative_accuracy) for name in METRICS}
+        self.status_counts = Counter()
+        self.csv_offset = 0
+        self.last_timestamp = None
+        self._lock = threading.Lock()
+
+    def update(self, download, upload, ping, status, timestamp=None):
+        """
+        Add one speed test result.
+
+        Args:
+            download: Download speed (Mbps)
+            upload: Upload speed (Mbps)
+            ping: Ping (ms)
+            status: Status bucket ("great", "okay" or "bad")
+            timestamp: Timestamp of the result, kept for reporting
+        """
+        with self._lock:
+            self.metrics["download"].add(download)
+            self.metrics["upload"].add(upload)
+            self.metrics["ping"].add(ping)
+            self.status_counts[status] += 1
+            if timestamp is not None:
+                self.last_timestamp = timestamp
+
+    def catch_up(self, record_file):
+        """
+        Read rows appended to a speed_tracker CSV file since the last call.
+
+        Args:
+            record_file: CSV file written by speed_tracker
+
+        Returns:
+            Number of rows read
+        """
+        if not os.path.exists(record_file):
+            return 0
+        rows = 0
+        with open(record_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size < self.csv_offset:
+                # The file was truncated or replaced; start over
+                self.reset()
+            f.seek(self.csv_offset)
+            while True:
+                line = f.readline()
+                # Leave a partially written last row for the next call
+                if not line or not line.endswith(b"\n"):
+                    break
+                self.csv_offset = f.tell()
+                try:
+                    fields = next(csv.reader([line.decode("utf-8")]), None)
+                    if not fields or fields[0] == "Serial":
+                        continue
+                    _, timestamp, download, upload, ping, status = fields
+                    self.update(float(download), float(upload), float(ping), status, timestamp)
+                except (ValueError, csv.Error):
+                    # Undecodable or malformed rows are skipped
+                    continue
+                rows += 1
+        return rows
+
+    def reset(self):
+        """Discard all accumulated statistics."""
+        fresh = SpeedAggregator(self.metrics["download"].ewma_alpha,
+                                self.metrics["download"].sketch.relative_accuracy)
+        with self._lock:
+            self.metrics = fresh.metrics
+            self.status_counts = Counter()
+            self.csv_offset = 0
+            self.last_timestamp = None
+
+    def summary(self):
+        """Return the statistics of all metrics and the status counts as a dict."""
+        with self._lock:
+            return {
+                "last_timestamp": self.last_timestamp,
+                "status_counts": dict(self.status_counts),
+                **{name: stats.summary() for name, stats in self.metrics.items()},
+            }
+
+    def snapshot(self, path):
+        """
+        Atomically write the aggregator state to a JSON file.
+
+        Args:
+            path: Snapshot file
+        """
+        with self._lock:
+            state = {
+                "version": SNAPSHOT_VERSION,
+                "csv_offset": self.csv_offset,
+                "last_timestamp": self.last_timestamp,
+                "status_counts": dict(self.status_counts),
+                "metrics": {name: stats.to_dict() for name, stats in self.metrics.items()},
+            }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Restore an aggregator from a snapshot, or create an empty one.
+
+        Args:
+            path: Snapshot file
+
+        Returns:
+            The restored aggregator, or a new one if the snapshot is missing or unusable
+        """
+        aggregator = cls()
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return aggregator
+        if state.get("version") != SNAPSHOT_VERSION:
+            return aggregator
+        aggregator.csv_offset = state["csv_offset"]
+        aggregator.last_timestamp = state["last_timestamp"]
+        aggregator.status_counts = Counter(state["status_counts"])
+        aggregator.metrics = {name: MetricStats.from_dict(data) for name, data in state["metrics"].items()}
+        return aggregator
+
+def serve_stats(aggregator, port, host="127.0.0.1"):
+    """
+    Serve the aggregator summary as JSON over HTTP from a daemon thread.
+
+    Args:
+        aggregator: Aggregator to expose
+        port: TCP port to listen on
+        host: Address to bind to
+
+    Returns:
+        The running server; call shutdown() to stop it
+    """
+    class StatsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps(aggregator.summary()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), StatsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def format_summary(summary):
+    """Render a summary dict as a text table."""
+    def fmt(value):
+        return "-" if value is None else f"{value:.2f}"
+
+    lines = [f"{'':<10}{'count':>8}{'mean':>10}{'recent':>10}{'min':>10}"
+             + "".join(f"{f'p{p}':>10}" for p in PERCENTILES) + f"{'max':>10}"]
+    for name in METRICS:
+        m = summary[name]
+        lines.append(f"{name:<10}{m['count']:>8}{fmt(m['mean']):>10}{fmt(m['recent_mean']):>10}"
+                     f"{fmt(m['min']):>10}" + "".join(f"{fmt(m[f'p{p}']):>10}" for p in PERCENTILES)
+                     + f"{fmt(m['max']):>10}")
+    counts = ", ".join(f"{status}: {n}" for status, n in sorted(summary["status_counts"].items()))
+    lines.append(f"Status counts: {counts or '-'}")
+    if summary["last_timestamp"]:
+        lines.append(f"Last record: {summary['last_timestamp']}")
+    return "\n".join(lines)
+
+def main():
+    """
+    Report statistics of a speed_tracker CSV file, reading only rows added since the last snapshot.
+    """
+    parser = argparse.ArgumentParser(description="Report speed test statistics")
+    parser.add_argument("--records", default="speed_records.csv", help="CSV file written by speed_tracker")
+    parser.add_argument("--snapshot", default="speed_stats.json", help="Aggregator snapshot file")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    aggregator = SpeedAggregator.load(args.snapshot)
+    aggregator.catch_up(args.records)
+    aggregator.snapshot(args.snapshot)
+
+    summary = aggregator.summary()
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Speed status - Classification of download speeds shared by speed_tracker and speed_monitor.
+
+Kept apart from speed_tracker so that importing it does not require speedtest-cli.
+"""
+
+from colorama import Fore
+
+# Terminal color used to display each status
+STATUS_COLORS = {
+    "great": Fore.GREEN,
+    "okay": Fore.YELLOW,
+    "bad": Fore.RED,
+}
+
+def classify_speed(download_speed, high, low):
+    """
+    Evaluate a download speed against the thresholds.
+    
+    Args:
+        download_speed: Measured download speed (Mbps)
+        high: High threshold for download speed (Mbps) - above this is "great"
+        low: Low threshold for download speed (Mbps) - below this is "bad"
+    
+    Returns:
+        One of "great", "okay" or "bad"
+    """
+    if download_speed >= high:
+        return "great"
+    elif download_speed >= low:
+        return "okay"
+    return "bad"
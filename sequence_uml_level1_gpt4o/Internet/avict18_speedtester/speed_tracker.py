@@ -9,6 +9,8 @@ from datetime import datetime
 import speedtest
 import colorama
 from colorama import Fore, Style
+from speed_stats import SpeedAggregator, format_summary, serve_stats
+from speed_status import STATUS_COLORS, classify_speed
 
 # Initialize colorama for colored terminal output
 colorama.init(autoreset=True)
@@ -37,15 +39,8 @@ def run_speed_test(high, low, serial_number, record_file):
         ping = st.results.ping
         
         # Determine status based on thresholds
-        if download_speed >= high:
-            status = "great"
-            status_color = Fore.GREEN
-        elif download_speed >= low:
-            status = "okay"
-            status_color = Fore.YELLOW
-        else:
-            status = "bad"
-            status_color = Fore.RED
+        status = classify_speed(download_speed, high, low)
+        status_color = STATUS_COLORS[status]
         
         # Get current timestamp
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -88,6 +83,8 @@ def main():
     LOW_THRESHOLD = 10.0   # Mbps - below this is "bad"
     TEST_INTERVAL = 300    # 5 minutes in seconds
     RECORD_FILE = "speed_records.csv"
+    STATS_FILE = "speed_stats.json"  # Snapshot of the running statistics
+    STATS_PORT = 8765                # Serve statistics as JSON on localhost (None to disable)
     
     # Initialize CSV file with headers if it doesn't exist
     try:
@@ -98,12 +95,27 @@ def main():
     except FileExistsError:
         print(f"{Fore.YELLOW}Appending to existing record file: {RECORD_FILE}{Style.RESET_ALL}")
     
+    # Resume statistics from the last snapshot, reading only rows added since
+    aggregator = SpeedAggregator.load(STATS_FILE)
+    aggregator.catch_up(RECORD_FILE)
+    
+    if STATS_PORT is not None:
+        try:
+            serve_stats(aggregator, STATS_PORT)
+            print(f"{Fore.YELLOW}Serving statistics on http://127.0.0.1:{STATS_PORT}/{Style.RESET_ALL}")
+        except OSError as e:
+            print(f"{Fore.RED}Could not serve statistics: {e}{Style.RESET_ALL}")
+    
     serial_number = 1
     
     try:
         while True:
             run_speed_test(HIGH_THRESHOLD, LOW_THRESHOLD, serial_number, RECORD_FILE)
             
+            aggregator.catch_up(RECORD_FILE)
+            aggregator.snapshot(STATS_FILE)
+            print(format_summary(aggregator.summary()))
+            
             # Wait for the next test interval
             print(f"{Fore.CYAN}\nNext test in {TEST_INTERVAL//60} minutes...{Style.RESET_ALL}")
             time.sleep(TEST_INTERVAL)
@@ -0,0 +1,224 @@
+import sys
+import time
+import struct
+import random
+import argparse
+import threading
+from secoc_mac import ALGORITHMS, MacEngine
+
+SECRET_KEY = b'secret_key_123456'  # Shared secret key for MAC generation
+
+# Binary CAN frame layout: ID, DLC, freshness value (ms) and data padded to 8 bytes,
+# followed by the (possibly truncated) MAC. The MAC covers the header bytes.
+FRAME_HEADER = struct.Struct(">HBQ8s")
+
+def pack_frame(message_id, data, freshness, mac_engine):
+    """Build a binary CAN frame carrying its MAC."""
+    header = FRAME_HEADER.pack(message_id, len(data), freshness, data)
+    return header + mac_engine.generate(header)
+
+def unpack_frame(frame):
+    """
+    Split a binary CAN frame into its fields.
+
+    Returns a tuple (message_id, data, freshness, header, mac); header is the
+    part covered by the MAC.
+    """
+    header = frame[:FRAME_HEADER.size]
+    message_id, dlc, freshness, padded_data = FRAME_HEADER.unpack(header)
+    if dlc > 8:
+        raise ValueError(f"Invalid DLC: {dlc}")
+    return message_id, padded_data[:dlc], freshness, header, frame[FRAME_HEADER.size:]
+
+class FreshnessCounter:
+    """Millisecond timestamps made strictly increasing per message ID."""
+
+    def __init__(self):
+        self.last = {}
+
+    def next(self, message_id):
+        """Return the freshness value for the next frame of a message ID."""
+        freshness = max(int(time.time() * 1000), self.last.get(message_id, -1) + 1)
+        self.last[message_id] = freshness
+        return freshness
+
+class CanBus:
+    """
+    Fixed-capacity ring buffer shared by sender and receiver threads.
+
+    Slots are preallocated and reused, so memory does not grow with the number
+    of frames sent. Producers block while the buffer is full and consumers block
+    while it is empty, instead of polling.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._head = 0  # Index of the oldest item
+        self._size = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __len__(self):
+        with self._lock:
+            return self._size
+
+    def put(self, item, timeout=None):
+        """Append an item, waiting for free space. Returns False on timeout."""
+        with self._not_full:
+            if self._size == self.capacity:
+                if not self._not_full.wait_for(lambda: self._size < self.capacity, timeout):
+                    return False
+            self._slots[(self._head + self._size) % self.capacity] = item
+            self._size += 1
+            self._not_empty.notify()
+            return True
+
+    def get_batch(self, max_items=256, timeout=None):
+        """Remove and return up to max_items of the oldest items, waiting until at least one is available."""
+        with self._not_empty:
+            if self._size == 0:
+                if not self._not_empty.wait_for(lambda: self._size > 0, timeout):
+                    return []
+            count = min(max_items, self._size)
+            batch = []
+            for _ in range(count):
+                batch.append(self._slots[self._head])
+                self._slots[self._head] = None
+                self._head = (self._head + 1) % self.capacity
+            self._size -= count
+            self._not_full.notify_all()
+            return batch
+
+    def clear(self):
+        """Drop all pending items."""
+        with self._lock:
+            self._slots = [None] * self.capacity
+            self._head = 0
+            self._size = 0
+            self._not_full.notify_all()
+
+class ReplayWindow:
+    """
+    Sliding-window replay filter per message ID.
+
+    For each ID it keeps the highest accepted freshness value and a bitmap of
+    which of the preceding window_size values were already accepted. A frame is
+    a replay if its freshness is older than the window or was already seen.
+    Memory is bounded by the number of CAN IDs.
+    """
+
+    def __init__(self, window_size=64):
+        self.window_size = window_size
+        self._state = {}  # message_id -> (highest freshness, bitmap)
+
+    def accept(self, message_id, freshness):
+        """Record a freshness value. Returns False if the frame is a replay."""
+        state = self._state.get(message_id)
+        if state is None:
+            self._state[message_id] = (freshness, 1)
+            return True
+
+        highest, bitmap = state
+        if freshness > highest:
+            shift = freshness - highest
+            bitmap = ((bitmap << shift) | 1) & ((1 << self.window_size) - 1) if shift < self.window_size else 1
+            self._state[message_id] = (freshness, bitmap)
+            return True
+
+        offset = highest - freshness
+        if offset >= self.window_size or bitmap & (1 << offset):
+            return False
+        self._state[message_id] = (highest, bitmap | (1 << offset))
+        return True
+
+    def clear(self):
+        """Forget all freshness values."""
+        self._state.clear()
+
+def run_benchmark(num_frames, mac_engine, rate=None, capacity=4096, batch_size=256):
+    """
+    Push frames through the bus and verify them without a UI.
+
+    Args:
+        num_frames: Number of frames to send.
+        mac_engine: MacEngine used to sign and verify frames.
+        rate: Target send rate in frames/sec (None sends as fast as possible).
+        capacity: Capacity of the bus ring buffer.
+        batch_size: Maximum number of frames the receiver takes per wakeup.
+
+    Returns:
+        dict with throughput (frames/sec), verification latency percentiles in
+        milliseconds and the number of rejected frames.
+    """
+    bus = CanBus(capacity)
+    freshness_counter = FreshnessCounter()
+    replay_window = ReplayWindow()
+    latencies = []
+    rejected = 0
+    rng = random.Random(0)
+    payloads = [bytes(rng.randrange(256) for _ in range(rng.randint(1, 8))) for _ in range(1024)]
+
+    def send():
+        start = time.perf_counter()
+        for i in range(num_frames):
+            if rate:
+                # Pace against the schedule rather than sleeping a fixed amount per frame
+                delay = start + i / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            message_id = 0x100 + i % 0x700
+            frame = pack_frame(message_id, payloads[i % len(payloads)], freshness_counter.next(message_id), mac_engine)
+            bus.put((frame, time.perf_counter()))
+
+    def receive():
+        nonlocal rejected
+        received = 0
+        while received < num_frames:
+            batch = bus.get_batch(batch_size)
+            for frame, sent_at in batch:
+                message_id, _, freshness, header, mac = unpack_frame(frame)
+                if not mac_engine.verify(header, mac) or not replay_window.accept(message_id, freshness):
+                    rejected += 1
+                latencies.append(time.perf_counter() - sent_at)
+            received += len(batch)
+
+    sender = threading.Thread(target=send)
+    receiver = threading.Thread(target=receive)
+    start = time.perf_counter()
+    receiver.start()
+    sender.start()
+    sender.join()
+    receiver.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "frames": num_frames,
+        "elapsed_s": elapsed,
+        "frames_per_sec": num_frames / elapsed,
+        "latency_p50_ms": latencies[len(latencies) // 2] * 1000,
+        "latency_p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "latency_max_ms": latencies[-1] * 1000,
+        "rejected": rejected,
+    }
+
+def main():
+    """Run the headless bus benchmark and print its results."""
+    parser = argparse.ArgumentParser(description="Headless SecOC CAN bus benchmark")
+    parser.add_argument("--frames", type=int, default=100000, help="Number of frames to send")
+    parser.add_argument("--rate", type=float, default=None, help="Target send rate in frames/sec (default: unpaced)")
+    parser.add_argument("--capacity", type=int, default=4096, help="Bus ring buffer capacity")
+    parser.add_argument("--mac", choices=ALGORITHMS, default="hmac-sha256", help="MAC algorithm")
+    parser.add_argument("--mac-length", type=int, default=None, help="Truncated MAC length in bytes")
+    args = parser.parse_args()
+
+    mac_engine = MacEngine(SECRET_KEY, args.mac, args.mac_length)
+    results = run_benchmark(args.frames, mac_engine, args.rate, args.capacity)
+    for name, value in results.items():
+        print(f"{name:>16}: {value:.3f}" if isinstance(value, float) else f"{name:>16}: {value}")
+    sys.exit(0 if results["rejected"] == 0 else 1)
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,28 @@
 import sys
 import time
 import logging
-import hashlib
-import hmac
+import struct
 import threading
 import random
 from datetime import datetime
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QTableWidget, QTableWidgetItem, 
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QTableView,
                              QPushButton, QVBoxLayout, QWidget, QHeaderView, QMessageBox)
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, QEvent
-from PyQt5.QtGui import QColor
+from PyQt5.QtCore import (Qt, pyqtSignal, QThread, QEvent, QAbstractTableModel,
+                          QModelIndex, QTimer)
+from PyQt5.QtGui import QBrush, QColor
+from secoc_bus import (SECRET_KEY, FRAME_HEADER, CanBus, FreshnessCounter, ReplayWindow,
+                       pack_frame, unpack_frame)
+from secoc_mac import MacEngine
 
 # Global variables
-SECRET_KEY = b'secret_key_123456'  # Shared secret key for MAC generation
-can_bus = []  # Simulated CAN bus as a shared list
+mac_engine = MacEngine(SECRET_KEY, mac_length=8)  # 64-bit truncated MAC, as in common SecOC profiles
+can_bus = CanBus(capacity=4096)  # Simulated CAN bus as a bounded ring buffer of binary frames
 freshness_manager = {}  # Dictionary to track freshness values per message ID
 stop_event = threading.Event()  # Event to signal threads to stop
 
+TABLE_CAPACITY = 10000  # Maximum number of rows kept in the message table
+TABLE_FLUSH_INTERVAL_MS = 50  # Interval at which new rows are added to the table
+
 # Logging setup
 def setup_logging():
     """Logging setup"""
@@ -29,23 +35,13 @@ def setup_logging():
         ]
     )
 
-def generate_mac(message, freshness, key):
-    """Generate a MAC for a given message and freshness (timestamp)."""
-    data = f"{message}{freshness}".encode('utf-8')
-    mac = hmac.new(key, data, hashlib.sha256).hexdigest()
-    return mac
-
-def verify_mac(message, freshness, received_mac, key):
-    """Verify the MAC for a given message and freshness (timestamp)."""
-    expected_mac = generate_mac(message, freshness, key)
-    return hmac.compare_digest(expected_mac, received_mac)
-
 class SenderThread(QThread):
     new_message_signal = pyqtSignal(list, bool, str)
     
     def __init__(self):
         super().__init__()
         self.last_sent_freshness = {}
+        self.freshness_counter = FreshnessCounter()
 
     def run(self):
         """Simulate a sender ECU."""
@@ -57,25 +53,25 @@ class SenderThread(QThread):
                 # Generate message data
                 message_id = random.randint(0x100, 0x7FF)  # Standard CAN ID range
                 data_length = random.randint(1, 8)
-                message_data = ''.join([f"{random.randint(0, 255):02X}" for _ in range(data_length)])
+                message_data = bytes(random.randint(0, 255) for _ in range(data_length))
                 
-                # Generate freshness value (timestamp)
-                current_time = int(time.time() * 1000)  # Milliseconds
+                # Generate freshness value (timestamp, strictly increasing per ID)
+                current_time = self.freshness_counter.next(message_id)
                 self.last_sent_freshness[message_id] = current_time
                 
-                # Generate MAC
-                mac = generate_mac(message_data, current_time, SECRET_KEY)
-                
-                # Format CAN message
-                can_message = f"{message_id:03X}#{message_data}#{current_time}#{mac}"
+                # Build binary CAN frame with MAC
+                can_message = pack_frame(message_id, message_data, current_time, mac_engine)
+                mac = can_message[FRAME_HEADER.size:].hex()
                 
                 # Add to CAN bus
-                can_bus.append(can_message)
+                if not can_bus.put(can_message, timeout=1.0):
+                    logging.warning("CAN bus full, dropping message")
+                    continue
                 
                 # Emit signal for UI update
                 message_parts = [
                     datetime.now().strftime("%H:%M:%S.%f")[:-3],
-                    message_data,
+                    message_data.hex().upper(),
                     f"{message_id:03X}",
                     str(data_length),
                     str(current_time),
@@ -85,7 +81,7 @@ class SenderThread(QThread):
                 self.new_message_signal.emit(message_parts, False, "sent")
                 
                 message_counter += 1
-                logging.info(f"Sent message {message_counter}: {can_message}")
+                logging.info(f"Sent message {message_counter}: {can_message.hex()}")
                 
                 # Wait before sending next message
                 time.sleep(random.uniform(0.5, 2.0))
@@ -100,69 +96,135 @@ class ReceiverThread(QThread):
     def __init__(self):
         super().__init__()
         self.replay_attack_triggered = False
+        self.replay_window = ReplayWindow(window_size=64)
 
     def run(self):
         """Simulate a receiver ECU."""
         logging.info("Receiver thread started")
-        processed_messages = set()
         
         while not stop_event.is_set():
             try:
-                if can_bus:
-                    # Get the oldest message from CAN bus
-                    can_message = can_bus.pop(0)
-                    
-                    # Parse CAN message
-                    try:
-                        message_id_str, message_data, freshness_str, received_mac = can_message.split('#')
-                        message_id = int(message_id_str, 16)
-                        freshness = int(freshness_str)
-                    except ValueError:
-                        logging.warning(f"Invalid message format: {can_message}")
-                        continue
-                    
-                    # Check for replay attack
-                    is_replay = False
-                    message_signature = f"{message_id}_{freshness}_{received_mac}"
-                    
-                    if message_signature in processed_messages:
-                        is_replay = True
-                        self.replay_attack_triggered = True
-                        logging.warning(f"Replay attack detected! Message: {can_message}")
-                    else:
-                        processed_messages.add(message_signature)
-                    
-                    # Verify MAC
-                    mac_valid = verify_mac(message_data, freshness, received_mac, SECRET_KEY)
-                    
-                    if not mac_valid:
-                        logging.warning(f"MAC verification failed for message: {can_message}")
-                        continue
-                    
-                    # Update freshness value for this message ID
-                    if message_id not in freshness_manager or freshness > freshness_manager[message_id]:
-                        freshness_manager[message_id] = freshness
-                    
-                    # Emit signal for UI update
-                    message_parts = [
-                        datetime.now().strftime("%H:%M:%S.%f")[:-3],
-                        message_data,
-                        message_id_str,
-                        str(len(message_data) // 2),  # DLC
-                        freshness_str,
-                        received_mac,
-                        "Received"
-                    ]
-                    self.new_message_signal.emit(message_parts, is_replay, "received")
-                    
-                    logging.info(f"Received valid message: {can_message}")
-                
-                time.sleep(0.1)  # Small delay to prevent busy waiting
+                # Wait for frames instead of polling; the timeout lets the thread notice stop_event
+                for can_message in can_bus.get_batch(max_items=256, timeout=0.1):
+                    self.process_frame(can_message)
                 
             except Exception as e:
                 logging.error(f"Error in receiver thread: {e}")
                 break
 
+    def process_frame(self, can_message):
+        """Verify a single binary frame and report it to the UI."""
+        # Parse CAN message
+        try:
+            message_id, message_data, freshness, header, received_mac = unpack_frame(can_message)
+        except (ValueError, struct.error):
+            logging.warning(f"Invalid message format: {can_message.hex()}")
+            return
+        
+        # Verify MAC before touching the replay window, so forged frames cannot advance it
+        if not mac_engine.verify(header, received_mac):
+            logging.warning(f"MAC verification failed for message: {can_message.hex()}")
+            return
+        
+        # Check for replay attack
+        is_replay = not self.replay_window.accept(message_id, freshness)
+        if is_replay:
+            self.replay_attack_triggered = True
+            logging.warning(f"Replay attack detected! Message: {can_message.hex()}")
+        
+        # Update freshness value for this message ID
+        if message_id not in freshness_manager or freshness > freshness_manager[message_id]:
+            freshness_manager[message_id] = freshness
+        
+        # Emit signal for UI update
+        message_parts = [
+            datetime.now().strftime("%H:%M:%S.%f")[:-3],
+            message_data.hex().upper(),
+            f"{message_id:03X}",
+            str(len(message_data)),  # DLC
+            str(freshness),
+            received_mac.hex(),
+            "Received"
+        ]
+        self.new_message_signal.emit(message_parts, is_replay, "received")
+        
+        logging.info(f"Received valid message: {can_message.hex()}")
+
+class MessageTableModel(QAbstractTableModel):
+    """
+    Table model over a fixed-capacity ring buffer of messages.
+
+    Rows appended between two calls to flush() are inserted in one batch, and
+    once the buffer is full the oldest rows are dropped, so memory and repaint
+    cost stay flat however long the simulation runs.
+    """
+    HEADERS = ["Timestamp", "Message", "ID", "DLC", "Freshness", "MAC", "Type"]
+    REPLAY_BRUSH = QBrush(QColor(255, 200, 200))  # Light red
+
+    def __init__(self, capacity=TABLE_CAPACITY, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self._rows = [None] * capacity
+        self._start = 0  # Buffer index of the first visible row
+        self._count = 0
+        self._pending = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        message_parts, is_replay_attack = self._rows[(self._start + index.row()) % self.capacity]
+        if role == Qt.DisplayRole:
+            return message_parts[index.column()]
+        if role == Qt.BackgroundRole and is_replay_attack:
+            return self.REPLAY_BRUSH
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def append(self, message_parts, is_replay_attack):
+        """Queue a row; it becomes visible at the next flush()."""
+        self._pending.append((message_parts, is_replay_attack))
+
+    def flush(self):
+        """Insert all queued rows in one batch. Returns True if any row was added."""
+        if not self._pending:
+            return False
+        pending = self._pending[-self.capacity:]
+        self._pending = []
+
+        overflow = self._count + len(pending) - self.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            self._start = (self._start + overflow) % self.capacity
+            self._count -= overflow
+            self.endRemoveRows()
+
+        first = self._count
+        self.beginInsertRows(QModelIndex(), first, first + len(pending) - 1)
+        for offset, row in enumerate(pending):
+            self._rows[(self._start + first + offset) % self.capacity] = row
+        self._count += len(pending)
+        self.endInsertRows()
+        return True
+
+    def clear(self):
+        """Remove all rows, including queued ones."""
+        self.beginResetModel()
+        self._rows = [None] * self.capacity
+        self._start = 0
+        self._count = 0
+        self._pending = []
+        self.endResetModel()
+
 class MainWindow(QMainWindow):
     def __init__(self):
         """Initialize the main window for a CAN Message Simulation application, setting up the UI components (table, buttons), layout, and background threads for message handling."""
@@ -180,14 +242,19 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout(central_widget)
         
-        # Create table widget
-        self.tableWidget = QTableWidget()
-        self.tableWidget.setColumnCount(7)
-        self.tableWidget.setHorizontalHeaderLabels([
-            "Timestamp", "Message", "ID", "DLC", "Freshness", "MAC", "Type"
-        ])
-        self.tableWidget.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        layout.addWidget(self.tableWidget)
+        # Create table view backed by a fixed-capacity model
+        self.table_model = MessageTableModel(TABLE_CAPACITY)
+        self.tableView = QTableView()
+        self.tableView.setModel(self.table_model)
+        self.tableView.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Fixed row heights avoid measuring every row when rows are added
+        self.tableView.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        layout.addWidget(self.tableView)
+        
+        # Coalesce incoming messages into timed batches
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush_table)
+        self.flush_timer.start(TABLE_FLUSH_INTERVAL_MS)
         
         # Create buttons
         button_layout = QVBoxLayout()
@@ -247,39 +314,29 @@ class MainWindow(QMainWindow):
             for msg_id, freshness in self.sender_thread.last_sent_freshness.items():
                 # Create a fake message with the same freshness and MAC
                 data_length = random.randint(1, 8)
-                message_data = ''.join([f"{random.randint(0, 255):02X}" for _ in range(data_length)])
-                mac = generate_mac(message_data, freshness, SECRET_KEY)
+                message_data = bytes(random.randint(0, 255) for _ in range(data_length))
                 
-                can_message = f"{msg_id:03X}#{message_data}#{freshness}#{mac}"
-                can_bus.append(can_message)
+                can_message = pack_frame(msg_id, message_data, freshness, mac_engine)
+                can_bus.put(can_message, timeout=1.0)
                 
                 logging.warning(f"Replay attack triggered for message ID {msg_id:03X}")
             
             self.replay_attack_triggered = True
 
     def clear_simulation(self):
-        """Clear the simulation window for easier analysis
-        self.tableWidget.clearContents()"""
-        self.tableWidget.setRowCount(0)
+        """Clear the simulation window for easier analysis."""
+        self.table_model.clear()
 
     def update_table(self, message_parts, is_replay_attack, message_type):
-        """Update a table widget with message details including timestamp, message content, ID, DLC, freshness value, MAC, and message type, highlighting rows in red if a replay attack is detected."""
-        row_position = self.tableWidget.rowCount()
-        self.tableWidget.insertRow(row_position)
-        
-        for col, part in enumerate(message_parts):
-            item = QTableWidgetItem(part)
-            self.tableWidget.setItem(row_position, col, item)
-        
-        # Highlight replay attacks in red
-        if is_replay_attack:
-            for col in range(self.tableWidget.columnCount()):
-                item = self.tableWidget.item(row_position, col)
-                if item:
-                    item.setBackground(QColor(255, 200, 200))  # Light red
-        
-        # Auto-scroll to the bottom
-        self.tableWidget.scrollToBottom()
+        """Queue message details including timestamp, message content, ID, DLC, freshness value, MAC, and message type for the table, highlighting rows in red if a replay attack is detected."""
+        self.table_model.append(message_parts, is_replay_attack)
+
+    def flush_table(self):
+        """Add queued messages to the table in one batch and keep it scrolled to the bottom."""
+        scrollbar = self.tableView.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        if self.table_model.flush() and at_bottom:
+            self.tableView.scrollToBottom()
 
     def closeEvent(self, event):
         """Handle closing of the application."""
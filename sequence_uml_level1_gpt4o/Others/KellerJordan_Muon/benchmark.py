@@ -0,0 +1,200 @@
+"""
+Benchmark suite for Muon.
+
+Two sweeps are run:
+
+- kernel: Newton-Schulz orthogonalization over matrix shapes, ns_steps, compute dtypes and batch
+  sizes, recording wall time, bytes allocated and the orthogonality error against the exact
+  polar factor U V^T from an SVD.
+- step: full Muon.step() over parameter shapes and counts for the per-parameter and batched
+  modes, recording wall time, bytes allocated and the per-phase breakdown from StepProfiler.
+
+    python benchmark.py --shapes 256x256,256x1024 --ns-steps 5 --dtypes float32,bfloat16
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import torch
+from torch.profiler import ProfilerActivity, profile
+
+from muon import Muon, StepProfiler, zeropower_via_newtonschulz5, zeropower_via_newtonschulz5_batched
+
+
+DTYPES = {'float32': torch.float32, 'bfloat16': torch.bfloat16, 'float16': torch.float16}
+
+
+def parse_shape(text: str) -> Tuple[int, int]:
+    rows, cols = text.lower().split('x')
+    return int(rows), int(cols)
+
+
+def time_fn(fn: Callable[[], Any], repeats: int, device: torch.device) -> float:
+    """Median wall time of `fn` in milliseconds, after one warm-up call."""
+    def sync():
+        if device.type == 'cuda':
+            torch.cuda.synchronize(device)
+
+    fn()
+    sync()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        sync()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bytes_allocated(fn: Callable[[], Any], device: torch.device) -> int:
+    """Total bytes allocated by one call of `fn` on `device`."""
+    if device.type == 'cuda':
+        torch.cuda.synchronize(device)
+        before = torch.cuda.memory_stats(device).get('allocated_bytes.all.allocated', 0)
+        fn()
+        torch.cuda.synchronize(device)
+        return torch.cuda.memory_stats(device).get('allocated_bytes.all.allocated', 0) - before
+
+    with profile(activities=[ProfilerActivity.CPU], profile_memory=True) as prof:
+        fn()
+    # Self usage only: inclusive usage counts an allocation again in every enclosing op and record_function
+    return sum(event.self_cpu_memory_usage for event in prof.events() if event.self_cpu_memory_usage > 0)
+
+
+def orthogonality_error(G: torch.Tensor, X: torch.Tensor) -> Dict[str, float]:
+    """
+    Compare X with the polar factor U V^T of G (USV^T = G) and report the spread of X's singular
+    values, which the Newton-Schulz iteration only pushes into a band around one.
+    """
+    G64, X64 = G.double(), X.double()
+    U, _, Vh = torch.linalg.svd(G64, full_matrices=False)
+    polar = U @ Vh
+    error = torch.linalg.matrix_norm(X64 - polar) / torch.linalg.matrix_norm(polar)
+    singular_values = torch.linalg.svdvals(X64)
+    return {
+        'relative_error': error.max().item(),
+        'sv_min': singular_values.min().item(),
+        'sv_max': singular_values.max().item(),
+    }
+
+
+def normalized_input(batch: int, rows: int, cols: int, device: torch.device, seed: int = 0) -> torch.Tensor:
+    """Random matrices scaled to unit Frobenius norm, so every singular value is at most one."""
+    generator = torch.Generator(device='cpu').manual_seed(seed)
+    G = torch.randn(batch, rows, cols, generator=generator).to(device)
+    return G / torch.linalg.matrix_norm(G, keepdim=True).clamp_min(1e-7)
+
+
+def kernel_sweep(shapes, ns_steps_list, dtypes, batch_sizes, repeats, device) -> List[Dict]:
+    results = []
+    for rows, cols in shapes:
+        for batch in batch_sizes:
+            G = normalized_input(batch, rows, cols, device)
+            for ns_steps in ns_steps_list:
+                for dtype_name in dtypes:
+                    dtype = DTYPES[dtype_name]
+
+                    def loop():
+                        return torch.stack([zeropower_via_newtonschulz5(g.to(dtype), ns_steps) for g in G])
+
+                    workspace = {}
+
+                    def batched():
+                        return zeropower_via_newtonschulz5_batched(G, ns_steps, dtype, workspace)
+
+                    for mode, fn in (('loop', loop), ('batched', batched)):
+                        row = {
+                            'sweep': 'kernel', 'mode': mode, 'shape': f'{rows}x{cols}', 'batch': batch,
+                            'ns_steps': ns_steps, 'dtype': dtype_name,
+                            'time_ms': time_fn(fn, repeats, device),
+                            'alloc_bytes': bytes_allocated(fn, device),
+                        }
+                        row.update(orthogonality_error(G, fn()))
+                        results.append(row)
+    return results
+
+
+def step_sweep(shapes, counts, ns_steps_list, dtypes, repeats, device) -> List[Dict]:
+    results = []
+    for rows, cols in shapes:
+        for count in counts:
+            for ns_steps in ns_steps_list:
+                modes = [('per-param', dict(batched=False))]
+                modes += [(f'batched-{name}', dict(batched=True, ns_dtype=DTYPES[name])) for name in dtypes]
+                for mode, options in modes:
+                    generator = torch.Generator(device='cpu').manual_seed(0)
+                    params = [torch.nn.Parameter((torch.randn(rows, cols, generator=generator) * 0.02).to(device))
+                              for _ in range(count)]
+                    for p in params:
+                        p.grad = normalized_input(1, rows, cols, device)[0] * 0.1
+
+                    profiler = StepProfiler()
+                    opt = Muon(params, lr=0.02, momentum=0.95, nesterov=True, ns_steps=ns_steps,
+                               profiler=profiler, **options)
+                    time_ms = time_fn(opt.step, repeats, device)
+                    alloc = bytes_allocated(opt.step, device)
+                    profiler.reset()
+                    for _ in range(repeats):
+                        opt.step()
+
+                    row = {
+                        'sweep': 'step', 'mode': mode, 'shape': f'{rows}x{cols}', 'count': count,
+                        'ns_steps': ns_steps, 'time_ms': time_ms, 'alloc_bytes': alloc,
+                    }
+                    row.update({f'{phase}_ms': ms for phase, ms in profiler.summary().items()})
+                    results.append(row)
+    return results
+
+
+def print_table(rows: List[Dict]) -> None:
+    if not rows:
+        return
+    columns = list(rows[0])
+    formatted = [[f'{row[c]:.4g}' if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in formatted)) for i, c in enumerate(columns)]
+    print('  '.join(c.rjust(w) for c, w in zip(columns, widths)))
+    for r in formatted:
+        print('  '.join(v.rjust(w) for v, w in zip(r, widths)))
+    print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark Muon and its Newton-Schulz kernels')
+    parser.add_argument('--shapes', default='128x128,256x256,256x1024,1024x256')
+    parser.add_argument('--ns-steps', default='5')
+    parser.add_argument('--dtypes', default='float32,bfloat16')
+    parser.add_argument('--batch-sizes', default='1,8', help='Matrices per kernel call')
+    parser.add_argument('--counts', default='4,16', help='Parameters per optimizer step')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--sweeps', default='kernel,step')
+    parser.add_argument('--device', default='cuda' if torch.cuda.is_available() else 'cpu')
+    parser.add_argument('--json', help='Also write the results to this file')
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    shapes = [parse_shape(s) for s in args.shapes.split(',')]
+    ns_steps_list = [int(n) for n in args.ns_steps.split(',')]
+    dtypes = args.dtypes.split(',')
+    sweeps = args.sweeps.split(',')
+
+    results = []
+    if 'kernel' in sweeps:
+        rows = kernel_sweep(shapes, ns_steps_list, dtypes,
+                            [int(b) for b in args.batch_sizes.split(',')], args.repeats, device)
+        print_table(rows)
+        results += rows
+    if 'step' in sweeps:
+        rows = step_sweep(shapes, [int(c) for c in args.counts.split(',')], ns_steps_list,
+                          dtypes, args.repeats, device)
+        print_table(rows)
+        results += rows
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
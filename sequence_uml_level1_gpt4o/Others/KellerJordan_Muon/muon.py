@@ -1,7 +1,10 @@
+import time
 import torch
 import torch.distributed as dist
 from torch.optim.optimizer import Optimizer
-from typing import Any
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 def zeropower_via_newtonschulz5(G, steps) -> torch.Tensor:
@@ -17,12 +20,114 @@ def zeropower_via_newtonschulz5(G, steps) -> torch.Tensor:
     X = G
     for _ in range(steps):
         XTX = X.transpose(-2, -1) @ X
-        X = X @ (1.875 * torch.eye(X.size(-1), device=X.device, dtype=X.dtype) - 
-                 1.25 * XTX + 
-                 0.375 * XTX @ XTX)
+        # 1.875 * I - 1.25 * XTX + 0.375 * XTX @ XTX, without materializing the identity
+        B = XTX @ XTX
+        B.mul_(0.375).add_(XTX, alpha=-1.25)
+        B.diagonal(dim1=-2, dim2=-1).add_(1.875)
+        X = X @ B
     return X
 
 
+def zeropower_via_newtonschulz5_batched(
+    G: torch.Tensor,
+    steps: int,
+    dtype: Optional[torch.dtype] = None,
+    workspace: Optional[Dict[Tuple, List[torch.Tensor]]] = None,
+) -> torch.Tensor:
+    """
+    Batched version of zeropower_via_newtonschulz5 for a stack of same-shape matrices G of shape
+    (batch, m, n). Each iteration is one batched matmul per term instead of one matmul per matrix.
+
+    Since X p(X^T X) = p(X X^T) X, wide matrices are iterated as is and tall ones are transposed
+    first, so the Gram matrix is always built on the smaller side (min(m, n) squared). `dtype`
+    selects the compute precision (e.g. torch.bfloat16); the result is returned in G's dtype.
+    When a `workspace` dict is given, the intermediate buffers are allocated once per
+    (shape, dtype, device) and reused on later calls.
+    """
+    transposed = G.size(-2) > G.size(-1)
+    X = G.transpose(-2, -1) if transposed else G
+    batch, rows, cols = X.shape
+    dtype = dtype or G.dtype
+
+    key = (batch, rows, cols, dtype, G.device)
+    buffers = workspace.get(key) if workspace is not None else None
+    if buffers is None:
+        buffers = [
+            torch.empty(batch, rows, cols, dtype=dtype, device=G.device),  # X
+            torch.empty(batch, rows, cols, dtype=dtype, device=G.device),  # next X
+            torch.empty(batch, rows, rows, dtype=dtype, device=G.device),  # X X^T
+            torch.empty(batch, rows, rows, dtype=dtype, device=G.device),  # polynomial
+        ]
+        if workspace is not None:
+            workspace[key] = buffers
+    X_cur, X_next, A, B = buffers
+
+    X_cur.copy_(X)
+    for _ in range(steps):
+        torch.bmm(X_cur, X_cur.transpose(-2, -1), out=A)
+        # B = 0.375 * A @ A - 1.25 * A + 1.875 * I
+        torch.baddbmm(A, A, A, beta=-1.25, alpha=0.375, out=B)
+        B.diagonal(dim1=-2, dim2=-1).add_(1.875)
+        torch.bmm(B, X_cur, out=X_next)
+        X_cur, X_next = X_next, X_cur
+
+    result = X_cur.transpose(-2, -1) if transposed else X_cur
+    return result.to(G.dtype, copy=True)
+
+
+class StepProfiler:
+    """
+    Opt-in per-phase timing of Muon.step(), enabled with Muon(..., profiler=StepProfiler()).
+
+    Wall time is accumulated separately for the momentum, Newton-Schulz, communication and update
+    phases. On CUDA the device is synchronized around each phase so that time is attributed to
+    the phase that launched the kernels; this adds overhead, so only enable it when measuring.
+    """
+
+    PHASES = ('momentum', 'newton_schulz', 'communication', 'update')
+
+    def __init__(self):
+        self.steps = 0
+        self.totals = {phase: 0.0 for phase in self.PHASES}
+        self.last_step = {phase: 0.0 for phase in self.PHASES}
+
+    @staticmethod
+    def _synchronize() -> None:
+        if torch.cuda.is_available() and torch.cuda.is_initialized():
+            torch.cuda.synchronize()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as part of phase `name`."""
+        self._synchronize()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._synchronize()
+            self.last_step[name] += time.perf_counter() - start
+
+    def begin_step(self) -> None:
+        self.last_step = {phase: 0.0 for phase in self.PHASES}
+
+    def end_step(self) -> None:
+        self.steps += 1
+        for phase, seconds in self.last_step.items():
+            self.totals[phase] += seconds
+
+    def summary(self) -> Dict[str, float]:
+        """Mean milliseconds per step spent in each phase."""
+        steps = max(self.steps, 1)
+        return {phase: seconds / steps * 1000 for phase, seconds in self.totals.items()}
+
+    def reset(self) -> None:
+        self.steps = 0
+        self.totals = {phase: 0.0 for phase in self.PHASES}
+
+
+_NO_PHASE = nullcontext()
+
+
 class Muon(Optimizer):
     """
     Muon - MomentUm Orthogonalized by Newton-schulz
@@ -44,9 +149,21 @@ class Muon(Optimizer):
         momentum: The momentum used by the internal SGD.
         nesterov: Whether to use Nesterov-style momentum in the internal SGD. (recommended)
         ns_steps: The number of Newton-Schulz iteration steps to use.
+        batched: Group 2D parameters of the same shape and orthogonalize each group with one
+            batched Newton-Schulz iteration, reusing preallocated workspace buffers. Only used
+            when world_size == 1.
+        ns_dtype: Compute dtype of the batched Newton-Schulz iteration (e.g. torch.bfloat16).
+            Defaults to the parameter dtype.
+        sharded: When world_size > 1, assign whole 2D parameters to ranks round-robin instead of
+            all-gathering every gradient. Each parameter is orthogonalized only by its owner, which
+            broadcasts the update asynchronously while it moves on to its next parameter. Expects
+            gradients already synchronized across ranks (e.g. by DistributedDataParallel); momentum
+            buffers of 2D parameters are only kept on their owner.
+        profiler: Optional StepProfiler that records the time spent in each phase of step().
     """
 
-    def __init__(self, params, lr, weight_decay=0, momentum=0, nesterov=False, ns_steps=5, rank=0, world_size=1):
+    def __init__(self, params, lr, weight_decay=0, momentum=0, nesterov=False, ns_steps=5, rank=0, world_size=1,
+                 batched=False, ns_dtype=None, sharded=False, profiler=None):
         if lr < 0.0:
             raise ValueError(f"Invalid learning rate: {lr}")
         if weight_decay < 0.0:
@@ -57,21 +174,141 @@ class Muon(Optimizer):
             raise ValueError(f"Invalid ns_steps value: {ns_steps}")
 
         defaults = dict(lr=lr, weight_decay=weight_decay, momentum=momentum, 
-                       nesterov=nesterov, ns_steps=ns_steps)
+                       nesterov=nesterov, ns_steps=ns_steps, batched=batched, ns_dtype=ns_dtype)
         super().__init__(params, defaults)
         
         self.rank = rank
         self.world_size = world_size
+        self.sharded = sharded
+        self.profiler = profiler
+        self._ns_workspace: Dict[Tuple, List[torch.Tensor]] = {}
+
+    def _phase(self, name: str):
+        """Context manager timing a phase when profiling is enabled, a no-op otherwise."""
+        return self.profiler.phase(name) if self.profiler is not None else _NO_PHASE
+
+    def _momentum_update(self, p, group) -> torch.Tensor:
+        """Apply weight decay and (Nesterov) momentum to p's gradient and return the update direction."""
+        with self._phase('momentum'):
+            return self._momentum_update_unprofiled(p, group)
+
+    def _momentum_update_unprofiled(self, p, group) -> torch.Tensor:
+        grad = p.grad.data
+        state = self.state[p]
+
+        # Initialize state if needed
+        if 'momentum_buffer' not in state:
+            state['momentum_buffer'] = torch.zeros_like(p.data)
+
+        buf = state['momentum_buffer']
+
+        # Apply weight decay
+        if group['weight_decay'] != 0:
+            grad = grad.add(p.data, alpha=group['weight_decay'])
+
+        # Update momentum buffer
+        momentum = group['momentum']
+        if momentum != 0:
+            buf.mul_(momentum).add_(grad)
+            if group['nesterov']:
+                grad = grad.add(buf, alpha=momentum)
+            else:
+                grad = buf
+
+        return grad
+
+    def _step_batched(self, group) -> None:
+        """Update one parameter group, orthogonalizing same-shape 2D updates together."""
+        lr = group['lr']
+        buckets: Dict[Tuple, List[Tuple[torch.Tensor, torch.Tensor]]] = {}
+
+        for p in group['params']:
+            if p.grad is None:
+                continue
+            update = self._momentum_update(p, group)
+            if p.data.dim() == 2:
+                buckets.setdefault((p.shape, p.dtype, p.device), []).append((p, update))
+            else:
+                # Standard SGD update for non-2D parameters
+                with self._phase('update'):
+                    p.data.add_(update, alpha=-lr)
+
+        for (shape, dtype, device), bucket in buckets.items():
+            key = ('stacked', len(bucket), *shape, dtype, device)
+            stacked = self._ns_workspace.get(key)
+            if stacked is None:
+                stacked = self._ns_workspace[key] = torch.empty(len(bucket), *shape, dtype=dtype, device=device)
+            with self._phase('newton_schulz'):
+                torch.stack([update for _, update in bucket], out=stacked)
+                orthogonal = zeropower_via_newtonschulz5_batched(
+                    stacked, group['ns_steps'], group['ns_dtype'], self._ns_workspace
+                )
+            with self._phase('update'):
+                for (p, _), orthogonal_grad in zip(bucket, orthogonal):
+                    p.data.add_(orthogonal_grad, alpha=-lr)
+
+    def _step_sharded(self, group) -> None:
+        """Update one parameter group, orthogonalizing each 2D parameter on a single owner rank."""
+        lr = group['lr']
+        pending = deque()
+
+        def apply_completed(wait: bool) -> None:
+            # Apply broadcast updates in issue order as they arrive, releasing their buffers
+            while pending and (wait or pending[0][2].is_completed()):
+                p, update, handle = pending.popleft()
+                with self._phase('communication'):
+                    handle.wait()
+                with self._phase('update'):
+                    p.data.add_(update, alpha=-lr)
+
+        index = 0
+        for p in group['params']:
+            if p.grad is None:
+                continue
+
+            if p.data.dim() != 2:
+                # Standard SGD update for non-2D parameters, replicated on every rank
+                update = self._momentum_update(p, group)
+                with self._phase('update'):
+                    p.data.add_(update, alpha=-lr)
+                continue
+
+            owner = index % self.world_size
+            index += 1
+            if owner == self.rank:
+                update = self._momentum_update(p, group)
+                with self._phase('newton_schulz'):
+                    update = zeropower_via_newtonschulz5(update, group['ns_steps'])
+                    update = update.to(p.dtype).contiguous()
+            else:
+                update = torch.empty_like(p.data)
+
+            # Collectives are issued in the same order on every rank, so this matches the owner's
+            # send; the next owned parameter is orthogonalized while the broadcast is in flight
+            with self._phase('communication'):
+                handle = dist.broadcast(update, src=owner, async_op=True)
+            pending.append((p, update, handle))
+            apply_completed(wait=False)
+
+        apply_completed(wait=True)
 
     def step(self) -> None:
         """
         Perform a distributed optimization step with momentum, weight decay, and Nesterov acceleration, 
         utilizing asynchronous all-gather operations for efficient parameter updates across multiple processes.
         """
+        if self.profiler is not None:
+            self.profiler.begin_step()
+
         for group in self.param_groups:
-            weight_decay = group['weight_decay']
-            momentum = group['momentum']
-            nesterov = group['nesterov']
+            if group['batched'] and self.world_size == 1:
+                self._step_batched(group)
+                continue
+
+            if self.sharded and self.world_size > 1:
+                self._step_sharded(group)
+                continue
+
             lr = group['lr']
             ns_steps = group['ns_steps']
 
@@ -79,39 +316,20 @@ class Muon(Optimizer):
                 if p.grad is None:
                     continue
 
-                grad = p.grad.data
-                state = self.state[p]
-
-                # Initialize state if needed
-                if 'momentum_buffer' not in state:
-                    state['momentum_buffer'] = torch.zeros_like(p.data)
-
-                buf = state['momentum_buffer']
-
-                # Apply weight decay
-                if weight_decay != 0:
-                    grad = grad.add(p.data, alpha=weight_decay)
-
-                # Update momentum buffer
-                if momentum != 0:
-                    buf.mul_(momentum).add_(grad)
-                    if nesterov:
-                        grad = grad.add(buf, alpha=momentum)
-                    else:
-                        grad = buf
-                else:
-                    buf = grad
+                grad = self._momentum_update(p, group)
 
                 # For 2D parameters, apply orthogonalization
                 if p.data.dim() == 2:
                     # All-gather gradients across processes if distributed
                     if self.world_size > 1:
-                        grad_list = [torch.empty_like(grad) for _ in range(self.world_size)]
-                        dist.all_gather(grad_list, grad)
-                        grad = torch.cat(grad_list, dim=0)
+                        with self._phase('communication'):
+                            grad_list = [torch.empty_like(grad) for _ in range(self.world_size)]
+                            dist.all_gather(grad_list, grad)
+                            grad = torch.cat(grad_list, dim=0)
 
                     # Apply Newton-Schulz orthogonalization
-                    orthogonal_grad = zeropower_via_newtonschulz5(grad, ns_steps)
+                    with self._phase('newton_schulz'):
+                        orthogonal_grad = zeropower_via_newtonschulz5(grad, ns_steps)
                     
                     # Scatter back if distributed
                     if self.world_size > 1:
@@ -119,7 +337,12 @@ class Muon(Optimizer):
                         orthogonal_grad = orthogonal_grad[self.rank * chunk_size:(self.rank + 1) * chunk_size]
                     
                     # Update parameter
-                    p.data.add_(orthogonal_grad, alpha=-lr)
+                    with self._phase('update'):
+                        p.data.add_(orthogonal_grad, alpha=-lr)
                 else:
                     # Standard SGD update for non-2D parameters
-                    p.data.add_(grad, alpha=-lr)
\ No newline at end of file
+                    with self._phase('update'):
+                        p.data.add_(grad, alpha=-lr)
+
+        if self.profiler is not None:
+            self.profiler.end_step()
\ No newline at end of file
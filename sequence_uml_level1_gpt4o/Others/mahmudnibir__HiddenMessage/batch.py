@@ -0,0 +1,136 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+import main as stego
+
+IMAGE_EXTENSIONS = (".png", ".bmp", ".tif", ".tiff", ".jpg", ".jpeg")
+
+def _init_worker(password, key):
+    """Seed the worker's key cache so it never runs the KDF itself"""
+    stego.cache_key(password, key)
+
+def _hide_one(args):
+    image_path, text, output_path, password = args
+    start = time.perf_counter()
+    result = stego.hide_text_in_image(image_path, text, output_path, password)
+    return image_path, result, time.perf_counter() - start
+
+def _extract_one(args):
+    image_path, password = args
+    start = time.perf_counter()
+    result = stego.extract_text_from_image(image_path, password)
+    return image_path, result, time.perf_counter() - start
+
+def find_images(directory):
+    """List the image files in a directory, sorted by name"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+def run_batch(func, jobs, password, workers=None):
+    """
+    Run jobs on a process pool that shares one derived key.
+
+    The key is derived once here and handed to every worker, so the PBKDF2
+    cost is paid once per password instead of once per image.
+
+    Returns:
+        list of (image_path, result, seconds) tuples in job order.
+    """
+    key = stego.generate_key(password)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(password, key)) as pool:
+        return list(pool.map(func, jobs))
+
+def hide_many(image_paths, text, output_dir, password, workers=None):
+    """
+    Hide the same encrypted text in many images.
+
+    Outputs are saved as PNG in output_dir, since lossy formats would destroy
+    the hidden bits.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [
+        (path, text, output_path, password)
+        for path, output_path in zip(image_paths, output_paths(image_paths, output_dir))
+    ]
+    return run_batch(_hide_one, jobs, password, workers)
+
+def output_paths(image_paths, output_dir):
+    """
+    Give every input image its own PNG path in output_dir.
+
+    Non-PNG inputs keep their extension in the name (a.jpg -> a.jpg.png) so
+    a.jpg and a.png do not collide; any remaining clash gets a numeric suffix,
+    since workers writing the same file would silently overwrite each other.
+    """
+    used = set()
+    paths = []
+    for path in image_paths:
+        name = os.path.basename(path)
+        if not name.lower().endswith(".png"):
+            name += ".png"
+        stem, number = name[:-len(".png")], 1
+        while name.lower() in used:
+            name = f"{stem}-{number}.png"
+            number += 1
+        used.add(name.lower())
+        paths.append(os.path.join(output_dir, name))
+    return paths
+
+def extract_many(image_paths, password, workers=None):
+    """Extract and decrypt the hidden text of many images"""
+    return run_batch(_extract_one, [(path, password) for path in image_paths], password, workers)
+
+def print_report(results, elapsed):
+    """Print per-image time and throughput, then the batch totals"""
+    total_pixels = 0
+    for path, result, seconds in results:
+        with Image.open(path) as image:
+            pixels = image.width * image.height
+        total_pixels += pixels
+        print(f"{os.path.basename(path)}: {seconds * 1000:.1f} ms, "
+              f"{pixels / 1e6 / seconds:.1f} MP/s - {result}")
+    if results:
+        print(f"\n{len(results)} images in {elapsed:.2f} s: "
+              f"{len(results) / elapsed:.1f} images/s, {total_pixels / 1e6 / elapsed:.1f} MP/s")
+
+def main():
+    """Hide text in, or extract text from, every image in a folder"""
+    parser = argparse.ArgumentParser(description="Batch LSB steganography with AES")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    hide_parser = subparsers.add_parser("hide", help="Hide text in every image of a folder")
+    hide_parser.add_argument("input_dir", help="Folder of input images")
+    hide_parser.add_argument("output_dir", help="Folder for the output PNG images")
+    text_group = hide_parser.add_mutually_exclusive_group(required=True)
+    text_group.add_argument("--text", help="Text to hide")
+    text_group.add_argument("--text-file", help="File containing the text to hide")
+
+    extract_parser = subparsers.add_parser("extract", help="Extract text from every image of a folder")
+    extract_parser.add_argument("input_dir", help="Folder of images to extract from")
+
+    for sub in (hide_parser, extract_parser):
+        sub.add_argument("--password", default=stego.PASSWORD, help="Encryption password")
+        sub.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    image_paths = find_images(args.input_dir)
+    start = time.perf_counter()
+    if args.command == "hide":
+        text = args.text
+        if args.text_file:
+            with open(args.text_file, encoding="utf-8") as f:
+                text = f.read()
+        results = hide_many(image_paths, text, args.output_dir, args.password, args.workers)
+    else:
+        results = extract_many(image_paths, args.password, args.workers)
+    print_report(results, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import base64
+import hashlib
 import os
 import time
+from collections import OrderedDict
+import numpy as np
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -13,6 +16,13 @@ AUTHOR_PROJECT = "HiddenMessage"
 IMAGE_PATH = "input_image.png"
 OUTPUT_IMAGE_PATH = "output_image.png"
 PASSWORD = "mysecretpassword"
+END_MARKER = b"\xff\xfe"  # End of message marker (bits 1111111111111110)
+EXTRACT_CHUNK_BITS = 1 << 20  # Channel values read per extraction step
+
+KDF_SALT = b'salt_'  # Fixed salt for simplicity (in real use, should be random)
+KEY_CACHE_SIZE = 8  # Derived keys kept in memory
+
+_key_cache = OrderedDict()  # SHA-256 of salt + password -> derived key, least recently used first
 
 def animated_logo(text):
     """Prints the logo with a typing animation effect."""
@@ -29,14 +39,36 @@ def print_AUTHOR_info():
     print(f"Project: {AUTHOR_PROJECT}")
     print("="*50 + "\n")
 
+def _cache_id(password):
+    """Cache key for a password, so the cache never holds the password itself"""
+    return hashlib.sha256(KDF_SALT + password.encode()).digest()
+
+def cache_key(password, key):
+    """Remember a derived key, dropping the least recently used one beyond KEY_CACHE_SIZE"""
+    _store_key(_cache_id(password), key)
+
+def _store_key(cache_id, key):
+    _key_cache[cache_id] = key
+    _key_cache.move_to_end(cache_id)
+    while len(_key_cache) > KEY_CACHE_SIZE:
+        _key_cache.popitem(last=False)
+
 def generate_key(password):
-    """Generate encryption key from password"""
+    """Generate encryption key from password, reusing recently derived keys"""
+    cache_id = _cache_id(password)
+    key = _key_cache.get(cache_id)
+    if key is None:
+        key = derive_key(password)
+    _store_key(cache_id, key)
+    return key
+
+def derive_key(password):
+    """Derive the encryption key from password with PBKDF2"""
     password_bytes = password.encode()
-    salt = b'salt_'  # Fixed salt for simplicity (in real use, should be random)
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
-        salt=salt,
+        salt=KDF_SALT,
         iterations=100000,
     )
     key = base64.urlsafe_b64encode(kdf.derive(password_bytes))
@@ -76,88 +108,63 @@ def bin_to_text(binary_data):
 def hide_text_in_image(IMAGE_PATH, text, OUTPUT_IMAGE_PATH, password):
     """Hide encrypted text inside an image"""
     try:
-        # Encrypt the text
+        # Encrypt the text and append the end of message marker
         encrypted_text = encrypt_text(text, password)
+        bits = np.unpackbits(np.frombuffer(encrypted_text.encode() + END_MARKER, dtype=np.uint8))
         
-        # Convert to binary
-        binary_data = text_to_bin(encrypted_text)
-        binary_data += '1111111111111110'  # End of message marker
-        
-        # Open the image
+        # Open the image as an array of channel values
         image = Image.open(IMAGE_PATH)
-        pixels = image.load()
-        width, height = image.size
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+        pixels = np.array(image)
+        height, width = pixels.shape[:2]
         
         # Check if image can hold the message
         max_bits = width * height * 3
-        if len(binary_data) > max_bits:
-            return f"Message too large for image. Max bits: {max_bits}, Needed: {len(binary_data)}"
+        if bits.size > max_bits:
+            return f"Message too large for image. Max bits: {max_bits}, Needed: {bits.size}"
         
-        data_index = 0
-        
-        # Embed the binary data in the LSB of RGB channels
-        for y in range(height):
-            for x in range(width):
-                if data_index >= len(binary_data):
-                    break
-                
-                r, g, b = pixels[x, y][:3]
-                
-                # Modify red channel
-                if data_index < len(binary_data):
-                    r = (r & 0xFE) | int(binary_data[data_index])
-                    data_index += 1
-                
-                # Modify green channel
-                if data_index < len(binary_data):
-                    g = (g & 0xFE) | int(binary_data[data_index])
-                    data_index += 1
-                
-                # Modify blue channel
-                if data_index < len(binary_data):
-                    b = (b & 0xFE) | int(binary_data[data_index])
-                    data_index += 1
-                
-                pixels[x, y] = (r, g, b)
+        # Embed the bits in the LSB of the RGB channels, row by row and R, G, B per pixel
+        channels = pixels[..., :3].reshape(-1)
+        channels[:bits.size] = (channels[:bits.size] & 0xFE) | bits
+        pixels[..., :3] = channels.reshape(height, width, 3)
         
         # Save the modified image
-        image.save(OUTPUT_IMAGE_PATH)
+        Image.fromarray(pixels, image.mode).save(OUTPUT_IMAGE_PATH)
         return f"Text hidden successfully in {OUTPUT_IMAGE_PATH}"
         
     except Exception as e:
         return f"Error hiding text: {str(e)}"
 
+def extract_payload(pixels):
+    """Read LSB bytes from an RGB(A) pixel array until the end of message marker"""
+    height, width = pixels.shape[:2]
+    rows_per_chunk = max(1, EXTRACT_CHUNK_BITS // (width * 3))
+    payload = bytearray()
+    pending = np.empty(0, dtype=np.uint8)
+    
+    # Unpack a block of rows at a time and stop as soon as the marker shows up
+    for y in range(0, height, rows_per_chunk):
+        bits = np.concatenate((pending, pixels[y:y + rows_per_chunk, :, :3].reshape(-1) & 1))
+        usable = bits.size - bits.size % 8
+        pending = bits[usable:]
+        search_from = max(0, len(payload) - len(END_MARKER) + 1)
+        payload += np.packbits(bits[:usable]).tobytes()
+        end_marker = payload.find(END_MARKER, search_from)
+        if end_marker != -1:
+            return bytes(payload[:end_marker])
+    return bytes(payload)
+
 def extract_text_from_image(IMAGE_PATH, password):
     """Extract encrypted text from an image"""
     try:
         # Open the image
         image = Image.open(IMAGE_PATH)
-        pixels = image.load()
-        width, height = image.size
-        
-        binary_data = ""
-        
-        # Extract LSB from RGB channels
-        for y in range(height):
-            for x in range(width):
-                r, g, b = pixels[x, y][:3]
-                
-                # Extract from red channel
-                binary_data += str(r & 1)
-                
-                # Extract from green channel
-                binary_data += str(g & 1)
-                
-                # Extract from blue channel
-                binary_data += str(b & 1)
-        
-        # Find the end of message marker
-        end_marker = binary_data.find('1111111111111110')
-        if end_marker != -1:
-            binary_data = binary_data[:end_marker]
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
         
-        # Convert binary to text
-        encrypted_text = bin_to_text(binary_data)
+        # Read the hidden bytes; each byte is one character of the encrypted text
+        encrypted_text = extract_payload(np.asarray(image)).decode("latin-1")
         
         # Decrypt the text
         decrypted_text = decrypt_text(encrypted_text, password)
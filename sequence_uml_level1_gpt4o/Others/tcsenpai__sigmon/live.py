@@ -0,0 +1,268 @@
+import math
+import os
+import queue
+import struct
+import threading
+import time
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple, Union
+
+# Import from other modules in the project
+from .plotter import MetricsPlotter
+from .sigmod_metrics import Metrics
+
+# Binary sample log: a magic header followed by fixed-size records of
+# timestamp (float64), signal strength and bitrate (float32, NaN when missing)
+# and the power save flag.
+LOG_MAGIC = b"SIGMON1\n"
+LOG_RECORD = struct.Struct("<dffB")
+MAX_CONSECUTIVE_ERRORS = 5  # Failed metric reads in a row before the sampler gives up
+
+Sample = Tuple[float, Metrics]
+# Samples, or the exception that stopped the sampler as its last item
+SampleItem = Union[Sample, Exception]
+
+
+def _to_float(value) -> float:
+    """
+    Convert a metric value to float, using NaN for missing or invalid values
+    """
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class SampleLogWriter:
+    """
+    Append samples to a compact binary log (17 bytes per sample).
+    """
+
+    def __init__(self, path: str, flush_every: int = 64) -> None:
+        """
+        Open the log for appending, writing the header if the file is new.
+
+        Args:
+            path: Log file path
+            flush_every: Number of samples buffered before writing them to disk
+        """
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file: BinaryIO = open(path, "ab")
+        if new_file:
+            self._file.write(LOG_MAGIC)
+        self.flush_every = flush_every
+        self._pending = 0
+
+    def write(self, timestamp: float, metrics: Metrics) -> None:
+        """
+        Append one sample
+        """
+        self._file.write(LOG_RECORD.pack(timestamp, _to_float(metrics.signal_strength),
+                                         _to_float(metrics.bitrate), bool(metrics.is_power_save_enabled)))
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered samples to disk
+        """
+        self._file.flush()
+        self._pending = 0
+
+    def close(self) -> None:
+        """
+        Flush and close the log
+        """
+        self._file.close()
+
+
+def read_sample_log(path: str) -> Iterator[Sample]:
+    """
+    Read the samples of a binary log in order
+
+    Args:
+        path: Log file written by SampleLogWriter
+
+    Returns:
+        Iterator of (timestamp, Metrics) tuples; a truncated last record is ignored
+    """
+    with open(path, "rb") as f:
+        if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise ValueError(f"{path} is not a sigmon sample log")
+        while True:
+            record = f.read(LOG_RECORD.size)
+            if len(record) < LOG_RECORD.size:
+                return
+            timestamp, signal_strength, bitrate, power_save = LOG_RECORD.unpack(record)
+            yield timestamp, Metrics(None if math.isnan(signal_strength) else signal_strength,
+                                     None if math.isnan(bitrate) else bitrate,
+                                     bool(power_save))
+
+
+def sample_metrics(get_metrics_func: Callable, adapter_name: str, interval: float,
+                   samples: "queue.Queue[SampleItem]", stop: threading.Event,
+                   max_consecutive_errors: int = MAX_CONSECUTIVE_ERRORS) -> None:
+    """
+    Sample metrics on a fixed schedule into a queue until stop is set
+
+    The next sample time advances by interval from the previous one, so slow
+    consumers or slow iwconfig calls do not make the sampling rate drift.
+    A failed read is reported and skipped; after max_consecutive_errors
+    failures in a row the exception is put on the queue and sampling ends.
+
+    Args:
+        get_metrics_func: Function to get metrics
+        adapter_name: Name of the network adapter
+        interval: Sampling interval in seconds
+        samples: Queue receiving (timestamp, Metrics) tuples
+        stop: Event that ends the loop
+        max_consecutive_errors: Failed reads in a row before giving up
+    """
+    next_sample = time.monotonic()
+    errors = 0
+    while not stop.is_set():
+        try:
+            metrics = get_metrics_func(adapter_name)
+        except Exception as e:
+            errors += 1
+            print(f"Warning: Failed to read metrics of {adapter_name}: {e}")
+            if errors >= max_consecutive_errors:
+                samples.put(e)
+                return
+        else:
+            errors = 0
+            samples.put((time.time(), metrics))
+        next_sample += interval
+        delay = next_sample - time.monotonic()
+        if delay < 0:
+            # Fell behind by more than an interval; skip the missed samples
+            next_sample = time.monotonic()
+            delay = 0
+        stop.wait(delay)
+
+
+def _start_sampler(get_metrics_func: Callable, adapter_name: str,
+                   interval: float) -> Tuple["queue.Queue[SampleItem]", threading.Event]:
+    samples: "queue.Queue[SampleItem]" = queue.Queue()
+    stop = threading.Event()
+    threading.Thread(target=sample_metrics, args=(get_metrics_func, adapter_name, interval, samples, stop),
+                     daemon=True).start()
+    return samples, stop
+
+
+def _check_sample(item: SampleItem) -> Sample:
+    """
+    Return a sample taken from the sampler queue, raising if the sampler gave up
+    """
+    if isinstance(item, Exception):
+        raise RuntimeError("Metrics sampling stopped after repeated failures") from item
+    return item
+
+
+def plot_metrics_decoupled(get_metrics_func: Callable, adapter_name: str, interval: float,
+                           max_fps: float = 4.0, log_path: Optional[str] = None) -> None:
+    """
+    Plot metrics live with sampling and rendering decoupled
+
+    Samples are taken by a background thread at the requested interval, while
+    this thread redraws at most max_fps times per second and only when new
+    samples arrived since the last frame.
+
+    Args:
+        get_metrics_func: Function to get metrics
+        adapter_name: Name of the network adapter
+        interval: Sampling interval in seconds
+        max_fps: Maximum number of redraws per second
+        log_path: Optional binary log receiving every sample
+    """
+    plotter = MetricsPlotter()
+    log = SampleLogWriter(log_path) if log_path else None
+    samples, stop = _start_sampler(get_metrics_func, adapter_name, interval)
+    frame_interval = 1.0 / max_fps
+    last_render = 0.0
+    dirty = False
+
+    try:
+        while True:
+            # Wait for samples, but no longer than until the next frame is due
+            timeout = max(0.0, last_render + frame_interval - time.monotonic()) if dirty else frame_interval
+            batch = []
+            try:
+                batch.append(samples.get(timeout=timeout))
+                while True:
+                    batch.append(samples.get_nowait())
+            except queue.Empty:
+                pass
+
+            for item in batch:
+                timestamp, metrics = _check_sample(item)
+                if log:
+                    log.write(timestamp, metrics)
+                dirty |= plotter.add_metrics(metrics, timestamp)
+
+            if dirty and time.monotonic() - last_render >= frame_interval:
+                plotter.render()
+                last_render = time.monotonic()
+                dirty = False
+    except KeyboardInterrupt:
+        print("\nMonitoring stopped by user")
+        plotter.save_plot()
+    finally:
+        stop.set()
+        if log:
+            log.close()
+
+
+def record_metrics_headless(get_metrics_func: Callable, adapter_name: str, interval: float, log_path: str,
+                            duration: Optional[float] = None) -> int:
+    """
+    Sample metrics into a binary log without drawing anything
+
+    Args:
+        get_metrics_func: Function to get metrics
+        adapter_name: Name of the network adapter
+        interval: Sampling interval in seconds
+        log_path: Binary log receiving the samples
+        duration: Seconds to record for, or None to record until interrupted
+
+    Returns:
+        Number of samples written
+    """
+    log = SampleLogWriter(log_path)
+    samples, stop = _start_sampler(get_metrics_func, adapter_name, interval)
+    deadline = time.monotonic() + duration if duration is not None else None
+    written = 0
+
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            try:
+                item = samples.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            timestamp, metrics = _check_sample(item)
+            log.write(timestamp, metrics)
+            written += 1
+    except KeyboardInterrupt:
+        print("\nRecording stopped by user")
+    finally:
+        stop.set()
+        log.close()
+    return written
+
+
+def replay_log(log_path: str, max_points: int = 100) -> MetricsPlotter:
+    """
+    Load a binary log into a plotter and draw its final state
+
+    Args:
+        log_path: Log file written by SampleLogWriter
+        max_points: Number of most recent points plotted
+
+    Returns:
+        The plotter holding the replayed samples, e.g. to call save_plot()
+    """
+    plotter = MetricsPlotter(max_points)
+    for timestamp, metrics in read_sample_log(log_path):
+        plotter.add_metrics(metrics, timestamp)
+    plotter.render()
+    return plotter
@@ -1,10 +1,11 @@
 import time
 import os
 import plotext as plt
-from typing import List, Optional, Callable
+from typing import Optional, Callable
 from datetime import datetime
 
 # Import from other modules in the project
+from .metrics_store import RingBuffer
 from .session import SessionMetrics
 from .sigmod_metrics import Metrics
 
@@ -38,12 +39,12 @@ class MetricsPlotter:
     
     def __init__(self, max_points=100) -> None:
         """
-        Initialize an instance with default or specified maximum points, setting up lists for signal strengths 
+        Initialize an instance with default or specified maximum points, setting up fixed-capacity ring buffers for signal strengths 
         and timestamps, initializing min/max seen values, creating a session metrics object, and ensuring a plots directory exists.
         """
         self.max_points = max_points
-        self.signal_strengths: List[float] = []
-        self.timestamps: List[str] = []
+        self.signal_strengths: RingBuffer[float] = RingBuffer(max_points)
+        self.timestamps: RingBuffer[str] = RingBuffer(max_points, typecode=None)
         self.max_seen: Optional[float] = None
         self.min_seen: Optional[float] = None
         self.session = SessionMetrics()
@@ -53,56 +54,77 @@ class MetricsPlotter:
 
     def update_plot(self, metrics: Metrics) -> None:
         """
-        Convert signal strength to float and ensure it's negative
+        Convert signal strength to float and ensure it's negative, then redraw the plot
+        """
+        if self.add_metrics(metrics):
+            self.render()
+
+    def add_metrics(self, metrics: Metrics, timestamp: Optional[float] = None) -> bool:
+        """
+        Record metrics in the session and the plotted window without drawing anything.
+
+        Args:
+            metrics: Metrics to record
+            timestamp: Sampling time (seconds since the epoch), defaults to now
+
+        Returns:
+            True if a signal strength point was added to the plot
         """
         # Add metrics to session
         self.session.add_metrics(metrics)
         
         # Process signal strength
-        if metrics.signal_strength:
-            try:
-                signal_strength = float(metrics.signal_strength)
-                # Ensure signal strength is negative (dBm values are negative)
-                if signal_strength > 0:
-                    signal_strength = -signal_strength
-                
-                # Update min/max seen values
-                if self.max_seen is None or signal_strength > self.max_seen:
-                    self.max_seen = signal_strength
-                if self.min_seen is None or signal_strength < self.min_seen:
-                    self.min_seen = signal_strength
-                
-                # Add to data lists
-                self.signal_strengths.append(signal_strength)
-                self.timestamps.append(datetime.now().strftime("%H:%M:%S"))
-                
-                # Trim lists to max_points
-                if len(self.signal_strengths) > self.max_points:
-                    self.signal_strengths = self.signal_strengths[-self.max_points:]
-                    self.timestamps = self.timestamps[-self.max_points:]
-                
-                # Clear previous plot
-                plt.clear_figure()
-                plt.clear_terminal()
-                
-                # Plot signal strength
-                plt.plot(self.signal_strengths, label="Signal Strength (dBm)")
-                plt.title("WiFi Signal Strength Monitor")
-                plt.xlabel("Time")
-                plt.ylabel("Signal Strength (dBm)")
-                plt.ylim(self.min_seen - 5, self.max_seen + 5) if self.min_seen is not None and self.max_seen is not None else None
-                
-                # Add current value annotation
-                plt.text(f"Current: {signal_strength:.1f} dBm", x=len(self.signal_strengths)-1, y=signal_strength)
-                
-                # Show plot
-                plt.show()
-                
-                # Print session summary
-                print(self.session.get_session_summary())
-                
-            except ValueError:
-                print(f"Invalid signal strength value: {metrics.signal_strength}")
+        if not metrics.signal_strength:
+            return False
+        try:
+            signal_strength = float(metrics.signal_strength)
+        except ValueError:
+            print(f"Invalid signal strength value: {metrics.signal_strength}")
+            return False
+        
+        # Ensure signal strength is negative (dBm values are negative)
+        if signal_strength > 0:
+            signal_strength = -signal_strength
+        
+        # Update min/max seen values
+        if self.max_seen is None or signal_strength > self.max_seen:
+            self.max_seen = signal_strength
+        if self.min_seen is None or signal_strength < self.min_seen:
+            self.min_seen = signal_strength
+        
+        # Add to ring buffers; once full they overwrite the oldest point
+        sampled_at = datetime.fromtimestamp(timestamp) if timestamp is not None else datetime.now()
+        self.signal_strengths.append(signal_strength)
+        self.timestamps.append(sampled_at.strftime("%H:%M:%S"))
+        return True
+
+    def render(self) -> None:
+        """
+        Redraw the live plot and session summary from the recorded points
+        """
+        if not self.signal_strengths:
+            return
+        signal_strength = self.signal_strengths.last()
+        
+        # Clear previous plot
+        plt.clear_figure()
+        plt.clear_terminal()
+        
+        # Plot signal strength
+        plt.plot(self.signal_strengths.to_list(), label="Signal Strength (dBm)")
+        plt.title("WiFi Signal Strength Monitor")
+        plt.xlabel("Time")
+        plt.ylabel("Signal Strength (dBm)")
+        plt.ylim(self.min_seen - 5, self.max_seen + 5) if self.min_seen is not None and self.max_seen is not None else None
+        
+        # Add current value annotation
+        plt.text(f"Current: {signal_strength:.1f} dBm", x=len(self.signal_strengths)-1, y=signal_strength)
+        
+        # Show plot
+        plt.show()
+        
+        # Print session summary
+        print(self.session.get_session_summary())
 
     def save_plot(self) -> None:
         """
@@ -117,15 +139,16 @@ class MetricsPlotter:
         filename = f"plots/signal_strength_{timestamp}.png"
         
         # Recreate plot for saving
+        signal_strengths = self.signal_strengths.to_list()
         plt.clear_figure()
-        plt.plot(self.signal_strengths, label="Signal Strength (dBm)")
+        plt.plot(signal_strengths, label="Signal Strength (dBm)")
         plt.title("WiFi Signal Strength History")
         plt.xlabel("Time")
         plt.ylabel("Signal Strength (dBm)")
         
         # Add average line if we have data
-        if self.signal_strengths:
-            avg_strength = sum(self.signal_strengths) / len(self.signal_strengths)
+        if signal_strengths:
+            avg_strength = sum(signal_strengths) / len(signal_strengths)
             plt.hline(avg_strength, color="red", label=f"Average: {avg_strength:.1f} dBm")
         
         # Save the plot
@@ -0,0 +1,109 @@
+import math
+from array import array
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RingBuffer(Generic[T]):
+    """
+    Fixed-capacity buffer that overwrites its oldest item once full.
+
+    Storage is allocated once, so appending costs O(1) and never allocates,
+    however long the monitor runs. Numeric buffers are backed by an array of
+    doubles; pass typecode=None to store arbitrary objects such as timestamps.
+    """
+
+    def __init__(self, capacity: int, typecode: Optional[str] = "d") -> None:
+        """
+        Args:
+            capacity: Maximum number of items kept
+            typecode: array typecode of the items, or None for a plain list
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._items = array(typecode, bytes(array(typecode).itemsize * capacity)) if typecode else [None] * capacity
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, item: T) -> None:
+        """
+        Add an item, dropping the oldest one if the buffer is full
+        """
+        end = (self._start + self._size) % self.capacity
+        self._items[end] = item
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def last(self) -> T:
+        """
+        Return the newest item
+        """
+        if not self._size:
+            raise IndexError("last() on an empty RingBuffer")
+        return self._items[(self._start + self._size - 1) % self.capacity]
+
+    def to_list(self) -> List[T]:
+        """
+        Return the items from oldest to newest
+        """
+        end = self._start + self._size
+        if end <= self.capacity:
+            return list(self._items[self._start:end])
+        return list(self._items[self._start:]) + list(self._items[:end - self.capacity])
+
+    def clear(self) -> None:
+        """
+        Drop all items, keeping the storage
+        """
+        self._start = 0
+        self._size = 0
+
+
+class RunningStats:
+    """
+    Count, mean, min, max and variance of a stream, updated with Welford's algorithm.
+
+    Each update is O(1) and nothing but the aggregates is stored, so a
+    multi-day session costs the same memory as a one-minute one.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._m2 = 0.0  # Sum of squared deviations from the mean
+
+    def add(self, value: float) -> None:
+        """
+        Add one value to the statistics
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def variance(self) -> float:
+        """
+        Sample variance, or 0 with fewer than two values
+        """
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        """
+        Sample standard deviation
+        """
+        return math.sqrt(self.variance)
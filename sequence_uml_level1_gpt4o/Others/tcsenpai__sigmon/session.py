@@ -1,62 +1,71 @@
 from datetime import datetime
-from typing import List
+from .metrics_store import RunningStats
 from .sigmod_metrics import Metrics
 
 
 class SessionMetrics:
     """
-    To collect, store, and summarize signal strength and bitrate metrics over a session duration.
+    To collect and summarize signal strength and bitrate metrics over a session duration.
+    Readings are folded into running statistics, so memory and time per reading stay constant however long the session runs.
     """
     
     def __init__(self) -> None:
         """
-        Initialize an instance with empty lists for signal and bitrate readings, and record the current datetime as the start time.
+        Initialize an instance with empty running statistics for signal and bitrate readings, and record the current datetime as the start time.
         """
-        self.signal_readings: List[float] = []
-        self.bitrate_readings: List[float] = []
+        self.signal_stats = RunningStats()
+        self.bitrate_stats = RunningStats()
         self.start_time: datetime = datetime.now()
 
     def add_metrics(self, metrics: Metrics) -> None:
         """
-        Append valid signal strength and bitrate values from a Metrics object to respective reading lists, handling potential invalid values with a warning.
+        Add valid signal strength and bitrate values from a Metrics object to the respective running statistics, handling potential invalid values with a warning.
         """
         if metrics.signal_strength is not None:
             try:
                 signal_strength = float(metrics.signal_strength)
                 if signal_strength > 0:
                     signal_strength = -signal_strength
-                self.signal_readings.append(signal_strength)
+                self.signal_stats.add(signal_strength)
             except (ValueError, TypeError):
                 print(f"Warning: Invalid signal strength value: {metrics.signal_strength}")
         
         if metrics.bitrate is not None:
             try:
                 bitrate = float(metrics.bitrate)
-                self.bitrate_readings.append(bitrate)
+                self.bitrate_stats.add(bitrate)
             except (ValueError, TypeError):
                 print(f"Warning: Invalid bitrate value: {metrics.bitrate}")
 
     def get_session_summary(self) -> str:
         """
-        Generate a summary of a session including average signal strength, average bitrate, duration, and the number of samples collected.
+        Generate a summary of a session including average, spread and range of signal strength and bitrate, duration, and the number of samples collected.
         """
         duration = datetime.now() - self.start_time
         hours, remainder = divmod(duration.total_seconds(), 3600)
         minutes, seconds = divmod(remainder, 60)
         
-        signal_samples = len(self.signal_readings)
-        bitrate_samples = len(self.bitrate_readings)
-        
-        avg_signal = sum(self.signal_readings) / signal_samples if signal_samples > 0 else 0
-        avg_bitrate = sum(self.bitrate_readings) / bitrate_samples if bitrate_samples > 0 else 0
+        signal = self.signal_stats
+        bitrate = self.bitrate_stats
         
         summary = f"""
 Session Summary:
 ----------------
 Duration: {int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}
-Signal Samples: {signal_samples}
-Bitrate Samples: {bitrate_samples}
-Average Signal Strength: {avg_signal:.1f} dBm
-Average Bitrate: {avg_bitrate:.1f} Mb/s
+Signal Samples: {signal.count}
+Bitrate Samples: {bitrate.count}
+Average Signal Strength: {signal.mean:.1f} dBm (std dev {signal.stdev:.1f})
+Signal Strength Range: {format_range(signal, "dBm")}
+Average Bitrate: {bitrate.mean:.1f} Mb/s (std dev {bitrate.stdev:.1f})
+Bitrate Range: {format_range(bitrate, "Mb/s")}
 """
-        return summary
\ No newline at end of file
+        return summary
+
+
+def format_range(stats: RunningStats, unit: str) -> str:
+    """
+    Format the min and max of running statistics, or N/A before the first reading
+    """
+    if stats.count == 0:
+        return "N/A"
+    return f"{stats.min:.1f} to {stats.max:.1f} {unit}"
\ No newline at end of file
@@ -1,6 +1,12 @@
+import argparse
 import logging
+import time
 import numpy as np
 
+from fleet import ARRIVAL_TOLERANCE, ProbeFleet
+
+logger = logging.getLogger(__name__)
+
 class AutonomousNavigation:
     """
     The AutonomousNavigation class is designed to simulate the movement of a probe from an initial position to a specified destination, calculating direction and moving incrementally until the destination is reached.
@@ -82,4 +88,174 @@ class AutonomousNavigation:
         if step_count >= max_steps:
             self.logger.warning("Navigation stopped: maximum steps reached without reaching destination")
         else:
-            self.logger.info("Navigation completed successfully")
\ No newline at end of file
+            self.logger.info("Navigation completed successfully")
+    
+    def plan_path(self, waypoints=None):
+        """
+        Compute the full path to the destination in closed form, optionally through intermediate waypoints.
+        Each leg takes ceil(length / speed) steps and its last step is shortened to land on the waypoint.
+        :param waypoints: Optional list of [x, y, z] points visited in order before the destination
+        :return: Array of shape (steps + 1, 3) holding the current position followed by the position after each step
+        """
+        points = [self.position] + [np.asarray(w, dtype=float) for w in (waypoints or [])] + [self.destination]
+        path = [self.position[None, :]]
+        for start, end in zip(points[:-1], points[1:]):
+            offset = end - start
+            length = np.linalg.norm(offset)
+            if length < ARRIVAL_TOLERANCE:
+                continue
+            steps = int(np.ceil(length / self.speed))
+            travelled = np.minimum(np.arange(1, steps + 1) * self.speed, length)
+            path.append(start + np.outer(travelled / length, offset))
+        return np.concatenate(path)
+    
+    def navigate_batched(self, waypoints=None, max_steps=1000):
+        """
+        Move to the destination (through optional waypoints) in one closed-form update, logging only a summary.
+        :param waypoints: Optional list of [x, y, z] points visited in order before the destination
+        :param max_steps: Safety limit on the number of steps
+        :return: Number of steps taken
+        """
+        path = self.plan_path(waypoints)
+        steps = min(len(path) - 1, max_steps)
+        self.position = path[steps].copy()
+        
+        if steps < len(path) - 1:
+            self.logger.warning(f"Navigation stopped after {steps} steps: maximum steps reached without reaching destination")
+        else:
+            self.logger.info(f"Navigation completed successfully in {steps} steps")
+        return steps
+
+
+def _route(positions, waypoints, destinations):
+    """
+    Stack the route of every probe into an (N, K + 1, 3) array of targets; waypoints may be shared (K, 3) or per probe (N, K, 3).
+    """
+    destinations = np.broadcast_to(np.asarray(destinations, dtype=float), positions.shape)
+    if waypoints is None or len(waypoints) == 0:
+        return destinations[:, None, :].copy()
+    waypoints = np.broadcast_to(np.asarray(waypoints, dtype=float), (len(positions),) + np.shape(waypoints)[-2:])
+    return np.concatenate([waypoints, destinations[:, None, :]], axis=1)
+
+
+def arrival_steps(positions, destinations, speed=1.0, waypoints=None):
+    """
+    Compute in closed form how many steps each probe needs to reach its destination through the waypoints.
+    :param positions: Initial positions as an (N, 3) array
+    :param destinations: Destinations as an (N, 3) array or a shared [x, y, z]
+    :param speed: Movement speed in units per step, scalar or (N,)
+    :param waypoints: Optional waypoints, shared (K, 3) or per probe (N, K, 3)
+    :return: (N,) integer array of steps
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+    route = _route(positions, waypoints, destinations)
+    points = np.concatenate([positions[:, None, :], route], axis=1)
+    lengths = np.linalg.norm(np.diff(points, axis=1), axis=2)
+    speed = np.broadcast_to(np.asarray(speed, dtype=float), len(positions))
+    steps = np.where(lengths < ARRIVAL_TOLERANCE, 0, np.ceil(lengths / speed[:, None]))
+    return steps.sum(axis=1).astype(np.int64)
+
+
+def navigate_probes(positions, destinations, speed=1.0, waypoints=None, max_steps=1000):
+    """
+    Step many probes towards their destinations at once, moving all positions as one (N, 3) array per step.
+    Probes that finish are dropped from the working arrays, so late steps only touch the probes still flying.
+    :param positions: Initial positions as an (N, 3) array
+    :param destinations: Destinations as an (N, 3) array or a shared [x, y, z]
+    :param speed: Movement speed in units per step, scalar or (N,)
+    :param waypoints: Optional waypoints, shared (K, 3) or per probe (N, K, 3)
+    :param max_steps: Safety limit on the number of steps
+    :return: Tuple of final (N, 3) positions and (N,) arrival steps (-1 for probes that did not arrive)
+    """
+    positions = np.array(positions, dtype=float).reshape(-1, 3)
+    route = _route(positions, waypoints, destinations)
+    count, legs = route.shape[:2]
+    ids = np.arange(count)
+    leg = np.zeros(count, dtype=np.int64)
+    arrival = np.full(count, -1, dtype=np.int64)
+    fleet = ProbeFleet(positions, route[:, 0], speed)
+    
+    def advance(reached):
+        # Move probes that reached a waypoint on to their next leg and retire the ones that are done
+        nonlocal ids, leg
+        leg[reached] += 1
+        done = leg == legs
+        if done.any():
+            positions[ids[done]] = fleet.positions[done]
+            arrival[ids[done]] = step
+            keep = ~done
+            ids, leg, reached = ids[keep], leg[keep], reached[keep]
+            fleet.positions, fleet.destinations, fleet.speed = (
+                fleet.positions[keep], fleet.destinations[keep], fleet.speed[keep])
+        moved = np.flatnonzero(reached)
+        fleet.destinations[moved] = route[ids[moved], leg[moved]]
+        # Legs of zero length are finished at once, without spending a step on them
+        again = np.zeros(len(ids), dtype=bool)
+        again[moved] = np.linalg.norm(fleet.destinations[moved] - fleet.positions[moved], axis=1) < ARRIVAL_TOLERANCE
+        return again
+    
+    step = 0
+    reached = fleet.remaining_distance() < ARRIVAL_TOLERANCE
+    while True:
+        while reached.any():
+            reached = advance(reached)
+        if not len(ids) or step >= max_steps:
+            break
+        step += 1
+        reached = fleet.step()
+    
+    positions[ids] = fleet.positions
+    logger.info(f"Navigated {count} probes in {step} steps: {count - len(ids)} arrived, {len(ids)} still en route")
+    return positions, arrival
+
+
+def benchmark_navigation(count=100000, waypoint_count=2, max_steps=1000, loop_sample=100, seed=0):
+    """
+    Time the per-object navigate() loop against the closed-form and batched probe navigation.
+    :param count: Number of probes
+    :param waypoint_count: Number of shared waypoints for the batched modes
+    :param max_steps: Safety limit on the number of steps
+    :param loop_sample: Number of probes timed with the per-object loop, extrapolated to count
+    :param seed: Random seed
+    :return: Dictionary of timings in seconds and the number of arrival step mismatches
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-100, 100, (count, 3))
+    destinations = rng.uniform(-100, 100, (count, 3))
+    speed = rng.uniform(0.5, 2.0, count)
+    waypoints = rng.uniform(-100, 100, (waypoint_count, 3))
+    results = {}
+    
+    # navigate() logs every step, so keep the logging but discard it at the handler level
+    logging.disable(logging.CRITICAL)
+    try:
+        start = time.perf_counter()
+        for i in range(min(loop_sample, count)):
+            AutonomousNavigation(positions[i], destinations[i], speed[i]).navigate()
+        results["loop_s (extrapolated)"] = (time.perf_counter() - start) * count / min(loop_sample, count)
+    finally:
+        logging.disable(logging.NOTSET)
+    
+    start = time.perf_counter()
+    expected = arrival_steps(positions, destinations, speed, waypoints)
+    results["closed_form_s"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    _, arrival = navigate_probes(positions, destinations, speed, waypoints, max_steps)
+    results["batched_s"] = time.perf_counter() - start
+    
+    reachable = expected <= max_steps
+    results["mismatches"] = int(np.count_nonzero(arrival[reachable] != expected[reachable]))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-object and batched probe navigation")
+    parser.add_argument("--probes", type=int, default=100000, help="Number of probes")
+    parser.add_argument("--waypoints", type=int, default=2, help="Number of shared waypoints")
+    parser.add_argument("--max-steps", type=int, default=1000, help="Safety limit on the number of steps")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    for name, value in benchmark_navigation(args.probes, args.waypoints, args.max_steps).items():
+        print(f"{name}: {value:.4f}" if isinstance(value, float) else f"{name}: {value}")
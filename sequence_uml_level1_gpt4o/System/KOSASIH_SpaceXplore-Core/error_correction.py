@@ -1,6 +1,82 @@
+import argparse
+import time
 import numpy as np
 import logging
 
+
+def _encode_nibble(nibble):
+    """Hamming (7,4) codeword of a 4-bit value as a 7-bit integer, bit 6 holding codeword position 1."""
+    d = [(nibble >> shift) & 1 for shift in (3, 2, 1, 0)]
+    p1 = d[0] ^ d[1] ^ d[3]
+    p2 = d[0] ^ d[2] ^ d[3]
+    p3 = d[1] ^ d[2] ^ d[3]
+    value = 0
+    for bit in (p1, p2, d[0], p3, d[1], d[2], d[3]):
+        value = (value << 1) | bit
+    return value
+
+
+def _decode_word(word):
+    """Corrected 4-bit value and error position (1-7, or 0 for none) of a received 7-bit word."""
+    r = [(word >> shift) & 1 for shift in range(6, -1, -1)]
+    s1 = r[0] ^ r[2] ^ r[4] ^ r[6]
+    s2 = r[1] ^ r[2] ^ r[5] ^ r[6]
+    s3 = r[3] ^ r[4] ^ r[5] ^ r[6]
+    error_position = s1 + 2*s2 + 4*s3
+    if error_position:
+        r[error_position - 1] ^= 1
+    return (r[2] << 3) | (r[4] << 2) | (r[5] << 1) | r[6], error_position
+
+
+# Lookup tables: 16 codewords indexed by nibble, and the corrected nibble and
+# error position for each of the 128 possible received words
+ENCODE_TABLE = np.array([_encode_nibble(n) for n in range(16)], dtype=np.uint8)
+DECODE_TABLE = np.array([_decode_word(w)[0] for w in range(128)], dtype=np.uint8)
+ERROR_POSITION_TABLE = np.array([_decode_word(w)[1] for w in range(128)], dtype=np.uint8)
+
+
+def hamming_encode_bytes(data):
+    """
+    Encode a byte buffer with Hamming (7,4), high nibble first.
+    Codewords are packed back to back as 7-bit groups, so the output is 1.75 times the input size.
+    :param data: bytes-like input
+    :return: Encoded bytes
+    """
+    nibbles = np.frombuffer(bytes(data), dtype=np.uint8)
+    nibbles = np.stack([nibbles >> 4, nibbles & 0x0F], axis=1).reshape(-1)
+    codewords = ENCODE_TABLE[nibbles]
+    # Drop the unused top bit of each codeword before packing the bit stream
+    bits = np.unpackbits(codewords[:, None], axis=1)[:, 1:]
+    return np.packbits(bits.reshape(-1)).tobytes()
+
+
+def hamming_decode_bytes(encoded):
+    """
+    Decode a buffer written by hamming_encode_bytes, correcting up to one flipped bit per codeword.
+    :param encoded: bytes-like input
+    :return: Tuple of the decoded bytes and a statistics dictionary with the number of codewords,
+             corrected codewords and corrections per codeword position (1-7)
+    """
+    packed = np.frombuffer(bytes(encoded), dtype=np.uint8)
+    byte_count = packed.size * 8 // 14
+    codeword_count = byte_count * 2
+    bits = np.unpackbits(packed, count=codeword_count * 7).reshape(codeword_count, 7)
+    # Restore the unused top bit so each codeword packs into one table index
+    bits = np.concatenate([np.zeros((codeword_count, 1), dtype=np.uint8), bits], axis=1)
+    words = np.packbits(bits, axis=1).reshape(-1)
+
+    nibbles = DECODE_TABLE[words].reshape(-1, 2)
+    decoded = ((nibbles[:, 0] << 4) | nibbles[:, 1]).astype(np.uint8).tobytes()
+
+    error_counts = np.bincount(ERROR_POSITION_TABLE[words], minlength=8)
+    stats = {
+        "codewords": codeword_count,
+        "corrected_codewords": int(codeword_count - error_counts[0]),
+        "corrections_by_position": error_counts[1:].tolist(),
+    }
+    return decoded, stats
+
+
 class ErrorCorrection:
     """
     Implement Hamming (7,4) error correction code to encode 4-bit data into 7-bit codewords 
@@ -62,4 +138,69 @@ class ErrorCorrection:
         original_data = np.array([corrected_data[2], corrected_data[4], corrected_data[5], corrected_data[6]])
         
         self.logger.info(f"Corrected data: {original_data}")
-        return original_data
\ No newline at end of file
+        return original_data
+    
+    def encode_bytes(self, data):
+        """
+        Encodes a whole byte buffer using table-driven Hamming (7,4) code.
+        :param data: bytes-like input.
+        :return: Encoded bytes (1.75 times the input size).
+        """
+        encoded = hamming_encode_bytes(data)
+        self.logger.info(f"Encoded {len(data)} bytes to {len(encoded)} bytes of Hamming code")
+        return encoded
+    
+    def decode_bytes(self, encoded):
+        """
+        Decodes a buffer from encode_bytes, correcting single-bit errors per codeword and logging one summary.
+        :param encoded: bytes-like input.
+        :return: A tuple of the decoded bytes and the correction statistics.
+        """
+        decoded, stats = hamming_decode_bytes(encoded)
+        self.logger.info(f"Decoded {len(decoded)} bytes: corrected {stats['corrected_codewords']} "
+                         f"of {stats['codewords']} codewords")
+        return decoded, stats
+
+
+def benchmark_codec(size=1 << 22, error_rate=0.1, seed=0):
+    """
+    Measure bulk encode and decode throughput with single-bit errors injected into some codewords.
+    :param size: Number of bytes to encode.
+    :param error_rate: Fraction of codewords that get one flipped bit.
+    :param seed: Random seed.
+    :return: Dictionary with MB/s for encoding and decoding, the correction statistics and whether the data round-tripped.
+    """
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 256, size, dtype=np.uint8).tobytes()
+
+    start = time.perf_counter()
+    encoded = hamming_encode_bytes(data)
+    encode_seconds = time.perf_counter() - start
+
+    # Flip one random bit inside each selected codeword
+    bits = np.unpackbits(np.frombuffer(encoded, dtype=np.uint8))
+    corrupted = np.flatnonzero(rng.random(size * 2) < error_rate)
+    bits[corrupted * 7 + rng.integers(0, 7, corrupted.size)] ^= 1
+    received = np.packbits(bits).tobytes()
+
+    start = time.perf_counter()
+    decoded, stats = hamming_decode_bytes(received)
+    decode_seconds = time.perf_counter() - start
+
+    return {
+        "encode_mb_s": size / encode_seconds / 1e6,
+        "decode_mb_s": size / decode_seconds / 1e6,
+        "injected_errors": int(corrupted.size),
+        **stats,
+        "round_trip_ok": decoded == data,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the bulk Hamming (7,4) codec")
+    parser.add_argument("--size", type=int, default=1 << 22, help="Bytes to encode")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="Fraction of codewords with one flipped bit")
+    args = parser.parse_args()
+
+    for name, value in benchmark_codec(args.size, args.error_rate).items():
+        print(f"{name}: {value:.2f}" if isinstance(value, float) else f"{name}: {value}")
@@ -0,0 +1,309 @@
+import argparse
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from trajectory import SOLAR_CONSTANT, STRUCTURAL_MASS, rocket_state, sail_state
+
+logger = logging.getLogger(__name__)
+
+ARRIVAL_TOLERANCE = 1e-6  # Same tolerance as AutonomousNavigation.has_reached_destination
+
+
+class EngineFleet:
+    """
+    Struct-of-arrays model of N constant-thrust spacecraft, i.e. many IonDrive or NuclearThermal configurations.
+
+    Each parameter is one array with an entry per craft, and every method evaluates the whole fleet with a few
+    NumPy operations instead of one Python object and logger per craft.
+    """
+
+    def __init__(self, thrust, fuel_mass, specific_impulse, structural_mass=STRUCTURAL_MASS):
+        """
+        Initialize the fleet; scalar parameters are shared by all craft.
+        :param thrust: Thrust force in newtons
+        :param fuel_mass: Initial fuel mass in kilograms
+        :param specific_impulse: Specific impulse in seconds
+        :param structural_mass: Dry mass in kilograms
+        """
+        self.thrust, self.fuel_mass, self.specific_impulse, self.structural_mass = (
+            np.array(a, dtype=float) for a in np.broadcast_arrays(thrust, fuel_mass, specific_impulse, structural_mass))
+
+    @classmethod
+    def from_engines(cls, engines):
+        """
+        Build a fleet from IonDrive or NuclearThermal instances; inactive engines get zero thrust.
+        :param engines: Iterable of engine objects
+        :return: EngineFleet
+        """
+        engines = list(engines)
+        return cls([e.thrust if e.is_active else 0 for e in engines], [e.fuel_mass for e in engines],
+                   [e.specific_impulse for e in engines])
+
+    def __len__(self):
+        return self.thrust.size
+
+    def simulate(self, times):
+        """
+        Evaluate every craft on a shared time grid.
+        :param times: Sample times in seconds
+        :return: Dictionary of (N, T) arrays fuel_mass, acceleration, velocity, distance and the (N,) burnout_time
+        """
+        fuel, acceleration, velocity, distance, burnout_time = rocket_state(
+            self.thrust[:, None], self.fuel_mass[:, None], self.specific_impulse[:, None],
+            np.asarray(times, dtype=float), self.structural_mass[:, None])
+        return {"fuel_mass": fuel, "acceleration": acceleration, "velocity": velocity, "distance": distance,
+                "burnout_time": burnout_time[:, 0]}
+
+    def final_state(self, duration):
+        """
+        Evaluate every craft at the end of a burn of the given duration.
+        :param duration: Time in seconds
+        :return: Dictionary of (N,) arrays fuel_mass, acceleration, velocity, distance and burnout_time (inf if never)
+        """
+        fuel, acceleration, velocity, distance, burnout_time = rocket_state(
+            self.thrust, self.fuel_mass, self.specific_impulse, float(duration), self.structural_mass)
+        return {"fuel_mass": fuel, "acceleration": acceleration, "velocity": velocity, "distance": distance,
+                "burnout_time": burnout_time}
+
+
+class SailFleet:
+    """
+    Struct-of-arrays model of N solar sail spacecraft at constant radiation pressure.
+    """
+
+    def __init__(self, area, reflectivity, spacecraft_mass=STRUCTURAL_MASS, solar_constant=SOLAR_CONSTANT):
+        """
+        Initialize the fleet; scalar parameters are shared by all craft.
+        :param area: Sail area in square meters
+        :param reflectivity: Reflectivity coefficient (0 to 1)
+        :param spacecraft_mass: Total spacecraft mass in kilograms
+        :param solar_constant: Solar constant in W/m²
+        """
+        self.area, self.reflectivity, self.spacecraft_mass, self.solar_constant = (
+            np.array(a, dtype=float) for a in np.broadcast_arrays(area, reflectivity, spacecraft_mass, solar_constant))
+
+    @classmethod
+    def from_sails(cls, sails, spacecraft_mass=STRUCTURAL_MASS):
+        """
+        Build a fleet from SolarSail instances; retracted sails get zero reflectivity.
+        :param sails: Iterable of SolarSail objects
+        :param spacecraft_mass: Total spacecraft mass in kilograms
+        :return: SailFleet
+        """
+        sails = list(sails)
+        return cls([s.area for s in sails], [s.reflectivity if s.is_deployed else 0 for s in sails], spacecraft_mass)
+
+    def __len__(self):
+        return self.area.size
+
+    def simulate(self, times):
+        """
+        Evaluate every craft on a shared time grid.
+        :param times: Sample times in seconds
+        :return: Dictionary of (N, T) arrays acceleration, velocity and distance
+        """
+        times = np.asarray(times, dtype=float)
+        acceleration, velocity, distance = sail_state(self.area[:, None], self.reflectivity[:, None], times,
+                                                      self.spacecraft_mass[:, None], self.solar_constant[:, None])
+        return {"acceleration": np.broadcast_to(acceleration, velocity.shape), "velocity": velocity,
+                "distance": distance}
+
+    def final_state(self, duration):
+        """
+        Evaluate every craft after the given duration.
+        :param duration: Time in seconds
+        :return: Dictionary of (N,) arrays acceleration, velocity and distance
+        """
+        acceleration, velocity, distance = sail_state(self.area, self.reflectivity, float(duration),
+                                                      self.spacecraft_mass, self.solar_constant)
+        return {"acceleration": acceleration, "velocity": velocity, "distance": distance}
+
+
+class ProbeFleet:
+    """
+    Struct-of-arrays model of N probes flying straight to their destinations, i.e. many AutonomousNavigation configurations.
+
+    Positions and destinations are (N, 3) arrays. Unlike AutonomousNavigation.move, the last step of each probe is
+    shortened to land on the destination instead of overshooting it.
+    """
+
+    def __init__(self, positions, destinations, speed=1.0):
+        """
+        Initialize the fleet.
+        :param positions: Initial positions as an (N, 3) array
+        :param destinations: Destinations as an (N, 3) array
+        :param speed: Movement speed in units per step, scalar or (N,)
+        """
+        self.positions = np.array(positions, dtype=float).reshape(-1, 3)
+        self.destinations = np.array(np.broadcast_to(destinations, self.positions.shape), dtype=float)
+        self.speed = np.array(np.broadcast_to(speed, len(self.positions)), dtype=float)
+
+    @classmethod
+    def from_navigators(cls, navigators):
+        """
+        Build a fleet from AutonomousNavigation instances.
+        :param navigators: Iterable of AutonomousNavigation objects
+        :return: ProbeFleet
+        """
+        navigators = list(navigators)
+        return cls([n.position for n in navigators], [n.destination for n in navigators],
+                   [n.speed for n in navigators])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def remaining_distance(self):
+        """
+        Distance of every probe to its destination.
+        :return: (N,) array
+        """
+        return np.linalg.norm(self.destinations - self.positions, axis=1)
+
+    def arrival_steps(self):
+        """
+        Number of steps each probe needs to reach its destination, in closed form.
+        :return: (N,) integer array (0 for probes already there)
+        """
+        distance = self.remaining_distance()
+        steps = np.ceil(distance / self.speed)
+        return np.where(distance < ARRIVAL_TOLERANCE, 0, steps).astype(np.int64)
+
+    def step(self):
+        """
+        Move every probe one step towards its destination.
+        :return: Boolean (N,) array of probes that have arrived
+        """
+        offset = self.destinations - self.positions
+        distance = np.linalg.norm(offset, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = np.where(distance > self.speed, self.speed / distance, 1.0)
+        self.positions += offset * fraction[:, None]
+        return distance <= self.speed
+
+    def final_state(self, steps):
+        """
+        Positions of every probe after a number of steps, in closed form and without moving the fleet.
+        :param steps: Number of steps
+        :return: Dictionary of (N, 3) position and (N,) remaining_distance, arrived and arrival_steps arrays
+        """
+        offset = self.destinations - self.positions
+        distance = np.linalg.norm(offset, axis=1)
+        travelled = np.minimum(self.speed * steps, distance)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = np.where(distance > 0, travelled / distance, 0.0)
+        arrival_steps = self.arrival_steps()
+        return {"position": self.positions + offset * fraction[:, None],
+                "remaining_distance": distance - travelled,
+                "arrived": arrival_steps <= steps,
+                "arrival_steps": arrival_steps}
+
+
+FLEETS = {"engine": EngineFleet, "sail": SailFleet, "probe": ProbeFleet}
+
+# Uniform ranges used by the command line sweep
+DEFAULT_RANGES = {
+    "engine": {"thrust": (0.1, 1.0), "fuel_mass": (10, 100), "specific_impulse": (2000, 5000)},
+    "sail": {"area": (100, 10000), "reflectivity": (0.8, 0.95)},
+    "probe": {"positions": ([-1000] * 3, [1000] * 3), "destinations": ([-1000] * 3, [1000] * 3),
+              "speed": (0.5, 5.0)},
+}
+
+
+def sample_parameters(ranges, count, seed=None):
+    """
+    Draw uniform Monte-Carlo samples of fleet parameters.
+    :param ranges: Dictionary mapping a parameter name to (low, high); array bounds give vector parameters
+    :param count: Number of craft
+    :param seed: Random seed
+    :return: Dictionary mapping each parameter name to an array with count rows
+    """
+    rng = np.random.default_rng(seed)
+    return {name: rng.uniform(low, high, size=(count,) + np.shape(low)) for name, (low, high) in ranges.items()}
+
+
+def _simulate_chunk(job):
+    kind, params, duration = job
+    return FLEETS[kind](**params).final_state(duration)
+
+
+def run_sweep(kind, params, duration, workers=None, chunk_size=100000):
+    """
+    Simulate a parameter sweep as fleets spread over a process pool.
+
+    The craft are split into chunks of chunk_size; each worker builds one fleet per chunk and returns its final
+    state, and the chunks are concatenated back in input order.
+    :param kind: "engine", "sail" or "probe"
+    :param params: Keyword arguments of the fleet class; arrays with one row per craft, or shared scalars
+    :param duration: Time in seconds (steps for probes)
+    :param workers: Number of worker processes; 1 runs in this process
+    :param chunk_size: Number of craft per task
+    :return: Dictionary of per-craft result arrays
+    """
+    if all(np.ndim(value) == 0 for value in params.values()):
+        # A sweep of shared scalars only is a single craft
+        params = {name: np.atleast_1d(value) for name, value in params.items()}
+    count = max(len(v) for v in params.values() if np.ndim(v) > 0)
+    jobs = []
+    for start in range(0, count, chunk_size):
+        chunk = {name: value[start:start + chunk_size] if np.ndim(value) > 0 else value
+                 for name, value in params.items()}
+        jobs.append((kind, chunk, duration))
+
+    if workers == 1:
+        results = [_simulate_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_chunk, jobs))
+    return {key: np.concatenate([result[key] for result in results]) for key in results[0]}
+
+
+def aggregate(results, percentiles=(5, 50, 95)):
+    """
+    Summarize each scalar result of a sweep over all craft, ignoring non-finite values.
+    :param results: Dictionary of per-craft result arrays from run_sweep
+    :param percentiles: Percentiles to report
+    :return: Dictionary mapping each result name to its count, mean, std, min, max and percentiles
+    """
+    summary = {}
+    for name, values in results.items():
+        if values.ndim != 1:
+            continue
+        values = values[np.isfinite(values)].astype(float)
+        stats = {"count": int(values.size)}
+        if values.size:
+            stats.update(mean=float(values.mean()), std=float(values.std()), min=float(values.min()),
+                         max=float(values.max()))
+            stats.update({f"p{p}": float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))})
+        summary[name] = stats
+    return summary
+
+
+def main():
+    """
+    Run a Monte-Carlo sweep over random fleet configurations and print the aggregated results.
+    """
+    parser = argparse.ArgumentParser(description="Monte-Carlo fleet sweep")
+    parser.add_argument("--kind", choices=sorted(FLEETS), default="engine", help="Type of craft to simulate")
+    parser.add_argument("--count", type=int, default=1000000, help="Number of craft")
+    parser.add_argument("--duration", type=float, default=365 * 86400, help="Seconds (steps for probes)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="Craft per task")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    params = sample_parameters(DEFAULT_RANGES[args.kind], args.count, args.seed)
+    start = time.perf_counter()
+    results = run_sweep(args.kind, params, args.duration, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    logger.info(f"Simulated {args.count} {args.kind} craft in {elapsed:.3f}s ({args.count / elapsed:,.0f} craft/s)")
+
+    for name, stats in aggregate(results).items():
+        print(f"{name}: " + ", ".join(f"{key}={value:.6g}" for key, value in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import logging
 import numpy as np
 
+from trajectory import rocket_trajectory
+
 class IonDrive:
     """
     Simulate the operation of an ion drive, including activation, fuel consumption, acceleration calculation, and status monitoring.
@@ -111,34 +113,35 @@ class IonDrive:
         self.logger.info(f"Status: {status_info}")
         return status_info
     
-    def simulate(self, duration):
+    def trajectory(self, duration, time_step=None, rtol=1e-3):
+        """
+        Compute fuel mass, acceleration, velocity and distance over a duration as arrays, without changing the engine state.
+        :param duration: Total time in seconds
+        :param time_step: Fixed time step in seconds; None for an adaptive grid that refines while the spacecraft is heavy
+        :param rtol: Maximum relative mass change per step of the adaptive grid
+        :return: Trajectory from the trajectory module (zero thrust while inactive)
+        """
+        thrust = self.thrust if self.is_active and self.fuel_mass > 0 else 0
+        return rocket_trajectory(thrust, self.fuel_mass, self.specific_impulse, duration, time_step=time_step, rtol=rtol)
+    
+    def simulate(self, duration, time_step=None):
         """
-        Simulate the operation of an Ion Drive over a specified duration, logging fuel consumption and status at each time step, provided the drive is active.
+        Simulate the operation of an Ion Drive over a specified duration, provided the drive is active, updating the remaining fuel and logging a summary instead of every time step.
         :param duration: Total simulation time in seconds
+        :param time_step: Fixed time step in seconds; None for an adaptive grid
+        :return: Trajectory of the simulated period, or None if the engine is not active
         """
         if not self.is_active:
             self.logger.warning("Cannot simulate: Ion Drive is not active")
-            return
-        
-        time_step = 1  # 1 second time steps
-        total_time = 0
+            return None
         
         self.logger.info(f"Starting simulation for {duration} seconds")
+        trajectory = self.trajectory(duration, time_step)
+        self.fuel_mass = float(trajectory.fuel_mass[-1])
         
-        while total_time < duration and self.is_active:
-            # Consume fuel for this time step
-            self.consume_fuel(time_step)
-            
-            # Get current status
-            current_status = self.status()
-            
-            self.logger.info(f"Time {total_time}s: {current_status}")
-            
-            total_time += time_step
-            
-            # Check if we still have fuel
-            if self.fuel_mass <= 0:
-                self.logger.info("Simulation ended: fuel depleted")
-                break
+        if trajectory.burnout_time is not None:
+            self.logger.info(f"Simulation ended: fuel depleted at {trajectory.burnout_time:.1f}s")
+            self.deactivate()
         
-        self.logger.info(f"Simulation completed. Total time: {total_time}s")
\ No newline at end of file
+        self.logger.info(f"Simulation completed over {len(trajectory.time)} steps. Final state: {trajectory.summary()}")
+        return trajectory
\ No newline at end of file
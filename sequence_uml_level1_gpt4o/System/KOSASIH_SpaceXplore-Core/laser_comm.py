@@ -1,6 +1,8 @@
 import numpy as np
 import logging
 
+from error_correction import hamming_decode_bytes, hamming_encode_bytes
+
 class ErrorCorrection:
     """
     Implement Hamming (7,4) error correction code to encode 4-bit data into 7-bit codewords 
@@ -62,4 +64,25 @@ class ErrorCorrection:
         original_data = np.array([corrected_data[2], corrected_data[4], corrected_data[5], corrected_data[6]])
         
         self.logger.info(f"Corrected data: {original_data}")
-        return original_data
\ No newline at end of file
+        return original_data
+    
+    def encode_bytes(self, data):
+        """
+        Encodes a whole byte buffer using table-driven Hamming (7,4) code.
+        :param data: bytes-like input.
+        :return: Encoded bytes (1.75 times the input size).
+        """
+        encoded = hamming_encode_bytes(data)
+        self.logger.info(f"Encoded {len(data)} bytes to {len(encoded)} bytes of Hamming code")
+        return encoded
+    
+    def decode_bytes(self, encoded):
+        """
+        Decodes a buffer from encode_bytes, correcting single-bit errors per codeword and logging one summary.
+        :param encoded: bytes-like input.
+        :return: A tuple of the decoded bytes and the correction statistics.
+        """
+        decoded, stats = hamming_decode_bytes(encoded)
+        self.logger.info(f"Decoded {len(decoded)} bytes: corrected {stats['corrected_codewords']} "
+                         f"of {stats['codewords']} codewords")
+        return decoded, stats
\ No newline at end of file
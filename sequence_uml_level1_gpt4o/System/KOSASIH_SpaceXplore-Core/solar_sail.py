@@ -1,6 +1,8 @@
 import logging
 import numpy as np
 
+from trajectory import STRUCTURAL_MASS, sail_trajectory
+
 class SolarSail:
     """
     Simulate and manage the deployment, retraction, and thrust calculation of a solar sail for spacecraft propulsion.
@@ -69,26 +71,32 @@ class SolarSail:
         self.logger.info(f"Status: {status_info}")
         return status_info
     
-    def simulate(self, duration):
+    def trajectory(self, duration, time_step=None, spacecraft_mass=STRUCTURAL_MASS, solar_constant=1361):
+        """
+        Compute acceleration, velocity and distance over a duration as arrays, with zero thrust while the sail is retracted.
+        :param duration: Total time in seconds
+        :param time_step: Fixed time step in seconds; None for just the start and end, which is exact at constant thrust
+        :param spacecraft_mass: Total spacecraft mass in kilograms
+        :param solar_constant: Solar constant in W/m²
+        :return: Trajectory from the trajectory module
+        """
+        reflectivity = self.reflectivity if self.is_deployed else 0
+        return sail_trajectory(self.area, reflectivity, duration, time_step=time_step,
+                               spacecraft_mass=spacecraft_mass, solar_constant=solar_constant)
+    
+    def simulate(self, duration, time_step=None, spacecraft_mass=STRUCTURAL_MASS):
         """
-        Simulate the operation of a solar sail over a specified duration, logging its status at each time step if the sail is deployed.
+        Simulate the operation of a solar sail over a specified duration if the sail is deployed, logging a summary instead of every time step.
         :param duration: Total simulation time in seconds
+        :param time_step: Fixed time step in seconds; None for just the start and end
+        :param spacecraft_mass: Total spacecraft mass in kilograms
+        :return: Trajectory of the simulated period, or None if the sail is not deployed
         """
         if not self.is_deployed:
             self.logger.warning("Cannot simulate: Solar sail is not deployed")
-            return
-        
-        time_step = 1  # 1 second time steps
-        total_time = 0
+            return None
         
         self.logger.info(f"Starting simulation for {duration} seconds")
-        
-        while total_time < duration:
-            # Get current status
-            current_status = self.status()
-            
-            self.logger.info(f"Time {total_time}s: {current_status}")
-            
-            total_time += time_step
-        
-        self.logger.info(f"Simulation completed. Total time: {total_time}s")
\ No newline at end of file
+        trajectory = self.trajectory(duration, time_step, spacecraft_mass)
+        self.logger.info(f"Simulation completed over {len(trajectory.time)} steps. Final state: {trajectory.summary()}")
+        return trajectory
\ No newline at end of file
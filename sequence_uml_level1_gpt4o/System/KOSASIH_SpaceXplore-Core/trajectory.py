@@ -0,0 +1,186 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+G0 = 9.81  # Standard gravity (m/s²)
+STRUCTURAL_MASS = 100  # kg, the example dry mass used by the propulsion classes
+SPEED_OF_LIGHT = 299792458  # m/s
+SOLAR_CONSTANT = 1361  # W/m² at Earth's orbit
+
+
+class Trajectory(NamedTuple):
+    """
+    State of a spacecraft sampled on a time grid; every field except burnout_time is an array aligned with time.
+    """
+    time: np.ndarray  # s
+    fuel_mass: np.ndarray  # kg
+    acceleration: np.ndarray  # m/s²
+    velocity: np.ndarray  # m/s, gained since t = 0
+    distance: np.ndarray  # m, travelled since t = 0
+    burnout_time: Optional[float]  # s, None if the fuel outlasts the grid or is not consumed
+
+    def summary(self):
+        """
+        Summarize the final state of the trajectory.
+        :return: Dictionary with the final time, fuel mass, velocity and distance and the burnout time
+        """
+        return {
+            "time": float(self.time[-1]),
+            "fuel_mass": float(self.fuel_mass[-1]),
+            "velocity": float(self.velocity[-1]),
+            "distance": float(self.distance[-1]),
+            "burnout_time": self.burnout_time,
+        }
+
+
+def uniform_time_grid(duration, time_step=1.0):
+    """
+    Build an evenly spaced time grid from 0 to duration, always including duration itself.
+    :param duration: Total time in seconds
+    :param time_step: Spacing in seconds
+    :return: Array of sample times
+    """
+    times = np.arange(0.0, duration, time_step, dtype=float)
+    return np.append(times, float(duration))
+
+
+def adaptive_time_grid(duration, initial_mass, mass_flow_rate, burnout_time, rtol=1e-3):
+    """
+    Build a time grid whose step grows as the spacecraft gets lighter.
+
+    While burning, consecutive samples differ by a factor (1 - rtol) in total mass, so the relative change
+    of acceleration per step is bounded by about rtol; after burnout the state changes linearly and only
+    the burnout time and duration are sampled.
+    :param duration: Total time in seconds
+    :param initial_mass: Total mass at t = 0 in kilograms
+    :param mass_flow_rate: Fuel consumption in kg/s (0 for no consumption)
+    :param burnout_time: Time at which the fuel runs out in seconds
+    :param rtol: Maximum relative mass change per step
+    :return: Array of sample times
+    """
+    burn_end = min(duration, burnout_time)
+    if mass_flow_rate <= 0 or burn_end <= 0:
+        return np.array([0.0, float(duration)]) if duration > 0 else np.zeros(1)
+
+    final_mass = initial_mass - mass_flow_rate * burn_end
+    if final_mass <= 0:
+        raise ValueError("The mass left at burnout must be positive; the structural mass cannot be zero")
+    steps = int(np.ceil(np.log(final_mass / initial_mass) / np.log1p(-rtol)))
+    masses = initial_mass * (1 - rtol) ** np.arange(steps)
+    times = (initial_mass - masses) / mass_flow_rate
+    times = np.append(times, burn_end)
+    if duration > burn_end:
+        times = np.append(times, float(duration))
+    return times
+
+
+def rocket_trajectory(thrust, fuel_mass, specific_impulse, duration, time_step=None, times=None, rtol=1e-3,
+                      structural_mass=STRUCTURAL_MASS):
+    """
+    Compute fuel mass, acceleration, velocity and distance of a constant-thrust engine in closed form.
+
+    Fuel burns at F / (Isp * g0) until it runs out; velocity follows the rocket equation
+    v = Isp * g0 * ln(m0 / m) and distance its integral, so the result is exact on any time grid.
+    :param thrust: Thrust force in newtons
+    :param fuel_mass: Initial fuel mass in kilograms
+    :param specific_impulse: Specific impulse in seconds
+    :param duration: Total time in seconds (ignored when times is given)
+    :param time_step: Fixed step in seconds; None for an adaptive grid
+    :param times: Explicit, increasing array of sample times starting at 0
+    :param rtol: Maximum relative mass change per step of the adaptive grid
+    :param structural_mass: Dry mass in kilograms
+    :return: Trajectory
+    """
+    if structural_mass <= 0:
+        raise ValueError("structural_mass must be positive")
+    exhaust_velocity = specific_impulse * G0
+    mass_flow_rate = thrust / exhaust_velocity
+    burnout_time = fuel_mass / mass_flow_rate if mass_flow_rate > 0 else np.inf
+
+    if times is None:
+        if time_step is None:
+            times = adaptive_time_grid(duration, structural_mass + fuel_mass, mass_flow_rate, burnout_time, rtol)
+        else:
+            times = uniform_time_grid(duration, time_step)
+    times = np.asarray(times, dtype=float)
+
+    fuel, acceleration, velocity, distance, _ = rocket_state(thrust, fuel_mass, specific_impulse, times, structural_mass)
+    reached_burnout = bool(burnout_time <= times[-1])
+    return Trajectory(times, fuel, acceleration, velocity, distance, float(burnout_time) if reached_burnout else None)
+
+
+def rocket_state(thrust, fuel_mass, specific_impulse, times, structural_mass=STRUCTURAL_MASS):
+    """
+    Evaluate the closed-form constant-thrust solution; all arguments broadcast against each other.
+
+    Passing engine parameters of shape (N, 1) and times of shape (T,) evaluates N engines on one grid at once.
+    :param thrust: Thrust force in newtons
+    :param fuel_mass: Initial fuel mass in kilograms
+    :param specific_impulse: Specific impulse in seconds
+    :param times: Sample times in seconds
+    :param structural_mass: Dry mass in kilograms
+    :return: Tuple of fuel mass, acceleration, velocity, distance and burnout time arrays (burnout is inf without thrust)
+    """
+    thrust, fuel_mass, specific_impulse, structural_mass = (np.asarray(a, dtype=float) for a in
+                                                            (thrust, fuel_mass, specific_impulse, structural_mass))
+    if np.any(structural_mass <= 0):
+        # The rocket equation diverges when the whole mass is burnt
+        raise ValueError("structural_mass must be positive")
+    exhaust_velocity = specific_impulse * G0
+    mass_flow_rate = thrust / exhaust_velocity
+    initial_mass = structural_mass + fuel_mass
+    with np.errstate(divide="ignore", invalid="ignore"):
+        burnout_time = np.where(mass_flow_rate > 0, fuel_mass / mass_flow_rate, np.inf)
+
+        burn_time = np.minimum(times, burnout_time)
+        fuel = np.maximum(fuel_mass - mass_flow_rate * burn_time, 0.0)
+        mass = structural_mass + fuel
+        acceleration = np.where(fuel > 0, thrust / mass, 0.0)
+
+        velocity = exhaust_velocity * np.log(initial_mass / mass)
+        burn_distance = np.where(mass_flow_rate > 0,
+                                 exhaust_velocity * (burn_time + mass / mass_flow_rate * np.log(mass / initial_mass)),
+                                 0.0)
+    distance = burn_distance + velocity * (times - burn_time)
+    return fuel, acceleration, velocity, distance, burnout_time
+
+def sail_trajectory(area, reflectivity, duration, time_step=None, times=None, spacecraft_mass=STRUCTURAL_MASS,
+                    solar_constant=SOLAR_CONSTANT):
+    """
+    Compute acceleration, velocity and distance of a solar sail at constant radiation pressure.
+
+    The thrust F = 2 * P * A * R / c is constant, so velocity grows linearly and distance quadratically
+    and both are exact at any sample time; without a time_step or times only the start and end are sampled.
+    :param area: Sail area in square meters
+    :param reflectivity: Reflectivity coefficient (0 to 1)
+    :param duration: Total time in seconds (ignored when times is given)
+    :param time_step: Fixed step in seconds; None for just the start and end
+    :param times: Explicit, increasing array of sample times starting at 0
+    :param spacecraft_mass: Total spacecraft mass in kilograms
+    :param solar_constant: Solar constant in W/m²
+    :return: Trajectory (fuel mass is always zero)
+    """
+    if times is None:
+        if time_step is None:
+            times = np.array([0.0, float(duration)]) if duration > 0 else np.zeros(1)
+        else:
+            times = uniform_time_grid(duration, time_step)
+    times = np.asarray(times, dtype=float)
+
+    acceleration, velocity, distance = sail_state(area, reflectivity, times, spacecraft_mass, solar_constant)
+    return Trajectory(times, np.zeros_like(times), np.full_like(times, acceleration), velocity, distance, None)
+
+
+def sail_state(area, reflectivity, times, spacecraft_mass=STRUCTURAL_MASS, solar_constant=SOLAR_CONSTANT):
+    """
+    Evaluate the constant radiation pressure solution; all arguments broadcast against each other.
+    :param area: Sail area in square meters
+    :param reflectivity: Reflectivity coefficient (0 to 1)
+    :param times: Sample times in seconds
+    :param spacecraft_mass: Total spacecraft mass in kilograms
+    :param solar_constant: Solar constant in W/m²
+    :return: Tuple of acceleration, velocity and distance arrays
+    """
+    thrust = (2 * solar_constant * np.asarray(area, dtype=float) * reflectivity) / SPEED_OF_LIGHT
+    acceleration = thrust / spacecraft_mass
+    return acceleration, acceleration * times, 0.5 * acceleration * times ** 2
@@ -5,22 +5,31 @@ class EntanglementManager:
     Manage quantum communication by establishing, maintaining, and utilizing entangled pairs for message transmission and reception.
     """
     
-    def __init__(self):
+    def __init__(self, max_pairs=10):
         """
-        Initialize an instance of the class by setting up a quantum communication interface and an empty list to track active communication pairs.
+        Initialize an instance of the class by setting up a quantum communication interface whose pair pool holds at most max_pairs pairs.
+        Pairs are identified by stable handles that stay valid until the pair is removed.
         """
-        self.quantum_comm = QuantumComm()
-        self.active_pairs = []
+        self.quantum_comm = QuantumComm(max_pairs)
+    
+    @property
+    def active_pairs(self):
+        """
+        Handles of all active entangled pairs.
+        """
+        return self.quantum_comm.pairs.handles()
     
     def establish_connection(self):
         """
-        Establishes a quantum connection by creating entangled pairs.
+        Establishes a quantum connection by creating an entangled pair; returns its handle or None if the pool is full.
+        """
+        return self.quantum_comm.create_entangled_pair()
+    
+    def establish_connections(self, count):
+        """
+        Establishes several quantum connections; returns their handles, with None for those that did not fit.
         """
-        pair = self.quantum_comm.create_entangled_pair()
-        if pair:
-            self.active_pairs.append(pair)
-            return len(self.active_pairs) - 1
-        return None
+        return self.quantum_comm.create_entangled_pairs(count)
     
     def list_active_pairs(self):
         """
@@ -28,27 +37,32 @@ class EntanglementManager:
         """
         return self.active_pairs
     
-    def receive_message(self, pair_index):
+    def receive_message(self, pair_handle):
         """
         Simulates receiving a message by measuring the state of the entangled pair.
         """
-        if 0 <= pair_index < len(self.active_pairs):
-            return self.quantum_comm.receive_message(pair_index)
-        return None
+        return self.quantum_comm.receive_message(pair_handle)
     
-    def remove_pair(self, pair_index):
+    def receive_messages(self, pair_handles):
         """
-        Removes an entangled pair from the active list.
+        Receives the messages of many entangled pairs at once, with None for handles that are not active.
         """
-        if 0 <= pair_index < len(self.active_pairs):
-            self.active_pairs.pop(pair_index)
-            return True
-        return False
+        return self.quantum_comm.receive_messages(pair_handles)
     
-    def send_message(self, message, pair_index):
+    def remove_pair(self, pair_handle):
+        """
+        Removes an entangled pair; the handles of other pairs are unaffected.
+        """
+        return self.quantum_comm.release_pair(pair_handle)
+    
+    def send_message(self, message, pair_handle):
         """
         Sends a message using the established quantum connection.
         """
-        if 0 <= pair_index < len(self.active_pairs):
-            return self.quantum_comm.transmit_message(message, pair_index)
-        return False
\ No newline at end of file
+        return self.quantum_comm.transmit_message(message, pair_handle)
+    
+    def send_messages(self, messages, pair_handles):
+        """
+        Sends one message per entangled pair; returns a list of booleans.
+        """
+        return self.quantum_comm.transmit_messages(messages, pair_handles)
\ No newline at end of file
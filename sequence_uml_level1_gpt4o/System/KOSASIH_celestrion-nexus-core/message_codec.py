@@ -0,0 +1,281 @@
+import argparse
+import ast
+import json
+import struct
+import time
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library is used without it
+    orjson = None
+
+REQUIRED_KEYS = frozenset(("recipient", "message"))
+
+# Binary frame: header followed by the recipient (UTF-8), the message (UTF-8, or JSON when
+# FLAG_JSON_MESSAGE is set) and the remaining metadata keys as a JSON object (empty if none).
+FRAME_HEADER = struct.Struct(">BBHII")  # version, flags, recipient length, message length, metadata length
+FRAME_VERSION = 1
+FLAG_JSON_MESSAGE = 0x01
+MAX_FRAME_LENGTH = 16 * 1024 * 1024  # Longest frame or line accepted, so a corrupt length cannot stall a stream
+
+
+class MessageDecodeError(ValueError):
+    """
+    Raised when a buffer does not hold a valid message.
+    offset is where the bad data starts and resume where decoding can carry on,
+    or None when the stream cannot be resynchronized.
+    """
+
+    def __init__(self, message, offset=None, resume=None):
+        super().__init__(message)
+        self.offset = offset
+        self.resume = resume
+
+
+def _json_dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+def is_valid_message(message_dict):
+    """
+    Checks that a message is a dictionary with a string recipient and a message.
+    """
+    return (isinstance(message_dict, dict) and REQUIRED_KEYS <= message_dict.keys()
+            and isinstance(message_dict["recipient"], str))
+
+
+def encode_binary(message_dict):
+    """
+    Encodes a message dictionary into one length-prefixed binary frame.
+    """
+    if not is_valid_message(message_dict):
+        raise ValueError("Message must be a dictionary with a string 'recipient' and a 'message'")
+    recipient = message_dict["recipient"].encode("utf-8")
+    message = message_dict["message"]
+    flags = 0
+    if isinstance(message, str):
+        message = message.encode("utf-8")
+    else:
+        message = _json_dumps(message)
+        flags |= FLAG_JSON_MESSAGE
+    if len(message_dict) > 2:
+        metadata = _json_dumps({k: v for k, v in message_dict.items() if k not in REQUIRED_KEYS})
+    else:
+        metadata = b""
+    if len(recipient) > 0xFFFF:
+        raise ValueError("Recipient is longer than 65535 bytes")
+    return FRAME_HEADER.pack(FRAME_VERSION, flags, len(recipient), len(message), len(metadata)) \
+        + recipient + message + metadata
+
+
+def iter_decode_binary(buffer, offset=0, max_frame_length=MAX_FRAME_LENGTH):
+    """
+    Decodes consecutive binary frames from a buffer, starting at offset.
+    Yields (message_dict, end_offset) pairs and stops at the first incomplete frame, so the
+    caller can keep the unread tail for the next read.
+    """
+    # Released on exit, including on errors, so the caller can trim a bytearray buffer
+    with memoryview(buffer) as view:
+        size = len(view)
+        unpack_header = FRAME_HEADER.unpack_from
+        header_size = FRAME_HEADER.size
+        while size - offset >= header_size:
+            version, flags, recipient_length, message_length, metadata_length = unpack_header(view, offset)
+            if version != FRAME_VERSION:
+                raise MessageDecodeError(f"Unsupported frame version {version} at offset {offset}", offset)
+            start = offset + header_size
+            message_start = start + recipient_length
+            metadata_start = message_start + message_length
+            end = metadata_start + metadata_length
+            if end - offset > max_frame_length:
+                raise MessageDecodeError(f"Frame at offset {offset} is {end - offset} bytes long, "
+                                         f"more than {max_frame_length}", offset)
+            if end > size:
+                return
+            error = None
+            try:
+                message_dict = {
+                    "recipient": str(view[start:message_start], "utf-8"),
+                    "message": (_json_loads(view[message_start:metadata_start]) if flags & FLAG_JSON_MESSAGE
+                                else str(view[message_start:metadata_start], "utf-8")),
+                }
+                metadata = _json_loads(view[metadata_start:end]) if metadata_length else {}
+            except (UnicodeDecodeError, ValueError) as e:
+                # Raised outside the handler: the original error may hold a slice of the buffer
+                error = f"Malformed frame at offset {offset}: {e}"
+            if error is None and not isinstance(metadata, dict):
+                error = f"Metadata of the frame at offset {offset} is not an object"
+            if error is not None:
+                raise MessageDecodeError(error, offset, end)
+            message_dict.update(metadata)
+            offset = end
+            yield message_dict, offset
+
+
+def encode_json(message_dict):
+    """
+    Encodes a message dictionary as one line of JSON.
+    """
+    if not is_valid_message(message_dict):
+        raise ValueError("Message must be a dictionary with a string 'recipient' and a 'message'")
+    return _json_dumps(message_dict) + b"\n"
+
+
+def iter_decode_json(buffer, offset=0, max_frame_length=MAX_FRAME_LENGTH):
+    """
+    Decodes newline-delimited JSON messages from a buffer, starting at offset.
+    Yields (message_dict, end_offset) pairs and stops at the first line without its newline.
+    """
+    data = bytes(buffer)
+    while True:
+        end = data.find(b"\n", offset)
+        if end == -1:
+            if len(data) - offset > max_frame_length:
+                raise MessageDecodeError(f"Line at offset {offset} is longer than {max_frame_length} bytes", offset)
+            return
+        if end - offset > max_frame_length:
+            raise MessageDecodeError(f"Line at offset {offset} is longer than {max_frame_length} bytes",
+                                     offset, end + 1)
+        try:
+            message_dict = _json_loads(data[offset:end])
+        except ValueError as e:
+            raise MessageDecodeError(f"Malformed JSON message at offset {offset}: {e}", offset, end + 1) from e
+        if not is_valid_message(message_dict):
+            raise MessageDecodeError(f"Message at offset {offset} lacks a string 'recipient' or a 'message'",
+                                     offset, end + 1)
+        offset = end + 1
+        yield message_dict, offset
+
+
+FORMATS = {
+    "binary": (encode_binary, iter_decode_binary),
+    "json": (encode_json, iter_decode_json),
+}
+
+
+class MessageCodec:
+    """
+    Serializes messages to a byte stream and decodes many messages from it, keeping incomplete
+    trailing data until the rest arrives.
+    """
+
+    def __init__(self, format="binary", max_frame_length=MAX_FRAME_LENGTH):
+        """
+        Creates a codec for the "binary" (length-prefixed struct frames) or "json" (newline-delimited) format.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown message format: {format}")
+        self.format = format
+        self.max_frame_length = max_frame_length
+        self.skipped = 0  # Malformed frames dropped by feed()
+        self.last_error = None  # MessageDecodeError of the last dropped frame
+        self._encode, self._iter_decode = FORMATS[format]
+        self._pending = bytearray()
+
+    def encode(self, message_dict):
+        """
+        Encodes one message.
+        """
+        return self._encode(message_dict)
+
+    def encode_many(self, messages):
+        """
+        Encodes several messages into one buffer.
+        """
+        encode = self._encode
+        return b"".join([encode(message) for message in messages])
+
+    def decode_many(self, buffer):
+        """
+        Decodes every complete message in a buffer, ignoring an incomplete tail.
+        """
+        return [message for message, _ in self._iter_decode(buffer, 0, self.max_frame_length)]
+
+    def feed(self, data):
+        """
+        Appends received bytes and returns the messages completed by them.
+        Malformed frames are dropped and counted in skipped, with the error kept in last_error; when the
+        stream cannot be resynchronized (unknown version, oversized frame) all buffered bytes are dropped.
+        """
+        pending = self._pending
+        pending += data
+        messages = []
+        consumed = 0
+        while True:
+            try:
+                for message, consumed in self._iter_decode(pending, consumed, self.max_frame_length):
+                    messages.append(message)
+                break
+            except MessageDecodeError as e:
+                self.skipped += 1
+                self.last_error = e
+                consumed = len(pending) if e.resume is None else e.resume
+        if consumed:
+            del pending[:consumed]
+        return messages
+
+
+def parse_raw_message(raw_message):
+    """
+    Parses a raw message string into a dictionary without evaluating code.
+    JSON is tried first; Python dictionary literals as produced by repr() are still accepted.
+    """
+    try:
+        message_dict = _json_loads(raw_message)
+    except ValueError:
+        try:
+            message_dict = ast.literal_eval(raw_message)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError) as e:
+            raise MessageDecodeError(f"Cannot parse message: {e}") from e
+    if not isinstance(message_dict, dict):
+        raise MessageDecodeError("Message is not a dictionary")
+    return message_dict
+
+
+def benchmark_codecs(count=100000):
+    """
+    Times the eval() parsing path against the JSON and binary codecs.
+    Returns a dictionary of microseconds per message for each path.
+    """
+    messages = [{"recipient": f"node-{i % 100}", "message": f"payload {i} " * 4, "priority": i % 3, "seq": i}
+                for i in range(count)]
+    results = {}
+
+    def timed(name, func):
+        start = time.perf_counter()
+        func()
+        results[name] = (time.perf_counter() - start) / count * 1e6
+
+    raw_messages = [repr(message) for message in messages]
+    timed("eval(repr)", lambda: [eval(raw) for raw in raw_messages])
+    timed("parse_raw_message(repr)", lambda: [parse_raw_message(raw) for raw in raw_messages])
+    json_lines = [encode_json(message).decode("utf-8") for message in messages]
+    timed("parse_raw_message(json)", lambda: [parse_raw_message(line) for line in json_lines])
+
+    for format in FORMATS:
+        codec = MessageCodec(format)
+        buffer = codec.encode_many(messages)
+        timed(f"{format} encode", lambda: codec.encode_many(messages))
+        timed(f"{format} decode", lambda: codec.decode_many(buffer))
+        if codec.decode_many(buffer) != messages:
+            raise AssertionError(f"{format} codec did not round-trip")
+        results[f"{format} bytes/message"] = len(buffer) / count
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark message parsing and the wire codecs")
+    parser.add_argument("--count", type=int, default=100000, help="Number of messages")
+    args = parser.parse_args()
+
+    print(f"JSON backend: {'orjson' if orjson is not None else 'json'}")
+    for name, value in benchmark_codecs(args.count).items():
+        print(f"{name:<28} {value:8.3f}")
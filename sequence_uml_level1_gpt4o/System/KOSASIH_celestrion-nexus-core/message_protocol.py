@@ -1,6 +1,8 @@
+from .message_codec import REQUIRED_KEYS, MessageCodec, parse_raw_message
+
 class MessageProtocol:
     """
-    Provides functionalities for formatting messages with optional metadata, parsing raw message strings into dictionaries, validating the structure of messages, and managing metadata within messages.
+    Provides functionalities for formatting messages with optional metadata, parsing raw message strings into dictionaries, validating the structure of messages, managing metadata within messages, and encoding messages for transmission.
     """
     
     @staticmethod
@@ -10,6 +12,20 @@ class MessageProtocol:
         """
         message_dict[key] = value
     
+    @staticmethod
+    def decode_messages(buffer, format="binary"):
+        """
+        Decodes every complete message in a buffer produced by encode_message.
+        """
+        return MessageCodec(format).decode_many(buffer)
+    
+    @staticmethod
+    def encode_message(message_dict, format="binary"):
+        """
+        Serializes a message dictionary for transmission, as a length-prefixed binary frame or a line of JSON.
+        """
+        return MessageCodec(format).encode(message_dict)
+    
     @staticmethod
     def format_message(recipient, message, metadata=None):
         """
@@ -30,9 +46,9 @@ class MessageProtocol:
     @staticmethod
     def parse_message(raw_message):
         """
-        Parses a raw message string into a dictionary.
+        Parses a raw message string (JSON or a Python dictionary literal) into a dictionary without evaluating code.
         """
-        return eval(raw_message)
+        return parse_raw_message(raw_message)
     
     @staticmethod
     def remove_metadata(message_dict, key):
@@ -47,5 +63,4 @@ class MessageProtocol:
         """
         Validates the structure of the message.
         """
-        required_keys = ["recipient", "message"]
-        return all(key in message_dict for key in required_keys)
\ No newline at end of file
+        return REQUIRED_KEYS <= message_dict.keys()
\ No newline at end of file
@@ -0,0 +1,158 @@
+from array import array
+
+INDEX_BITS = 32
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+
+class PairPool:
+    """
+    Slot map of entangled pair states with stable handles and O(1) create, lookup and remove.
+    """
+
+    def __init__(self, capacity=10):
+        """
+        Initialize an empty pool holding at most capacity pairs; slots are allocated as the pool grows.
+        """
+        if not 0 < capacity <= INDEX_MASK:
+            raise ValueError(f"capacity must be between 1 and {INDEX_MASK}")
+        self.capacity = capacity
+        self._states = []  # Pair state per slot, None for free slots
+        self._generations = array("L")  # Bumped whenever a slot is freed, invalidating old handles
+        self._free = []  # Indexes of free slots, reused last-in first-out
+        self._size = 0
+
+    def __len__(self):
+        """
+        Returns the number of live pairs.
+        """
+        return self._size
+
+    def __contains__(self, handle):
+        """
+        Checks whether a handle refers to a live pair.
+        """
+        return self._slot(handle) is not None
+
+    def _slot(self, handle):
+        """
+        Returns the slot index of a live handle, or None for stale, removed or invalid handles.
+        """
+        if not isinstance(handle, int) or handle < 0:
+            return None
+        index = handle & INDEX_MASK
+        if index >= len(self._states) or self._generations[index] != handle >> INDEX_BITS:
+            return None
+        if self._states[index] is None:
+            return None
+        return index
+
+    def create(self, state):
+        """
+        Stores a new pair state and returns its handle, or None if the pool is full.
+        """
+        if state is None:
+            raise ValueError("Pair state cannot be None")
+        if self._free:
+            index = self._free.pop()
+        elif len(self._states) < self.capacity:
+            index = len(self._states)
+            self._states.append(None)
+            self._generations.append(0)
+        else:
+            return None
+        self._states[index] = state
+        self._size += 1
+        return (self._generations[index] << INDEX_BITS) | index
+
+    def create_many(self, states):
+        """
+        Stores several pair states; returns their handles, with None for states that did not fit.
+        """
+        create = self.create
+        return [create(state) for state in states]
+
+    def get(self, handle):
+        """
+        Returns the state of a pair, or None if the handle is not live.
+        """
+        index = self._slot(handle)
+        return None if index is None else self._states[index]
+
+    def get_many(self, handles):
+        """
+        Returns the states of several pairs, with None for handles that are not live.
+        """
+        states, generations = self._states, self._generations
+        slots = len(states)
+        results = []
+        append = results.append
+        for handle in handles:
+            if handle is None or handle < 0:
+                append(None)
+                continue
+            index = handle & INDEX_MASK
+            # Free slots hold None, so a matching generation is all that needs checking
+            append(states[index] if index < slots and generations[index] == handle >> INDEX_BITS else None)
+        return results
+
+    def set(self, handle, state):
+        """
+        Replaces the state of a live pair; returns False if the handle is not live.
+        """
+        if state is None:
+            raise ValueError("Pair state cannot be None")
+        index = self._slot(handle)
+        if index is None:
+            return False
+        self._states[index] = state
+        return True
+
+    def set_many(self, handles, states):
+        """
+        Replaces the states of several pairs; returns a list of booleans like set().
+        """
+        slot_states, generations = self._states, self._generations
+        slots = len(slot_states)
+        results = []
+        append = results.append
+        for handle, state in zip(handles, states):
+            if state is None:
+                raise ValueError("Pair state cannot be None")
+            if handle is None or handle < 0:
+                append(False)
+                continue
+            index = handle & INDEX_MASK
+            live = (index < slots and generations[index] == handle >> INDEX_BITS
+                    and slot_states[index] is not None)
+            if live:
+                slot_states[index] = state
+            append(live)
+        return results
+
+    def remove(self, handle):
+        """
+        Frees a pair; its handle and any copies of it become invalid. Returns False if it was not live.
+        """
+        index = self._slot(handle)
+        if index is None:
+            return False
+        self._states[index] = None
+        self._generations[index] = (self._generations[index] + 1) & 0xFFFFFFFF
+        self._free.append(index)
+        self._size -= 1
+        return True
+
+    def handles(self):
+        """
+        Returns the handles of all live pairs in slot order.
+        """
+        generations = self._generations
+        return [(generations[index] << INDEX_BITS) | index
+                for index, state in enumerate(self._states) if state is not None]
+
+    def clear(self):
+        """
+        Frees every pair, invalidating all handles.
+        """
+        for handle in self.handles():
+            self.remove(handle)
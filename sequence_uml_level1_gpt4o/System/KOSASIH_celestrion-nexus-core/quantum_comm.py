@@ -1,58 +1,85 @@
 import random
 from .message_protocol import MessageProtocol
+from .pair_pool import PairPool
+
+PAIR_STATES = ('00', '01', '10', '11')
+TRANSMITTED_PREFIX = 'transmitted:'
 
 class QuantumComm:
     """
     Simulate quantum communication by creating, measuring, and transmitting messages using entangled quantum pairs, including message formatting, parsing, and validation.
     """
     
-    def __init__(self):
+    def __init__(self, max_pairs=10):
+        """
+        Initialize an instance with a pool of entangled pairs holding at most max_pairs pairs.
+        """
+        self.pairs = PairPool(max_pairs)
+        self.max_pairs = max_pairs
+    
+    @property
+    def entangled_pairs(self):
         """
-        Initialize an instance with a list to store entangled pairs and a maximum limit of 10 pairs.
+        Lists the states of all live entangled pairs.
         """
-        self.entangled_pairs = []
-        self.max_pairs = 10
+        return self.pairs.get_many(self.pairs.handles())
     
     def create_entangled_pair(self):
         """
-        Simulates the creation of an entangled quantum pair.
+        Simulates the creation of an entangled quantum pair and returns its handle, or None if the pool is full.
         """
-        if len(self.entangled_pairs) >= self.max_pairs:
-            return None
-        
         # Simulate entangled pair creation with random state
-        pair_state = random.choice(['00', '01', '10', '11'])
-        self.entangled_pairs.append(pair_state)
-        return len(self.entangled_pairs) - 1
+        return self.pairs.create(random.choice(PAIR_STATES))
     
-    def measure_state(self, pair_index):
+    def create_entangled_pairs(self, count):
+        """
+        Simulates the creation of several entangled pairs; returns their handles, with None for pairs that did not fit.
+        """
+        return self.pairs.create_many(random.choices(PAIR_STATES, k=count))
+    
+    def measure_state(self, pair_handle):
         """
         Measures the state of a quantum pair.
         """
-        if 0 <= pair_index < len(self.entangled_pairs):
-            return self.entangled_pairs[pair_index]
-        return None
+        return self.pairs.get(pair_handle)
+    
+    def release_pair(self, pair_handle):
+        """
+        Releases a quantum pair so its slot can be reused; its handle becomes invalid.
+        """
+        return self.pairs.remove(pair_handle)
     
-    def transmit_message(self, message, pair_index):
+    def transmit_message(self, message, pair_handle):
         """
         Transmits a message using the entangled pair.
         """
-        if 0 <= pair_index < len(self.entangled_pairs):
-            # Simulate transmission by updating the entangled pair state
-            # In a real quantum system, this would involve quantum operations
-            self.entangled_pairs[pair_index] = f"transmitted:{message}"
-            return True
-        return False
+        # Simulate transmission by updating the entangled pair state
+        # In a real quantum system, this would involve quantum operations
+        return self.pairs.set(pair_handle, f"{TRANSMITTED_PREFIX}{message}")
+    
+    def transmit_messages(self, messages, pair_handles):
+        """
+        Transmits one message per entangled pair; returns a list of booleans.
+        """
+        return self.pairs.set_many(pair_handles, [f"{TRANSMITTED_PREFIX}{message}" for message in messages])
     
-    def receive_message(self, pair_index):
+    def receive_message(self, pair_handle):
         """
         Simulates receiving a message by measuring the state of the entangled pair.
         """
-        state = self.measure_state(pair_index)
-        if state and state.startswith('transmitted:'):
-            return state.split(':', 1)[1]
+        state = self.measure_state(pair_handle)
+        if state and state.startswith(TRANSMITTED_PREFIX):
+            return state[len(TRANSMITTED_PREFIX):]
         return state
     
+    def receive_messages(self, pair_handles):
+        """
+        Simulates receiving the messages of several entangled pairs.
+        """
+        prefix_length = len(TRANSMITTED_PREFIX)
+        return [state[prefix_length:] if state and state.startswith(TRANSMITTED_PREFIX) else state
+                for state in self.pairs.get_many(pair_handles)]
+    
     def format_message(self, recipient, message):
         """
         Formats a message for transmission.
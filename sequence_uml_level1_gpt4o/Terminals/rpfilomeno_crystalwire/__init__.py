@@ -1,40 +1,213 @@
 #!/usr/bin/env python3
 
+import argparse
+import heapq
+import random
 import time
 import threading
-from collections import defaultdict
+from collections import OrderedDict
 import psutil
-from scapy.all import sniff, IP, TCP, UDP
-import pandas as pd
+from scapy.all import sniff, rdpcap, Ether, IP, TCP, UDP, Raw
 from plotille import Figure
 import os
 
+# Indexes into the [upload, download] counters of `pid2traffic`
+UPLOAD = 0
+DOWNLOAD = 1
+LOCAL_ADDRESS_REFRESH_INTERVAL = 30  # Seconds between re-reads of the interface addresses
+CONNECTION_SCAN_INTERVAL = 1  # Seconds between scans of the open connections
+CONNECTION_EXPIRY = 10  # Seconds a connection stays mapped after it closed, for packets still in flight
+EXITED_PID_SWEEP_SCANS = 30  # Scans between checks for exited processes that still have traffic totals
+PROCESS_NAME_CACHE_SIZE = 16384
+HISTORY_SECONDS = 60  # Length of the bandwidth graph
+TOP_PROCESSES = 10
+
+def get_local_addresses():
+    """Returns the set of addresses (IP and MAC) assigned to the interfaces of this machine"""
+    addresses = set()
+    for interface_addresses in psutil.net_if_addrs().values():
+        for address in interface_addresses:
+            # IPv6 link-local addresses carry a "%interface" zone that packets do not
+            addresses.add(address.address.split('%', 1)[0])
+    return frozenset(addresses)
+
+class ProcessNameCache:
+    """Least recently used cache of process names by PID, so that the stats thread
+    does not open every process again on every tick"""
+
+    def __init__(self, maxsize=PROCESS_NAME_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._names = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._names)
+
+    def get(self, pid):
+        """Returns the name of a process; raises psutil errors like `psutil.Process` does"""
+        with self._lock:
+            name = self._names.get(pid)
+            if name is not None:
+                self._names.move_to_end(pid)
+                self.hits += 1
+                return name
+            self.misses += 1
+        name = psutil.Process(pid).name()
+        self.put(pid, name)
+        return name
+
+    def put(self, pid, name):
+        """Stores the name of a process"""
+        with self._lock:
+            self._names[pid] = name
+            self._names.move_to_end(pid)
+            if len(self._names) > self.maxsize:
+                self._names.popitem(last=False)
+
+    def discard(self, pid):
+        """Forgets a PID, which may be reused by another process later"""
+        with self._lock:
+            self._names.pop(pid, None)
+
+class BandwidthTracker:
+    """Per-PID upload and download speeds, computed once per tick from the bytes
+    counted since the previous tick. The total speeds of the last `history` ticks are
+    kept in a fixed ring of per-tick tables, so a tick only touches the PIDs that had
+    traffic and a PID that goes quiet is forgotten once its last table is overwritten."""
+
+    def __init__(self, history=HISTORY_SECONDS):
+        self.history = history
+        self.tick = 0
+        self._deltas = {}  # PID -> [upload, download] bytes of the last tick
+        self._scale = 0.0  # Bytes to KB/s over the last tick
+        self._slots = [{}] * history  # Table of PID -> total KB/s for tick t in slot t % history
+
+    def update(self, deltas, interval=1.0):
+        """Advances one tick from `drain_pid2traffic()` output covering `interval` seconds"""
+        self.tick += 1
+        scale = self._scale = 1 / 1024 / interval
+        self._deltas = deltas
+        self._slots[self.tick % self.history] = {pid: (upload + download) * scale
+                                                 for pid, (upload, download) in deltas.items()}
+
+    def top(self, count=TOP_PROCESSES):
+        """Returns the (PID, (upload KB/s, download KB/s)) pairs of the fastest PIDs
+        of the last tick, fastest first"""
+        totals = self._slots[self.tick % self.history]
+        deltas, scale = self._deltas, self._scale
+        # Split speeds are only worked out for the PIDs that are shown
+        return [(pid, (deltas[pid][UPLOAD] * scale, deltas[pid][DOWNLOAD] * scale))
+                for pid in heapq.nlargest(count, totals, key=totals.__getitem__)]
+
+    def series(self, pid):
+        """Returns the total speeds of a PID over the history, oldest first"""
+        start = (self.tick + 1) % self.history
+        return [slot.get(pid, 0.0) for slot in self._slots[start:] + self._slots[:start]]
+
 # Global variables
 connection2pid = {}
-pid2traffic = defaultdict(lambda: [0, 0])
-global_df = None
-global_graph_data = defaultdict(list)
+connection_last_seen = {}  # Connection key -> monotonic time of the last scan that listed it
+pid2connections = {}  # PID -> number of connections in `connection2pid`
+process_names = ProcessNameCache()
+scan_stats = {'scans': 0, 'last_scan_ms': 0.0, 'max_scan_ms': 0.0,
+              'connections': 0, 'added': 0, 'expired': 0, 'retired_pids': 0, 'swept_pids': 0}
+# PID -> [upload bytes, download bytes], in total and since the last drain, both guarded by `pid2traffic_lock`
+pid2traffic = {}
+pid2traffic_delta = {}
+pid2traffic_lock = threading.Lock()
+bandwidth = BandwidthTracker()
 is_program_running = True
-all_macs = {iface.mac for iface in psutil.net_if_addrs().values()}
+local_addresses = get_local_addresses()
+
+def _retire_pid(pid):
+    """Forgets a PID that no longer owns any connection; its traffic totals are kept
+    while the process is alive, so that it reappears with them if it reconnects"""
+    del pid2connections[pid]
+    process_names.discard(pid)
+    if not psutil.pid_exists(pid):
+        with pid2traffic_lock:
+            pid2traffic.pop(pid, None)
+    scan_stats['retired_pids'] += 1
+
+def _sweep_exited_pids():
+    """Drops the traffic totals of processes without connections that have exited since
+    they were retired, so neither a long run nor a reused PID keeps them"""
+    with pid2traffic_lock:
+        idle = [pid for pid in pid2traffic if pid not in pid2connections]
+    exited = [pid for pid in idle if not psutil.pid_exists(pid)]
+    if exited:
+        with pid2traffic_lock:
+            for pid in exited:
+                pid2traffic.pop(pid, None)
+    scan_stats['swept_pids'] += len(exited)
+
+def scan_connections(now=None):
+    """Updates `connection2pid` from one scan of the open connections of this machine.
+    New connections and connections that changed owner are added, connections not
+    listed for CONNECTION_EXPIRY seconds are removed, and PIDs left without
+    connections are retired, so the tables only hold what is currently open."""
+    start = time.perf_counter()
+    if now is None:
+        now = time.monotonic()
+    
+    for connection in psutil.net_connections(kind='inet'):
+        if connection.laddr and connection.raddr and connection.pid:
+            # local address, remote address, and PID are available
+            connection_key = (*connection.laddr, *connection.raddr)
+            pid = connection.pid
+            previous_pid = connection2pid.get(connection_key)
+            if previous_pid != pid:
+                connection2pid[connection_key] = pid
+                pid2connections[pid] = pid2connections.get(pid, 0) + 1
+                scan_stats['added'] += 1
+                if previous_pid is not None:
+                    pid2connections[previous_pid] -= 1
+                    if not pid2connections[previous_pid]:
+                        _retire_pid(previous_pid)
+            connection_last_seen[connection_key] = now
+    
+    expired = [key for key, seen in connection_last_seen.items() if now - seen > CONNECTION_EXPIRY]
+    for connection_key in expired:
+        del connection_last_seen[connection_key]
+        pid = connection2pid.pop(connection_key)
+        pid2connections[pid] -= 1
+        if not pid2connections[pid]:
+            _retire_pid(pid)
+    
+    if scan_stats['scans'] % EXITED_PID_SWEEP_SCANS == 0:
+        _sweep_exited_pids()
+    
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    scan_stats['scans'] += 1
+    scan_stats['last_scan_ms'] = elapsed_ms
+    scan_stats['max_scan_ms'] = max(scan_stats['max_scan_ms'], elapsed_ms)
+    scan_stats['connections'] = len(connection2pid)
+    scan_stats['expired'] += len(expired)
 
 def get_connections():
     """A function that keeps listening for connections on this machine
-    and adds them to `connection2pid` global variable"""
-    global connection2pid
+    and keeps the `connection2pid` global variable up to date"""
     while is_program_running:
         try:
-            connections = psutil.net_connections(kind='inet')
-            for connection in connections:
-                if connection.laddr and connection.raddr and connection.pid:
-                    # local address, remote address, and PID are available
-                    local_ip, local_port = connection.laddr
-                    remote_ip, remote_port = connection.raddr
-                    connection_key = (local_ip, local_port, remote_ip, remote_port)
-                    connection2pid[connection_key] = connection.pid
+            scan_connections()
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             # Process might have terminated, skip it
             pass
-        time.sleep(1)
+        time.sleep(CONNECTION_SCAN_INTERVAL)
+
+def refresh_local_addresses():
+    """A function that keeps re-reading the addresses of this machine, so that
+    `local_addresses` follows interfaces going up or down without a per-packet lookup"""
+    global local_addresses
+    while is_program_running:
+        time.sleep(LOCAL_ADDRESS_REFRESH_INTERVAL)
+        try:
+            # Rebinding the name is atomic, so the sniffer never sees a half-built set
+            local_addresses = get_local_addresses()
+        except OSError:
+            pass
 
 def get_size(bytes):
     """Returns size of bytes in a nice format"""
@@ -43,134 +216,144 @@ def get_size(bytes):
             return f"{bytes:.2f} {unit}"
         bytes /= 1024
 
+def classify_direction(src_ip, dst_ip):
+    """Returns UPLOAD for packets leaving this machine, DOWNLOAD for packets
+    arriving to it and None for traffic between other hosts"""
+    addresses = local_addresses
+    if src_ip in addresses:
+        return UPLOAD
+    if dst_ip in addresses:
+        return DOWNLOAD
+    return None
+
 def process_packet(packet):
     """Track and accumulate network traffic (upload and download) per process ID (PID) 
     based on packet source and destination information."""
-    global pid2traffic
-    
-    if IP in packet:
-        src_ip = packet[IP].src
-        dst_ip = packet[IP].dst
-        
-        # Determine protocol and ports
-        src_port = None
-        dst_port = None
-        if TCP in packet:
-            src_port = packet[TCP].sport
-            dst_port = packet[TCP].dport
-        elif UDP in packet:
-            src_port = packet[UDP].sport
-            dst_port = packet[UDP].dport
-        
-        if src_port and dst_port:
-            # Try to find the connection in our mapping
-            pid = None
-            try:
-                # Check if this is an outgoing packet (from our machine)
-                if src_ip in all_macs or any(iface for iface in psutil.net_if_addrs().values() if iface.address == src_ip):
-                    connection_key = (src_ip, src_port, dst_ip, dst_port)
-                    pid = connection2pid.get(connection_key)
-                    if pid:
-                        # This is upload (outgoing) traffic
-                        pid2traffic[pid][0] += len(packet)
-                # Check if this is an incoming packet (to our machine)
-                elif dst_ip in all_macs or any(iface for iface in psutil.net_if_addrs().values() if iface.address == dst_ip):
-                    connection_key = (dst_ip, dst_port, src_ip, src_port)
-                    pid = connection2pid.get(connection_key)
-                    if pid:
-                        # This is download (incoming) traffic
-                        pid2traffic[pid][1] += len(packet)
-            except (KeyError, AttributeError):
-                pass
+    # Sniffed frames are almost always IP directly over the link layer, so try that
+    # before the generic (and much slower) layer search
+    ip = packet.payload
+    if not isinstance(ip, IP):
+        ip = packet if isinstance(packet, IP) else packet.getlayer(IP)
+        if ip is None:
+            return
+    transport = ip.payload
+    if not isinstance(transport, (TCP, UDP)):
+        return
+    src_ip = ip.getfieldval('src')
+    dst_ip = ip.getfieldval('dst')
+    src_port = transport.getfieldval('sport')
+    dst_port = transport.getfieldval('dport')
+    if not src_port or not dst_port:
+        return
+    
+    direction = classify_direction(src_ip, dst_ip)
+    if direction is None:
+        return
+    if direction == UPLOAD:
+        connection_key = (src_ip, src_port, dst_ip, dst_port)
+    else:
+        connection_key = (dst_ip, dst_port, src_ip, src_port)
+    pid = connection2pid.get(connection_key)
+    if pid is None:
+        return
+    
+    # The capture length recorded by sniff() avoids re-serializing the packet
+    size = packet.wirelen or len(packet)
+    with pid2traffic_lock:
+        traffic = pid2traffic.get(pid)
+        if traffic is None:
+            traffic = pid2traffic[pid] = [0, 0]
+        traffic[direction] += size
+        delta = pid2traffic_delta.get(pid)
+        if delta is None:
+            delta = pid2traffic_delta[pid] = [0, 0]
+        delta[direction] += size
+
+def snapshot_pid2traffic():
+    """Returns a consistent copy of the upload and download totals in `pid2traffic`"""
+    with pid2traffic_lock:
+        return {pid: tuple(traffic) for pid, traffic in pid2traffic.items()}
+
+def drain_pid2traffic():
+    """Returns {PID: [upload, download]} of the bytes counted since the previous call"""
+    global pid2traffic_delta
+    with pid2traffic_lock:
+        deltas, pid2traffic_delta = pid2traffic_delta, {}
+    return deltas
 
 def print_stats():
     """Simple function that keeps printing the stats"""
-    global global_df
+    last = time.monotonic()
     while is_program_running:
         time.sleep(1)
-        print_pid2traffic()
+        now = time.monotonic()
+        print_pid2traffic(now - last)
+        last = now
 
-def print_pid2traffic():
+def update_bandwidth(interval=1.0):
+    """Moves the traffic counted since the last tick into `bandwidth` and returns
+    the top processes as (PID, name, upload, download, upload KB/s, download KB/s)"""
+    bandwidth.update(drain_pid2traffic(), interval)
+    count = TOP_PROCESSES
+    while True:
+        top_processes = []
+        candidates = bandwidth.top(count)
+        for pid, (upload_speed, download_speed) in candidates:
+            # Totals are only read for display, so a packet counted meanwhile does not matter
+            traffic = pid2traffic.get(pid)
+            if traffic is None:
+                continue
+            try:
+                name = process_names.get(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                # Process might have terminated, skip it
+                continue
+            top_processes.append((pid, name, traffic[UPLOAD], traffic[DOWNLOAD], upload_speed, download_speed))
+        if len(top_processes) >= TOP_PROCESSES or len(candidates) < count:
+            return top_processes[:TOP_PROCESSES]
+        # Some of the fastest processes are gone, look further down the ranking
+        count *= 2
+
+def print_pid2traffic(interval=1.0):
     """Monitor and display network traffic statistics (upload/download speeds and totals) 
     per process ID (PID), including real-time speed calculations and visualization of top processes."""
-    global global_df, pid2traffic, global_graph_data
+    top_processes = update_bandwidth(interval)
     
-    # Create a copy of current traffic data
-    current_traffic = dict(pid2traffic)
+    # Display the stats
+    os.system('cls' if os.name == 'nt' else 'clear')
+    print("Network Traffic Monitor - Real-time Statistics")
+    print(f"Connections: {scan_stats['connections']} tracked, {len(pid2connections)} processes, "
+          f"scan {scan_stats['last_scan_ms']:.1f} ms (max {scan_stats['max_scan_ms']:.1f} ms), "
+          f"name cache {process_names.hits} hits / {process_names.misses} misses")
+    print("=" * 80)
     
-    # Create DataFrame for current stats
-    processes = []
-    for pid, traffic in current_traffic.items():
-        try:
-            process = psutil.Process(pid)
-            processes.append({
-                'pid': pid,
-                'name': process.name(),
-                'upload': traffic[0],
-                'download': traffic[1]
-            })
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            # Process might have terminated, skip it
-            continue
+    print(f"{'PID':<8} {'Process':<20} {'Upload':<12} {'Download':<12} {'Up Speed':<12} {'Down Speed':<12}")
+    print("-" * 80)
     
-    if not processes:
-        return
+    for pid, name, upload, download, upload_speed, download_speed in top_processes:
+        print(f"{pid:<8} {name[:19]:<20} "
+              f"{get_size(upload):<12} {get_size(download):<12} "
+              f"{upload_speed:.2f} KB/s {download_speed:.2f} KB/s")
     
-    df = pd.DataFrame(processes)
-    
-    # Calculate speeds if we have previous data
-    if global_df is not None:
-        # Merge with previous data to calculate speeds
-        merged = df.merge(global_df, on=['pid', 'name'], suffixes=('_current', '_previous'))
-        merged['upload_speed'] = (merged['upload_current'] - merged['upload_previous']) / 1024  # KB/s
-        merged['download_speed'] = (merged['download_current'] - merged['download_previous']) / 1024  # KB/s
-        
-        # Update graph data
-        for _, row in merged.iterrows():
-            global_graph_data[row['name']].append(row['upload_speed'] + row['download_speed'])
-            # Keep only last 60 seconds of data
-            if len(global_graph_data[row['name']]) > 60:
-                global_graph_data[row['name']].pop(0)
-        
-        # Display the stats
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("Network Traffic Monitor - Real-time Statistics")
-        print("=" * 80)
-        
-        # Sort by total speed and get top 10
-        merged['total_speed'] = merged['upload_speed'] + merged['download_speed']
-        top_processes = merged.nlargest(10, 'total_speed')
-        
-        print(f"{'PID':<8} {'Process':<20} {'Upload':<12} {'Download':<12} {'Up Speed':<12} {'Down Speed':<12}")
-        print("-" * 80)
-        
-        for _, row in top_processes.iterrows():
-            print(f"{row['pid']:<8} {row['name'][:19]:<20} "
-                  f"{get_size(row['upload_current']):<12} {get_size(row['download_current']):<12} "
-                  f"{row['upload_speed']:.2f} KB/s {row['download_speed']:.2f} KB/s")
-        
-        # Plot the graph
-        plot(top_processes)
-    
-    # Update global DataFrame for next iteration
-    global_df = df[['pid', 'name', 'upload', 'download']].copy()
-
-def plot(df):
+    # Plot the graph
+    plot(top_processes)
+
+def plot(top_processes):
     """Visualize time-series data of network bandwidth usage (in Kb/s) over a 60-second period 
     for multiple series, using a terminal-based plot with distinct colors for each series."""
-    global global_graph_data
-    
-    if not global_graph_data:
+    series = [(name, bandwidth.series(pid)) for pid, name, *_ in top_processes]
+    series = [(name, data) for name, data in series if data]
+    if not series:
         return
     
     fig = Figure()
     fig.width = 80
     fig.height = 20
     fig.color_mode = 'byte'
-    fig.set_x_limits(min_=0, max_=60)
+    fig.set_x_limits(min_=0, max_=bandwidth.history)
     
     # Find max y value for scaling
-    max_y = max(max(data) for data in global_graph_data.values() if data) or 100
+    max_y = max(max(data) for _, data in series) or 100
     
     fig.set_y_limits(min_=0, max_=max_y * 1.1)
     fig.xlabel = 'Time (seconds ago)'
@@ -178,10 +361,9 @@ def plot(df):
     
     colors = ['red', 'green', 'blue', 'yellow', 'magenta', 'cyan', 'white']
     
-    for i, (process_name, data) in enumerate(global_graph_data.items()):
-        if data:
-            x_values = list(range(len(data) - 1, -1, -1))
-            fig.plot(x_values, data, lc=colors[i % len(colors)], label=process_name[:15])
+    for i, (process_name, data) in enumerate(series):
+        x_values = list(range(len(data) - 1, -1, -1))
+        fig.plot(x_values, data, lc=colors[i % len(colors)], label=process_name[:15])
     
     print("\nBandwidth Usage Over Time:")
     print(fig.show(legend=True))
@@ -194,8 +376,95 @@ def stat(df):
     # For now, we'll use the main display in print_pid2traffic
     pass
 
+def make_replay_packets(count=50000, connections=1000, foreign_ratio=0.1, seed=0):
+    """Builds a pcap-like list of dissected TCP/UDP packets between this machine and
+    remote hosts, registering their connections in `connection2pid` under fake PIDs.
+    A `foreign_ratio` share of the packets is traffic between other hosts."""
+    rng = random.Random(seed)
+    local_ip = next((a for a in sorted(local_addresses) if a.count('.') == 3), '127.0.0.1')
+    frames = []
+    for i in range(connections):
+        remote_ip = f"198.18.{i // 250}.{i % 250 + 1}"
+        local_port = 40000 + i
+        remote_port = rng.choice([53, 80, 443, 8080])
+        transport = UDP if remote_port == 53 else TCP
+        connection2pid[(local_ip, local_port, remote_ip, remote_port)] = 1000 + i % 50
+        frames.append(bytes(Ether() / IP(src=local_ip, dst=remote_ip)
+                            / transport(sport=local_port, dport=remote_port) / Raw(b'x' * rng.randint(0, 1400))))
+        frames.append(bytes(Ether() / IP(src=remote_ip, dst=local_ip)
+                            / transport(sport=remote_port, dport=local_port) / Raw(b'x' * rng.randint(0, 1400))))
+    foreign = bytes(Ether() / IP(src='198.19.0.1', dst='198.19.0.2') / TCP(sport=12345, dport=443) / Raw(b'x' * 512))
+    packets = []
+    for _ in range(count):
+        frame = foreign if rng.random() < foreign_ratio else rng.choice(frames)
+        packet = Ether(frame)
+        packet.wirelen = len(frame)
+        packets.append(packet)
+    return packets
+
+def benchmark_process_packet(packets, repeat=3):
+    """Feeds a captured packet list through `process_packet` and returns the best packets/sec"""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for packet in packets:
+            process_packet(packet)
+        best = max(best, len(packets) / (time.perf_counter() - start))
+    return best
+
+def benchmark_stats_tick(processes=5000, active=200, ticks=120, seed=0):
+    """Times `update_bandwidth()`, the per-second stats aggregation, with `processes`
+    known PIDs (their names already cached) of which `active` random ones had traffic
+    in each tick; returns the mean and worst ms per tick"""
+    global bandwidth
+    rng = random.Random(seed)
+    with pid2traffic_lock:
+        for pid in range(1, processes + 1):
+            pid2traffic.setdefault(pid, [0, 0])
+            process_names.put(pid, f"process-{pid}")
+    bandwidth = BandwidthTracker()
+    durations = []
+    for _ in range(ticks):
+        with pid2traffic_lock:
+            for pid in rng.sample(range(1, processes + 1), active):
+                direction, size = rng.randrange(2), rng.randint(60, 1 << 20)
+                pid2traffic[pid][direction] += size
+                pid2traffic_delta.setdefault(pid, [0, 0])[direction] += size
+        start = time.perf_counter()
+        update_bandwidth()
+        durations.append((time.perf_counter() - start) * 1000)
+    return sum(durations) / ticks, max(durations)
+
+def run_benchmark(pcap=None, count=50000):
+    """Replays a capture file (or synthetic packets) through `process_packet` and prints packets/sec"""
+    if pcap:
+        # Only connections open on this machine right now are attributed to a PID
+        packets = list(rdpcap(pcap))
+        scan_connections()
+        print(f"Connection scan: {scan_stats['connections']} connections in {scan_stats['last_scan_ms']:.1f} ms")
+    else:
+        packets = make_replay_packets(count)
+    
+    rate = benchmark_process_packet(packets)
+    counted = snapshot_pid2traffic()
+    print(f"Replayed {len(packets)} packets: {rate:,.0f} packets/sec")
+    print(f"Attributed {sum(up + down for up, down in counted.values())} bytes to {len(counted)} PIDs")
+    for active in (200, 1000):
+        mean_ms, worst_ms = benchmark_stats_tick(active=active)
+        print(f"Stats tick with 5000 processes, {active} active: {mean_ms:.3f} ms mean, {worst_ms:.3f} ms worst")
+
 def main():
-    global connections_thread, printing_thread, is_program_running
+    global connections_thread, printing_thread, addresses_thread, is_program_running
+    
+    parser = argparse.ArgumentParser(description="Monitor network traffic per process")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Replay packets through the packet handler and report packets/sec instead of sniffing")
+    parser.add_argument("--pcap", help="Capture file to replay with --benchmark (synthetic packets by default)")
+    parser.add_argument("--packets", type=int, default=50000, help="Number of synthetic packets to replay")
+    args = parser.parse_args()
+    if args.benchmark:
+        run_benchmark(args.pcap, args.packets)
+        return
     
     print("Starting Network Traffic Monitor...")
     print("Press Ctrl+C to stop\n")
@@ -205,6 +474,11 @@ def main():
     connections_thread.daemon = True
     connections_thread.start()
     
+    # Start the thread that keeps the local addresses up to date
+    addresses_thread = threading.Thread(target=refresh_local_addresses)
+    addresses_thread.daemon = True
+    addresses_thread.start()
+    
     # Start the printing thread
     printing_thread = threading.Thread(target=print_stats)
     printing_thread.daemon = True